@@ -0,0 +1,27 @@
+"""add token_version to users for claim-based auth revocation
+
+Revision ID: a5c7e9f1b3d4
+Revises: f4b6d8e0a2c3
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5c7e9f1b3d4'
+down_revision = 'f4b6d8e0a2c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('token_version', server_default=None)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
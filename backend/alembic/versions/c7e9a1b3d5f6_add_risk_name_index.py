@@ -0,0 +1,23 @@
+"""index risks.risk_name for import conflict lookups
+
+Revision ID: c7e9a1b3d5f6
+Revises: b6d8f0a2c4e5
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e9a1b3d5f6'
+down_revision = 'b6d8f0a2c4e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_risks_risk_name', 'risks', ['risk_name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_risks_risk_name', table_name='risks')
@@ -0,0 +1,57 @@
+"""add composite and partial indexes for hot query shapes
+
+Revision ID: d2f4a6b8c0e1
+Revises: 66_promote_admins
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f4a6b8c0e1'
+down_revision = '66_promote_admins'
+branch_labels = None
+depends_on = None
+
+
+OPEN_RISKS = sa.text("status = 'open'")
+OPEN_ACTION_ITEMS = sa.text("status IN ('pending', 'in_progress')")
+
+
+def upgrade() -> None:
+    # list_risks: owner/status/rbs filters sorted by created_at
+    op.create_index('ix_risks_owner_status_created', 'risks', ['owner_id', 'status', 'created_at'])
+    op.create_index('ix_risks_status_created', 'risks', ['status', 'created_at'])
+    op.create_index('ix_risks_rbs_node_created', 'risks', ['rbs_node_id', 'created_at'])
+    op.create_index('ix_risks_created_at', 'risks', ['created_at'])
+    op.create_index(
+        'ix_risks_open_created', 'risks', ['created_at'],
+        postgresql_where=OPEN_RISKS, sqlite_where=OPEN_RISKS,
+    )
+
+    # get_audit_logs / audit trails: entity and action filters sorted by timestamp
+    op.create_index('ix_audit_logs_entity_timestamp', 'audit_logs', ['entity_type', 'entity_id', 'timestamp'])
+    op.create_index('ix_audit_logs_action_timestamp', 'audit_logs', ['action', 'timestamp'])
+
+    # get_overdue_action_items and per-risk listings
+    op.create_index('ix_action_items_status_due_date', 'action_items', ['status', 'due_date'])
+    op.create_index('ix_action_items_risk_created', 'action_items', ['risk_id', 'created_at'])
+    op.create_index(
+        'ix_action_items_open_due_date', 'action_items', ['due_date'],
+        postgresql_where=OPEN_ACTION_ITEMS, sqlite_where=OPEN_ACTION_ITEMS,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_action_items_open_due_date', table_name='action_items')
+    op.drop_index('ix_action_items_risk_created', table_name='action_items')
+    op.drop_index('ix_action_items_status_due_date', table_name='action_items')
+    op.drop_index('ix_audit_logs_action_timestamp', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_entity_timestamp', table_name='audit_logs')
+    op.drop_index('ix_risks_open_created', table_name='risks')
+    op.drop_index('ix_risks_created_at', table_name='risks')
+    op.drop_index('ix_risks_rbs_node_created', table_name='risks')
+    op.drop_index('ix_risks_status_created', table_name='risks')
+    op.drop_index('ix_risks_owner_status_created', table_name='risks')
@@ -0,0 +1,49 @@
+"""add risk_aggregates table of counts per dashboard cell
+
+Revision ID: d8f0b2c4e6a7
+Revises: c7e9a1b3d5f6
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f0b2c4e6a7'
+down_revision = 'c7e9a1b3d5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'risk_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('probability', sa.Integer(), nullable=False),
+        sa.Column('impact', sa.Integer(), nullable=False),
+        sa.Column('scope', sa.String(length=32), nullable=False),
+        sa.Column('rbs_node_id', sa.Integer(), nullable=False),
+        sa.Column('risk_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'owner_id', 'status', 'probability', 'impact', 'scope', 'rbs_node_id',
+            name='uq_risk_aggregates_key',
+        ),
+    )
+    # Seed from the existing register (0 stands for NULL in the key columns)
+    op.execute(
+        """
+        INSERT INTO risk_aggregates (owner_id, status, probability, impact, scope, rbs_node_id, risk_count)
+        SELECT owner_id, status, COALESCE(probability, 0), COALESCE(impact, 0), scope,
+               COALESCE(rbs_node_id, 0), COUNT(*)
+        FROM risks
+        GROUP BY owner_id, status, COALESCE(probability, 0), COALESCE(impact, 0), scope, COALESCE(rbs_node_id, 0)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('risk_aggregates')
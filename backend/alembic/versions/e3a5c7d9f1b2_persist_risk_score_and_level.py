@@ -0,0 +1,53 @@
+"""persist risk score and risk_level so they can be indexed
+
+Revision ID: e3a5c7d9f1b2
+Revises: d2f4a6b8c0e1
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a5c7d9f1b2'
+down_revision = 'd2f4a6b8c0e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('risks', sa.Column('score', sa.Integer(), nullable=True))
+    op.add_column(
+        'risks',
+        sa.Column('risk_level', sa.String(length=20), nullable=False, server_default='Not Assessed'),
+    )
+
+    # Backfill from probability/impact using the same thresholds as the model
+    op.execute(
+        "UPDATE risks SET score = probability * impact "
+        "WHERE probability IS NOT NULL AND impact IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE risks SET risk_level = CASE "
+        "WHEN score IS NULL THEN 'Not Assessed' "
+        "WHEN score <= 4 THEN 'Low' "
+        "WHEN score <= 8 THEN 'Medium' "
+        "WHEN score <= 15 THEN 'High' "
+        "ELSE 'Critical' END"
+    )
+
+    # The application keeps these in sync on write; drop the server default
+    with op.batch_alter_table('risks') as batch_op:
+        batch_op.alter_column('risk_level', server_default=None)
+
+    op.create_index(op.f('ix_risks_score'), 'risks', ['score'], unique=False)
+    op.create_index(op.f('ix_risks_risk_level'), 'risks', ['risk_level'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_risks_risk_level'), table_name='risks')
+    op.drop_index(op.f('ix_risks_score'), table_name='risks')
+    with op.batch_alter_table('risks') as batch_op:
+        batch_op.drop_column('risk_level')
+        batch_op.drop_column('score')
@@ -0,0 +1,58 @@
+"""add full-text search index over risk text fields
+
+Revision ID: f4b6d8e0a2c3
+Revises: e3a5c7d9f1b2
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b6d8e0a2c3'
+down_revision = 'e3a5c7d9f1b2'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ('risk_name', 'risk_description', 'notes', 'probability_basis', 'impact_basis')
+_cols = ', '.join(COLUMNS)
+_new = ', '.join(f'new.{c}' for c in COLUMNS)
+_old = ', '.join(f'old.{c}' for c in COLUMNS)
+_vector = "to_tsvector('english', " + " || ' ' || ".join(f"coalesce({c}, '')" for c in COLUMNS) + ")"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS risks_fts USING fts5({_cols}, "
+            "content='risks', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS risks_fts_ai AFTER INSERT ON risks BEGIN "
+            f"INSERT INTO risks_fts(rowid, {_cols}) VALUES (new.id, {_new}); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS risks_fts_ad AFTER DELETE ON risks BEGIN "
+            f"INSERT INTO risks_fts(risks_fts, rowid, {_cols}) VALUES ('delete', old.id, {_old}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS risks_fts_au AFTER UPDATE OF {_cols} ON risks BEGIN "
+            f"INSERT INTO risks_fts(risks_fts, rowid, {_cols}) VALUES ('delete', old.id, {_old}); "
+            f"INSERT INTO risks_fts(rowid, {_cols}) VALUES (new.id, {_new}); END"
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO risks_fts(risks_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_risks_search ON risks USING gin ({_vector})")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('risks_fts_au', 'risks_fts_ad', 'risks_fts_ai'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS risks_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_risks_search")
@@ -0,0 +1,182 @@
+"""
+Response compression (brotli or gzip) negotiated from Accept-Encoding.
+
+Starlette's GZipMiddleware only speaks gzip and would re-encode bodies that
+are already compressed, so this middleware picks the best coding the client
+accepts (brotli when the `brotli` package is installed, else gzip) and leaves
+alone:
+
+- responses that already carry a Content-Encoding, partial (206) and
+  bodiless (204/304) responses, and HEAD requests;
+- media types that are compressed formats themselves (images, PDF, the
+  zip-based XLSX/DOCX reports, archives);
+- single-body responses smaller than `minimum_size` bytes.
+
+Streamed responses (StreamingResponse, e.g. GET /risks/export) are encoded
+chunk by chunk and each chunk is flushed, so the client keeps receiving rows
+as they are produced instead of waiting for the compressor's buffer to fill.
+Weak ETags stay valid across codings, so conditional GETs are unaffected.
+"""
+
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+	import brotli
+except ImportError:  # brotli is optional; gzip is always available
+	brotli = None
+
+
+# Content types that are compressed already; encoding them again only costs CPU
+COMPRESSED_MEDIA_TYPES = (
+	"image/",
+	"video/",
+	"audio/",
+	"font/woff",
+	"application/pdf",
+	"application/zip",
+	"application/gzip",
+	"application/x-gzip",
+	"application/x-7z-compressed",
+	"application/vnd.openxmlformats-officedocument.",
+)
+
+# Uncompressed formats under the prefixes above
+COMPRESSIBLE_EXCEPTIONS = ("image/svg+xml", "image/bmp", "image/x-icon")
+
+
+def supported_encodings() -> tuple[str, ...]:
+	"""Codings we can produce, most preferred first"""
+	return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+	"""The supported coding with the highest q-value in an Accept-Encoding header (br wins ties)"""
+	weights: dict[str, float] = {}
+	for part in accept_encoding.split(","):
+		coding, _, params = part.partition(";")
+		coding = coding.strip().lower()
+		if not coding:
+			continue
+		weight = 1.0
+		for param in params.split(";"):
+			name, _, value = param.partition("=")
+			if name.strip().lower() == "q":
+				try:
+					weight = float(value)
+				except ValueError:
+					weight = 0.0
+		weights[coding] = weight
+
+	chosen, chosen_weight = None, 0.0
+	for coding in supported_encodings():
+		weight = weights.get(coding, weights.get("*", 0.0))
+		if weight > chosen_weight:
+			chosen, chosen_weight = coding, weight
+	return chosen
+
+
+def is_compressible(status: int, headers: Headers) -> bool:
+	if status < 200 or status in (204, 206, 304):
+		return False
+	if "content-encoding" in headers or "content-range" in headers:
+		return False
+	media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+	if media_type.startswith(COMPRESSIBLE_EXCEPTIONS):
+		return True
+	return not media_type.startswith(COMPRESSED_MEDIA_TYPES)
+
+
+class GzipEncoder:
+	def __init__(self, level: int):
+		# wbits 16 + MAX_WBITS writes a gzip header and trailer
+		self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+	def chunk(self, data: bytes) -> bytes:
+		return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+	def finish(self, data: bytes) -> bytes:
+		return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+	def __init__(self, quality: int):
+		self._compressor = brotli.Compressor(quality=quality)
+
+	def chunk(self, data: bytes) -> bytes:
+		return self._compressor.process(data) + self._compressor.flush()
+
+	def finish(self, data: bytes) -> bytes:
+		return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+	"""ASGI middleware that brotli/gzip-encodes responses for clients that accept it"""
+
+	def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+		self.app = app
+		self.minimum_size = minimum_size
+		self.gzip_level = gzip_level
+		self.brotli_quality = brotli_quality
+
+	def encoder(self, encoding: str):
+		if encoding == "br":
+			return BrotliEncoder(self.brotli_quality)
+		return GzipEncoder(self.gzip_level)
+
+	async def __call__(self, scope, receive, send):
+		if scope["type"] != "http" or scope["method"] == "HEAD":
+			await self.app(scope, receive, send)
+			return
+		encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+		if encoding is None:
+			await self.app(scope, receive, send)
+			return
+
+		start_message = None
+		encoder = None
+
+		async def send_compressed(message):
+			nonlocal start_message, encoder
+			if message["type"] == "http.response.start":
+				# Held back until the first body chunk shows whether it is worth compressing
+				start_message = message
+				return
+			if message["type"] != "http.response.body":
+				await send(message)
+				return
+
+			body = message.get("body", b"")
+			more_body = message.get("more_body", False)
+			if start_message is not None:
+				start, start_message = start_message, None
+				headers = MutableHeaders(scope=start)
+				if not is_compressible(start["status"], headers) or (not more_body and len(body) < self.minimum_size):
+					await send(start)
+					await send(message)
+					return
+
+				encoder = self.encoder(encoding)
+				headers["Content-Encoding"] = encoding
+				headers.add_vary_header("Accept-Encoding")
+				if more_body:
+					# Length is unknown until the stream ends
+					if "content-length" in headers:
+						del headers["content-length"]
+					body = encoder.chunk(body)
+				else:
+					body = encoder.finish(body)
+					headers["Content-Length"] = str(len(body))
+				await send(start)
+				await send({"type": "http.response.body", "body": body, "more_body": more_body})
+				return
+
+			if encoder is None:
+				await send(message)
+				return
+			body = encoder.chunk(body) if more_body else encoder.finish(body)
+			await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+		await self.app(scope, receive, send_compressed)
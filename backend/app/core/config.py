@@ -10,11 +10,89 @@ class Settings(BaseSettings):
 	database_url: str = "sqlite:///./risk_platform.db"
 	database_type: Literal["sqlite", "postgresql"] = "sqlite"
 	
+	# Optional read replica for read-only endpoints
+	read_database_url: str | None = None
+	read_replica_sticky_seconds: int = 5  # send a user's reads to the primary this long after they write
+	
+	# Connection pool (ignored for SQLite, which manages its own pool)
+	db_pool_size: int = 5
+	db_max_overflow: int = 10
+	db_pool_timeout: int = 30  # seconds to wait for a free connection
+	db_pool_recycle: int = 1800  # seconds before a connection is replaced
+	db_pool_pre_ping: bool = True
+	
+	# Worker threads for sync endpoints and blocking DB work (per process).
+	# Keep at or above db_pool_size + db_max_overflow so threads don't idle on the pool.
+	threadpool_size: int = 40
+	
+	# Per-request SQL instrumentation (Server-Timing headers, /system/queries)
+	sql_instrumentation_enabled: bool = True
+	sql_repeat_warning_threshold: int = 10  # warn when one statement shape repeats more often per request
+	
+	# SQLite performance profile (opt-in; used by the desktop build)
+	sqlite_performance_mode: bool = False
+	sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"
+	sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes
+	sqlite_cache_size: int = -64000  # negative = KiB, so ~64MB
+	sqlite_busy_timeout: int = 5000  # milliseconds
+	sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+	sqlite_serialize_writes: bool = True
+	
 	# Authentication
 	secret_key: str = "dev-secret-change-in-production"
 	algorithm: str = "HS256"
 	access_token_expires_minutes: int = 60 * 24
 	
+	# Password hashing runs on its own threads; extra work beyond the queue gets a 503
+	password_hash_workers: int = 2
+	password_hash_queue_limit: int = 32
+	
+	# /auth/login throttling (sliding windows): attempts per client IP, failures per account
+	login_ip_max_attempts: int = 30
+	login_ip_window_seconds: int = 60
+	login_account_max_failures: int = 5
+	login_account_window_seconds: int = 300
+	# Reverse proxies whose X-Forwarded-For is believed for the per-IP limit: comma-separated
+	# addresses/CIDRs, or "*" when every request comes through a platform router (Render)
+	trusted_proxies: str = ""
+	
+	# Token revocation (logout): per-worker Bloom filter over the revoked_tokens table
+	token_revocation_capacity: int = 10000  # expected revoked, unexpired tokens
+	token_revocation_error_rate: float = 0.001  # false positives cost one DB lookup
+	token_revocation_refresh_seconds: int = 30  # how soon other workers see a logout
+	token_version_cache_max_entries: int = 10000  # users whose current token_version is kept per worker
+	
+	# Verified JWTs kept per process (by digest, until each token expires); 0 disables
+	token_cache_max_entries: int = 4096
+	
+	# Per-process cache of authenticated users (id -> role/status) for auth dependencies
+	user_cache_ttl_seconds: int = 30
+	user_cache_max_entries: int = 1024
+	
+	# Largest batch accepted by POST /risks/bulk
+	risk_bulk_max_operations: int = 10000
+	
+	# Spreadsheet import (POST /risks/import): rows validated and written per batch
+	risk_import_chunk_size: int = 1000
+	
+	# Streaming export (GET /risks/export): rows fetched and sent per batch
+	risk_export_batch_size: int = 500
+	
+	# Report rendering (POST /reports): PDF and DOCX are built in memory, so they
+	# list at most this many risks; XLSX is streamed to disk and has no cap
+	report_document_max_rows: int = 5000
+	
+	# Background job registry (imports, reports); finished jobs and their files kept for polling
+	job_max_entries: int = 256
+	job_retention_seconds: int = 3600
+	
+	# Response compression (brotli when installed, else gzip) for clients that send Accept-Encoding;
+	# single-body responses smaller than the minimum go out as they are
+	compression_enabled: bool = True
+	compression_minimum_size: int = 1024  # bytes
+	compression_gzip_level: int = 6
+	compression_brotli_quality: int = 4  # 0-11; higher is smaller but much slower
+	
 	# Service URLs
 	frontend_url: str = "http://localhost:5173"
 	backend_url: str = "http://localhost:8000"
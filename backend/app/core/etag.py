@@ -0,0 +1,77 @@
+"""
+Conditional GETs (ETag / If-None-Match) for read endpoints.
+
+Validators are computed from cheap aggregates instead of the response body:
+the row count and latest updated_at of the filtered select (and of the child
+rows joined to it, e.g. a risk's action items), plus the request's query
+parameters and whoever is asking. Any insert, update or delete that can
+change the response changes one of these, so an unchanged resource is answered
+with a bodiless 304 before its rows are loaded or serialized.
+
+ETags are weak (W/"...") because they identify the data, not the bytes.
+Responses carry `Cache-Control: private, no-cache`, so browsers keep the body
+but revalidate on every use, and shared caches never store it.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+	digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+	return f'W/"{digest}"'
+
+
+def table_version(db: Session, stmt, updated_column) -> tuple:
+	"""(row count, latest updated_at) of a filtered select, in one aggregate query"""
+	stmt = getattr(stmt, "statement", stmt)  # accept legacy Query objects too
+	stmt = stmt.with_only_columns(func.count(), func.max(updated_column), maintain_column_froms=True)
+	return tuple(db.execute(stmt.order_by(None).limit(None).offset(None)).one())
+
+
+def table_version_with_children(db: Session, stmt, key_column, updated_column, child_key, child_updated_column) -> tuple:
+	"""table_version() of a filtered select plus (count, latest update) of its child rows, in one query
+
+	Children are outer-joined on `child_key == key_column`, so only rows belonging
+	to the filtered parents count: a change to another parent's children leaves
+	the validator alone.
+	"""
+	stmt = getattr(stmt, "statement", stmt)
+	stmt = stmt.outerjoin(child_key.class_, child_key == key_column).with_only_columns(
+		func.count(distinct(key_column)),
+		func.max(updated_column),
+		func.count(child_key),
+		func.max(child_updated_column),
+		maintain_column_froms=True,
+	)
+	return tuple(db.execute(stmt.order_by(None).limit(None).offset(None)).one())
+
+
+def query_params_key(request: Request) -> tuple:
+	return tuple(sorted(request.query_params.multi_items()))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+	"""Weak comparison against an If-None-Match header (RFC 9110 13.1.2)"""
+	if not if_none_match:
+		return False
+	if if_none_match.strip() == "*":
+		return True
+	opaque = etag.removeprefix("W/")
+	return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+	"""Tag the response; return a bare 304 instead when the client already has this version"""
+	headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+	if etag_matches(request.headers.get("if-none-match"), etag):
+		return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+	response.headers.update(headers)
+	return None
@@ -0,0 +1,84 @@
+"""
+Dedicated, bounded executor for password hashing.
+
+bcrypt is deliberately slow. Running it on the shared request threadpool lets
+a burst of logins (or a brute-force run) occupy every worker thread and stall
+unrelated endpoints. Hashing and verification run here instead, on a few
+threads of their own, and at most `queue_limit` jobs may wait for them; any
+further work is refused with PasswordHasherBusy (surfaced as 503) rather than
+queueing without bound.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from passlib.context import CryptContext
+
+from .config import settings
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasherBusy(RuntimeError):
+	"""Raised when the hashing queue is full"""
+
+
+class PasswordHasher:
+	def __init__(self, workers: int, queue_limit: int):
+		self.workers = max(1, workers)
+		self.queue_limit = max(0, queue_limit)
+		self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+		# One slot per running or queued job
+		self._slots = threading.BoundedSemaphore(self.workers + self.queue_limit)
+		self._lock = threading.Lock()
+		self.pending = 0
+		self.rejected = 0
+
+	def submit(self, fn: Callable, *args) -> Future:
+		if not self._slots.acquire(blocking=False):
+			with self._lock:
+				self.rejected += 1
+			raise PasswordHasherBusy("Password hashing queue is full")
+		with self._lock:
+			self.pending += 1
+		try:
+			future = self._executor.submit(fn, *args)
+		except Exception:
+			self._release()
+			raise
+		future.add_done_callback(lambda _: self._release())
+		return future
+
+	def _release(self):
+		with self._lock:
+			self.pending -= 1
+		self._slots.release()
+
+	# Blocking API for sync code paths (waits on the dedicated pool)
+	def hash(self, password: str) -> str:
+		return self.submit(pwd_context.hash, password).result()
+
+	def verify(self, password: str, hashed: str) -> bool:
+		return self.submit(pwd_context.verify, password, hashed).result()
+
+	# Async API: awaits the result without holding a request thread
+	async def hash_async(self, password: str) -> str:
+		return await asyncio.wrap_future(self.submit(pwd_context.hash, password))
+
+	async def verify_async(self, password: str, hashed: str) -> bool:
+		return await asyncio.wrap_future(self.submit(pwd_context.verify, password, hashed))
+
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				"workers": self.workers,
+				"queue_limit": self.queue_limit,
+				"pending": self.pending,
+				"rejected": self.rejected,
+			}
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_queue_limit)
@@ -0,0 +1,163 @@
+"""
+Per-request SQL instrumentation.
+
+Engine-level cursor events count every statement and its duration against the
+request that issued it. Results are returned to the client as Server-Timing
+and X-DB-Query-Count headers, aggregated per route for the /system report,
+and a warning is logged when one statement shape repeats suspiciously often
+within a single request (the usual N+1 lazy-loading signature).
+"""
+
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\((\s*(\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(\?|%s|%\(\w+\)s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+	"""Normalize a SQL statement so repeats with different IN-list sizes match"""
+	shape = _WHITESPACE.sub(" ", statement).strip()
+	return _IN_LIST.sub("(?)", shape)
+
+
+class RequestQueryStats:
+	"""Queries issued while handling one request"""
+
+	def __init__(self):
+		self.count = 0
+		self.total_seconds = 0.0
+		self.shapes: Dict[str, int] = {}
+		self.repeated: Dict[str, int] = {}
+
+	def record(self, statement: str, seconds: float):
+		self.count += 1
+		self.total_seconds += seconds
+		shape = statement_shape(statement)
+		seen = self.shapes.get(shape, 0) + 1
+		self.shapes[shape] = seen
+		if seen > settings.sql_repeat_warning_threshold:
+			self.repeated[shape] = seen
+
+	def server_timing(self) -> str:
+		return f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+class QueryReport:
+	"""Aggregated query statistics per route since startup (or last reset)"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._routes: Dict[str, Dict[str, Any]] = {}
+
+	def record(self, route: str, stats: RequestQueryStats):
+		with self._lock:
+			entry = self._routes.setdefault(route, {
+				"requests": 0,
+				"queries": 0,
+				"db_ms": 0.0,
+				"max_queries": 0,
+				"repeat_warnings": 0,
+			})
+			entry["requests"] += 1
+			entry["queries"] += stats.count
+			entry["db_ms"] += stats.total_seconds * 1000
+			entry["max_queries"] = max(entry["max_queries"], stats.count)
+			entry["repeat_warnings"] += len(stats.repeated)
+
+	def snapshot(self) -> Dict[str, Dict[str, Any]]:
+		with self._lock:
+			report = {}
+			for route, entry in self._routes.items():
+				requests = entry["requests"] or 1
+				report[route] = {
+					**entry,
+					"db_ms": round(entry["db_ms"], 3),
+					"avg_queries": round(entry["queries"] / requests, 2),
+					"avg_db_ms": round(entry["db_ms"] / requests, 3),
+				}
+			return report
+
+	def reset(self):
+		with self._lock:
+			self._routes.clear()
+
+
+query_report = QueryReport()
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+	# Kept on the execution context, not the connection: after_cursor_execute
+	# never fires for a failed statement, and the context is discarded with it
+	if context is not None and _current_stats.get() is not None:
+		context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+	stats = _current_stats.get()
+	started = getattr(context, "_query_started_at", None)
+	if stats is None or started is None:
+		return
+	stats.record(statement, time.perf_counter() - started)
+
+
+_installed = False
+
+
+def install_query_instrumentation():
+	"""Listen to cursor events on every engine (idempotent)"""
+	global _installed
+	if _installed:
+		return
+	event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+	event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+	_installed = True
+
+
+class QueryStatsMiddleware:
+	"""ASGI middleware that scopes query stats to each HTTP request"""
+
+	def __init__(self, app):
+		self.app = app
+
+	async def __call__(self, scope, receive, send):
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+
+		stats = RequestQueryStats()
+		token = _current_stats.set(stats)
+
+		async def send_with_timing(message):
+			if message["type"] == "http.response.start":
+				headers = MutableHeaders(scope=message)
+				headers.append("Server-Timing", stats.server_timing())
+				headers["X-DB-Query-Count"] = str(stats.count)
+			await send(message)
+
+		try:
+			await self.app(scope, receive, send_with_timing)
+		finally:
+			_current_stats.reset(token)
+			route = scope.get("route")
+			route_key = f"{scope['method']} {getattr(route, 'path', '<unmatched>')}"
+			query_report.record(route_key, stats)
+			for shape, count in stats.repeated.items():
+				logger.warning(
+					"%s issued the same statement %d times (possible N+1): %s",
+					route_key, count, shape[:300],
+				)
@@ -0,0 +1,113 @@
+"""
+In-process registry of background jobs (imports, report generation).
+
+A job is created by the endpoint that accepts the work, updated by the
+background task doing it, and polled by id. Finished jobs are kept for
+`job_retention_seconds` and the registry is capped at `max_jobs`, so polling
+state never grows without bound. A job may leave a file behind (a rendered
+report); it is deleted when the job leaves the registry. State is per
+process: with several workers, poll the worker that accepted the job (or pin
+jobs with a sticky session).
+"""
+
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from .config import settings
+
+
+@dataclass
+class Job:
+	id: str
+	kind: str
+	owner_id: int
+	status: str = "queued"  # queued -> running -> completed | failed
+	progress: dict = field(default_factory=dict)
+	result: Any = None
+	error: Optional[str] = None
+	artifact: Optional[str] = None  # path of the file the job produced, if any
+	created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+	finished_at: Optional[datetime] = None
+
+	@property
+	def finished(self) -> bool:
+		return self.status in ("completed", "failed")
+
+
+def _remove_file(path: str):
+	try:
+		os.remove(path)
+	except OSError:
+		pass
+
+
+class JobRegistry:
+	def __init__(self, max_jobs: int, retention_seconds: float):
+		self.max_jobs = max_jobs
+		self.retention_seconds = retention_seconds
+		self._jobs: dict[str, tuple[Job, Optional[float]]] = {}
+		self._lock = threading.Lock()
+
+	def _discard(self, job_id: str):
+		# Called with the lock held
+		job, _ = self._jobs.pop(job_id)
+		if job.artifact:
+			_remove_file(job.artifact)
+
+	def _prune(self, now: float):
+		# Called with the lock held: expired jobs first, then the oldest finished ones
+		for job_id in [job_id for job_id, (_, done) in self._jobs.items() if done is not None and now - done > self.retention_seconds]:
+			self._discard(job_id)
+		finished = sorted((done, job_id) for job_id, (_, done) in self._jobs.items() if done is not None)
+		while len(self._jobs) >= self.max_jobs and finished:
+			self._discard(finished.pop(0)[1])
+
+	def create(self, kind: str, owner_id: int) -> Job:
+		job = Job(id=uuid.uuid4().hex, kind=kind, owner_id=owner_id)
+		with self._lock:
+			self._prune(time.monotonic())
+			self._jobs[job.id] = (job, None)
+		return job
+
+	def get(self, job_id: str) -> Optional[Job]:
+		with self._lock:
+			entry = self._jobs.get(job_id)
+			return entry[0] if entry else None
+
+	def start(self, job: Job):
+		with self._lock:
+			job.status = "running"
+
+	def update(self, job: Job, **progress):
+		with self._lock:
+			job.progress.update(progress)
+
+	def finish(self, job: Job, result: Any = None, error: Optional[str] = None, artifact: Optional[str] = None):
+		with self._lock:
+			job.status = "failed" if error else "completed"
+			job.result = result
+			job.error = error
+			job.artifact = artifact
+			job.finished_at = datetime.now(timezone.utc)
+			if job.id in self._jobs:
+				self._jobs[job.id] = (job, time.monotonic())
+			elif artifact:
+				_remove_file(artifact)  # dropped while running; nobody can fetch it
+
+	def clear(self):
+		with self._lock:
+			for job_id in list(self._jobs):
+				self._discard(job_id)
+
+	def stats(self) -> dict:
+		with self._lock:
+			running = sum(1 for job, _ in self._jobs.values() if not job.finished)
+			return {"jobs": len(self._jobs), "active": running, "max_jobs": self.max_jobs}
+
+
+job_registry = JobRegistry(settings.job_max_entries, settings.job_retention_seconds)
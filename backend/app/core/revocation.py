@@ -0,0 +1,256 @@
+"""
+Access-token revocation (logout / leaked tokens).
+
+Revoked token ids (the `jti` claim) live in the revoked_tokens table. Each
+worker keeps an in-memory Bloom filter of them plus a small exact set:
+
+- not in the filter  -> definitely not revoked, no database round trip
+  (the path every ordinary request takes)
+- in the exact set   -> revoked, no database round trip
+- filter says maybe  -> confirmed against the table (rare: real revocations
+  or the filter's false-positive rate)
+
+The filter is rebuilt from the table every `token_revocation_refresh_seconds`
+(see main.lifespan), which is how a logout in one worker reaches the others.
+Revocations made by this worker apply immediately.
+
+All of a user's tokens are revoked at once by bumping users.token_version
+(role change, soft delete); tokens carry the version they were issued with as
+the `ver` claim. Each worker keeps the current version per user in
+TokenVersionCache: one narrow SELECT the first time a user is seen, then
+memory only. Callers of revoke_user_tokens drop the user's entry in this
+worker once their commit succeeds, and the same refresh re-reads the cached
+users' versions (one query) so bumps made elsewhere apply within the refresh
+interval.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..models.revoked_token import RevokedToken
+from ..models.user import User
+from .config import settings
+
+
+class BloomFilter:
+	"""Fixed-size Bloom filter over strings (SHA-256 double hashing)"""
+
+	def __init__(self, capacity: int, error_rate: float):
+		capacity = max(capacity, 1)
+		self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+		self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+		self._bits = bytearray((self.size + 7) // 8)
+		self.count = 0
+
+	def _positions(self, item: str):
+		digest = hashlib.sha256(item.encode()).digest()
+		h1 = int.from_bytes(digest[:8], "big")
+		h2 = int.from_bytes(digest[8:16], "big") | 1
+		for i in range(self.hash_count):
+			yield (h1 + i * h2) % self.size
+
+	def add(self, item: str):
+		for pos in self._positions(item):
+			self._bits[pos >> 3] |= 1 << (pos & 7)
+		self.count += 1
+
+	def __contains__(self, item: str) -> bool:
+		return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+	def __init__(self, capacity: int, error_rate: float, exact_max_entries: int = 1024):
+		self.capacity = capacity
+		self.error_rate = error_rate
+		self.exact_max_entries = exact_max_entries
+		self._lock = threading.Lock()
+		self._filter = BloomFilter(capacity, error_rate)
+		self._exact: set[str] = set()
+		# Revocations recorded while a refresh is reading the table (None: no refresh running)
+		self._pending: Optional[set[str]] = None
+		self.refreshed_at: Optional[float] = None
+		self.filter_negatives = 0
+		self.db_checks = 0
+
+	def _remember(self, jti: str):
+		# Called with the lock held
+		if len(self._exact) >= self.exact_max_entries:
+			self._exact.clear()  # everything in it is also in the filter
+		self._exact.add(jti)
+
+	def add_local(self, jti: str):
+		"""Record a revocation made by this worker (already stored in the table)"""
+		with self._lock:
+			self._filter.add(jti)
+			self._remember(jti)
+			if self._pending is not None:
+				self._pending.add(jti)
+
+	def is_revoked(self, jti: str, db: Optional[Session]) -> bool:
+		with self._lock:
+			if jti in self._exact:
+				return True
+			if jti not in self._filter:
+				self.filter_negatives += 1
+				return False
+			self.db_checks += 1
+		if db is None:
+			return True  # cannot confirm; fail closed
+		revoked = db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti)) is not None
+		if revoked:
+			with self._lock:
+				self._remember(jti)
+		return revoked
+
+	def rebuild(self, jtis: Iterable[str]):
+		jtis = list(jtis)
+		fresh = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+		for jti in jtis:
+			fresh.add(jti)
+		with self._lock:
+			# Revoked after the table was read: carry them over, or the swap would forget them
+			pending, self._pending = self._pending or set(), None
+			for jti in pending:
+				fresh.add(jti)
+			self._filter = fresh
+			self._exact = set(pending)
+			self.refreshed_at = time.time()
+
+	def refresh(self, session_factory: Callable[[], Session]):
+		"""Purge expired rows and rebuild the filter from the table"""
+		now = datetime.now(timezone.utc)
+		with self._lock:
+			self._pending = set()
+		try:
+			with session_factory() as db:
+				db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+				db.commit()
+				jtis = db.scalars(select(RevokedToken.jti)).all()
+		except Exception:
+			with self._lock:
+				self._pending = None
+			raise
+		self.rebuild(jtis)
+
+	def clear(self):
+		self.rebuild([])
+		with self._lock:
+			self.refreshed_at = None
+			self.filter_negatives = 0
+			self.db_checks = 0
+
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				"filter_entries": self._filter.count,
+				"filter_bits": self._filter.size,
+				"exact_entries": len(self._exact),
+				"filter_negatives": self.filter_negatives,
+				"db_checks": self.db_checks,
+				"refreshed_at": datetime.fromtimestamp(self.refreshed_at, timezone.utc).isoformat() if self.refreshed_at else None,
+			}
+
+
+revocation_list = RevocationList(settings.token_revocation_capacity, settings.token_revocation_error_rate)
+
+
+class TokenVersionCache:
+	"""Current token_version per user id (None: deleted or deactivated), LRU-bounded"""
+
+	def __init__(self, max_entries: int):
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[int, Optional[int]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.refreshed_at: Optional[float] = None
+		self.hits = 0
+		self.misses = 0
+
+	def put(self, user_id: int, version: Optional[int]):
+		if self.max_entries <= 0:
+			return
+		with self._lock:
+			self._entries[user_id] = version
+			self._entries.move_to_end(user_id)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+	def current(self, user_id: int, db: Session) -> Optional[int]:
+		with self._lock:
+			if user_id in self._entries:
+				self._entries.move_to_end(user_id)
+				self.hits += 1
+				return self._entries[user_id]
+			self.misses += 1
+		row = db.execute(select(User.token_version, User.is_active).where(User.id == user_id)).first()
+		version = (row.token_version or 0) if row is not None and row.is_active else None
+		self.put(user_id, version)
+		return version
+
+	def invalidate(self, user_id: int):
+		with self._lock:
+			self._entries.pop(user_id, None)
+
+	def refresh(self, session_factory: Callable[[], Session], chunk_size: int = 500):
+		"""Re-read the versions of every cached user"""
+		with self._lock:
+			user_ids = list(self._entries)
+		versions: dict[int, Optional[int]] = {user_id: None for user_id in user_ids}
+		with session_factory() as db:
+			for start in range(0, len(user_ids), chunk_size):
+				stmt = select(User.id, User.token_version, User.is_active).where(User.id.in_(user_ids[start:start + chunk_size]))
+				for row in db.execute(stmt):
+					versions[row.id] = (row.token_version or 0) if row.is_active else None
+		with self._lock:
+			for user_id, version in versions.items():
+				if user_id in self._entries:
+					self._entries[user_id] = version
+			self.refreshed_at = time.time()
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self.refreshed_at = None
+			self.hits = 0
+			self.misses = 0
+
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				"entries": len(self._entries),
+				"max_entries": self.max_entries,
+				"hits": self.hits,
+				"misses": self.misses,
+				"refreshed_at": datetime.fromtimestamp(self.refreshed_at, timezone.utc).isoformat() if self.refreshed_at else None,
+			}
+
+
+token_versions = TokenVersionCache(settings.token_version_cache_max_entries)
+
+
+def revoke_token(db: Session, claims: dict, user_id: Optional[int] = None):
+	"""Store a token's jti in the denylist until the token's own expiry (commits)"""
+	jti = claims["jti"]
+	expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+	if db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti)) is None:
+		db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+		db.commit()
+	revocation_list.add_local(jti)
+
+
+def refresh_revocations_safely(session_factory: Callable[[], Session]):
+	try:
+		revocation_list.refresh(session_factory)
+		token_versions.refresh(session_factory)
+	except SQLAlchemyError as e:
+		# Table missing (migration not applied yet) or DB briefly unavailable:
+		# keep serving with the current filter
+		print(f"Token revocation refresh failed: {e}")
@@ -1,3 +1,8 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -6,21 +11,98 @@ from jose import JWTError, jwt
 from .config import settings
 
 
-def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
+def create_access_token(subject: str, expires_minutes: Optional[int] = None, claims: Optional[dict[str, Any]] = None) -> str:
 	"""Create a signed JWT access token for the given subject (user id or email)."""
 	expires_delta = timedelta(minutes=expires_minutes or settings.access_token_expires_minutes)
 	expire = datetime.now(tz=timezone.utc) + expires_delta
-	to_encode: dict[str, Any] = {"sub": subject, "exp": expire}
+	# jti identifies this token for revocation (logout)
+	to_encode: dict[str, Any] = {**(claims or {}), "sub": subject, "exp": expire, "jti": uuid.uuid4().hex}
 	encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 	return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[str]:
-	"""Verify token and return subject if valid, else None."""
+class TokenCache:
+	"""Bounded LRU of already-verified tokens.
+
+	Keyed by a SHA-256 digest of the token (the token itself is never kept)
+	and holding its claims until the token's own expiry, so a cached entry
+	can never outlive the token it stands for.
+	"""
+
+	def __init__(self, max_entries: int):
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	@staticmethod
+	def _key(token: str) -> bytes:
+		return hashlib.sha256(token.encode()).digest()
+
+	def get(self, token: str) -> Optional[dict]:
+		key = self._key(token)
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None or entry[0] <= time.time():
+				if entry is not None:
+					del self._entries[key]
+				self.misses += 1
+				return None
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return entry[1]
+
+	def put(self, token: str, claims: dict):
+		expires_at = claims.get("exp")
+		if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+			return
+		key = self._key(token)
+		with self._lock:
+			self._entries[key] = (float(expires_at), claims)
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self.hits = 0
+			self.misses = 0
+
+	def stats(self) -> dict:
+		with self._lock:
+			lookups = self.hits + self.misses
+			return {
+				"entries": len(self._entries),
+				"max_entries": self.max_entries,
+				"hits": self.hits,
+				"misses": self.misses,
+				"hit_rate": round(self.hits / lookups, 4) if lookups else None,
+			}
+
+
+token_cache = TokenCache(settings.token_cache_max_entries)
+
+
+def decode_token(token: str) -> Optional[dict]:
+	"""Return the verified claims of a token, or None if invalid or expired."""
+	claims = token_cache.get(token)
+	if claims is not None:
+		return claims
 	try:
-		payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-		return str(payload.get("sub")) if payload.get("sub") else None
+		claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
 	except JWTError:
 		return None
+	token_cache.put(token, claims)
+	return claims
+
+
+def verify_token(token: str) -> Optional[str]:
+	"""Verify token and return subject if valid, else None."""
+	payload = decode_token(token)
+	if not payload:
+		return None
+	return str(payload.get("sub")) if payload.get("sub") else None
 
 
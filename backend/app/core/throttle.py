@@ -0,0 +1,118 @@
+"""
+In-process sliding-window rate limiting (used in front of /auth/login).
+
+Behind a reverse proxy every request arrives from the proxy's address, so
+client_ip() takes the client from X-Forwarded-For, but only when the direct
+peer is one of `trusted_proxies`; otherwise the header is client-controlled
+and ignored.
+"""
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Optional
+
+
+class SlidingWindowLimiter:
+	"""Allow at most `limit` events per key within any `window_seconds` span.
+
+	Keys are kept in LRU order and capped at `max_keys`, so a flood of unique
+	keys (e.g. random usernames) cannot grow memory without bound.
+	"""
+
+	def __init__(self, limit: int, window_seconds: float, max_keys: int = 10000):
+		self.limit = limit
+		self.window_seconds = window_seconds
+		self.max_keys = max_keys
+		self._events: "OrderedDict[str, deque]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def _window(self, key: str, now: float) -> deque:
+		events = self._events.get(key)
+		if events is None:
+			events = self._events[key] = deque()
+			while len(self._events) > self.max_keys:
+				self._events.popitem(last=False)
+		else:
+			self._events.move_to_end(key)
+		cutoff = now - self.window_seconds
+		while events and events[0] <= cutoff:
+			events.popleft()
+		return events
+
+	def retry_after(self, key: str) -> Optional[float]:
+		"""Seconds until `key` may act again, or None if it is under the limit"""
+		if self.limit <= 0:
+			return None
+		now = time.monotonic()
+		with self._lock:
+			events = self._window(key, now)
+			if len(events) < self.limit:
+				return None
+			return max(events[0] + self.window_seconds - now, 0.0)
+
+	def hit(self, key: str) -> Optional[float]:
+		"""Record an event; returns the retry delay instead if already limited"""
+		if self.limit <= 0:
+			return None
+		now = time.monotonic()
+		with self._lock:
+			events = self._window(key, now)
+			if len(events) >= self.limit:
+				return max(events[0] + self.window_seconds - now, 0.0)
+			events.append(now)
+			return None
+
+	def reset(self, key: str):
+		with self._lock:
+			self._events.pop(key, None)
+
+	def clear(self):
+		with self._lock:
+			self._events.clear()
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(trusted_proxies: str) -> tuple[bool, tuple]:
+	entries = [entry.strip() for entry in trusted_proxies.split(",") if entry.strip()]
+	networks = []
+	for entry in entries:
+		if entry == "*":
+			continue
+		try:
+			networks.append(ipaddress.ip_network(entry, strict=False))
+		except ValueError:
+			print(f"Ignoring invalid trusted proxy: {entry}")
+	return "*" in entries, tuple(networks)
+
+
+def _is_trusted(address: str, networks: tuple) -> bool:
+	try:
+		ip = ipaddress.ip_address(address)
+	except ValueError:
+		return False
+	return any(ip in network for network in networks)
+
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str], trusted_proxies: str) -> str:
+	"""The client's address, looking through X-Forwarded-For hops added by trusted proxies.
+
+	`trusted_proxies` is a comma-separated list of addresses/CIDR ranges, or
+	"*" to trust whatever connects (a platform router in front of every
+	request): then the last hop, the address that router saw, is the client.
+	"""
+	address = peer or "unknown"
+	trust_all, networks = _trusted_networks(trusted_proxies)
+	if not forwarded_for or not (trust_all or _is_trusted(address, networks)):
+		return address
+	hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+	if trust_all:
+		return hops[-1] if hops else address
+	# Right to left: the first hop not added by one of our proxies is the client
+	for hop in reversed(hops):
+		address = hop
+		if not _is_trusted(hop, networks):
+			break
+	return address
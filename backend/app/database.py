@@ -1,5 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import threading
+import time
+
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool
 
 from .core.config import settings
 
@@ -8,6 +14,68 @@ class Base(DeclarativeBase):
 	pass
 
 
+class PoolStats:
+	"""Process-wide counters describing connection pool activity"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.reset()
+
+	def reset(self):
+		with self._lock:
+			self.connects = 0
+			self.checkouts = 0
+			self.invalidations = 0
+			self.timeouts = 0
+			self.wait_count = 0
+			self.wait_total = 0.0
+			self.wait_max = 0.0
+
+	def record_wait(self, seconds: float, timed_out: bool = False):
+		with self._lock:
+			self.wait_count += 1
+			self.wait_total += seconds
+			self.wait_max = max(self.wait_max, seconds)
+			if timed_out:
+				self.timeouts += 1
+
+	def increment(self, counter: str):
+		with self._lock:
+			setattr(self, counter, getattr(self, counter) + 1)
+
+	def snapshot(self) -> dict:
+		with self._lock:
+			avg = self.wait_total / self.wait_count if self.wait_count else 0.0
+			return {
+				"connects": self.connects,
+				"checkouts": self.checkouts,
+				"invalidations": self.invalidations,
+				"timeouts": self.timeouts,
+				"wait_ms": {
+					"total": round(self.wait_total * 1000, 3),
+					"avg": round(avg * 1000, 3),
+					"max": round(self.wait_max * 1000, 3),
+				},
+			}
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+	"""QueuePool that records how long callers wait to get a connection"""
+
+	def connect(self):
+		started = time.perf_counter()
+		try:
+			connection = super().connect()
+		except PoolTimeoutError:
+			pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+			raise
+		pool_stats.record_wait(time.perf_counter() - started)
+		return connection
+
+
 def get_database_connect_args():
 	"""Get database connection arguments based on database type"""
 	if settings.database_type == "sqlite":
@@ -15,6 +83,112 @@ def get_database_connect_args():
 	return {}
 
 
+def get_pool_options(url: str) -> dict:
+	"""Get connection pool options for a server database URL"""
+	if url.startswith("sqlite"):
+		return {}
+	return {
+		"poolclass": TimedQueuePool,
+		"pool_size": settings.db_pool_size,
+		"max_overflow": settings.db_max_overflow,
+		"pool_timeout": settings.db_pool_timeout,
+		"pool_recycle": settings.db_pool_recycle,
+		"pool_pre_ping": settings.db_pool_pre_ping,
+	}
+
+
+def instrument_pool(engine):
+	"""Attach pool event listeners that feed pool_stats"""
+	event.listen(engine, "connect", lambda *args: pool_stats.increment("connects"))
+	event.listen(engine, "checkout", lambda *args: pool_stats.increment("checkouts"))
+	event.listen(engine, "invalidate", lambda *args: pool_stats.increment("invalidations"))
+	return engine
+
+
+def get_pool_status(engine=None) -> dict:
+	"""Describe the current pool state plus accumulated counters"""
+	engine = engine or get_engine()
+	pool = engine.pool
+	status = {"pool_class": type(pool).__name__}
+	if isinstance(pool, QueuePool):
+		status.update({
+			"size": pool.size(),
+			"checked_out": pool.checkedout(),
+			"checked_in": pool.checkedin(),
+			"overflow": max(pool.overflow(), 0),
+			"max_overflow": pool._max_overflow,
+			"timeout": pool.timeout(),
+		})
+	status.update(pool_stats.snapshot())
+	return status
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+	"""Apply the SQLite performance profile to a new DBAPI connection"""
+	cursor = dbapi_connection.cursor()
+	try:
+		cursor.execute("PRAGMA journal_mode=WAL")
+		cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+		cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+		cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+		cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+		cursor.execute(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+	finally:
+		cursor.close()
+
+
+class SQLiteWriteQueue:
+	"""Serializes write transactions so concurrent requests wait their turn.
+
+	SQLite allows a single writer at a time. Instead of letting concurrent
+	sessions race for the file lock and fail with "database is locked", a
+	session takes the writer slot on its first write (flush or DML statement)
+	and gives it back when its transaction ends.
+	"""
+
+	_info_key = "sqlite_writer_slot"
+
+	def __init__(self, timeout: float):
+		self.timeout = timeout
+		self._slot = threading.BoundedSemaphore(1)
+
+	def acquire(self, session):
+		if self._info_key in session.info:
+			return
+		# On timeout carry on anyway and let busy_timeout arbitrate
+		session.info[self._info_key] = self._slot.acquire(timeout=self.timeout)
+
+	def release(self, session):
+		if session.info.pop(self._info_key, False):
+			self._slot.release()
+
+	def install(self, session_factory):
+		"""Register session events on a sessionmaker"""
+		def on_flush(session, flush_context, instances):
+			self.acquire(session)
+
+		def on_execute(orm_execute_state):
+			if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+				self.acquire(orm_execute_state.session)
+
+		def on_transaction_end(session, transaction):
+			if transaction.parent is None:
+				self.release(session)
+
+		event.listen(session_factory, "before_flush", on_flush)
+		event.listen(session_factory, "do_orm_execute", on_execute)
+		event.listen(session_factory, "after_transaction_end", on_transaction_end)
+		return session_factory
+
+
+sqlite_write_queue = SQLiteWriteQueue(timeout=settings.sqlite_busy_timeout / 1000)
+
+
+def use_sqlite_performance_mode(engine) -> bool:
+	"""Whether the opt-in SQLite profile applies to this engine"""
+	return settings.sqlite_performance_mode and engine.dialect.name == "sqlite"
+
+
 def create_database_engine():
 	"""Create database engine based on current configuration"""
 	try:
@@ -36,16 +210,18 @@ def create_database_engine():
 			if db_url.startswith("postgresql://") and "+" not in db_url:
 				db_url = db_url.replace("postgresql://", "postgresql+pg8000://", 1)
 				
-			return create_engine(
+			return instrument_pool(create_engine(
 				db_url,
-				connect_args=get_database_connect_args()
-			)
+				connect_args=get_database_connect_args(),
+				**get_pool_options(db_url)
+			))
 		
 		# Default path (SQLite or explicit driver URLs)
-		return create_engine(
+		return instrument_pool(create_engine(
 			settings.effective_database_url,
-			connect_args=get_database_connect_args()
-		)
+			connect_args=get_database_connect_args(),
+			**get_pool_options(settings.effective_database_url)
+		))
 	except Exception as e:
 		# Fallback to SQLite if there's an issue
 		print(f"Warning: Could not create {settings.database_type} engine: {e}")
@@ -56,9 +232,102 @@ def create_database_engine():
 		)
 
 
+def create_read_database_engine():
+	"""Create the read replica engine, or None when no replica is configured"""
+	if not settings.read_database_url:
+		return None
+	db_url = settings.read_database_url
+	if db_url.startswith("postgresql://") and "+" not in db_url:
+		db_url = db_url.replace("postgresql://", "postgresql+pg8000://", 1)
+	try:
+		return instrument_pool(create_engine(
+			db_url,
+			connect_args={"check_same_thread": False} if db_url.startswith("sqlite") else {},
+			**get_pool_options(db_url)
+		))
+	except Exception as e:
+		print(f"Warning: Could not create read replica engine: {e}")
+		print("Reads will use the primary database...")
+		return None
+
+
+class ReplicaStickiness:
+	"""Remembers recent writers so their reads hit the primary for a short window.
+
+	This gives read-your-writes consistency per user while the replica catches
+	up. State is per process; with several workers a user's next read may land
+	on a worker that has not seen the write, so keep the window above the
+	typical replication lag rather than relying on it exactly.
+	"""
+
+	def __init__(self, window_seconds: float, max_entries: int = 10000):
+		self.window_seconds = window_seconds
+		self.max_entries = max_entries
+		self._lock = threading.Lock()
+		self._until: dict[str, float] = {}
+
+	def mark(self, key: str | None):
+		if not key:
+			return
+		now = time.monotonic()
+		with self._lock:
+			if len(self._until) >= self.max_entries:
+				self._until = {k: v for k, v in self._until.items() if v > now}
+			self._until[key] = now + self.window_seconds
+
+	def is_sticky(self, key: str | None) -> bool:
+		if not key:
+			return False
+		with self._lock:
+			until = self._until.get(key)
+			if until is None:
+				return False
+			if until <= time.monotonic():
+				del self._until[key]
+				return False
+			return True
+
+
+replica_stickiness = ReplicaStickiness(settings.read_replica_sticky_seconds)
+
+
+def get_writer_key(request: Request | None) -> str | None:
+	"""Identify the caller for read-your-writes stickiness (user id, else client host)"""
+	if request is None:
+		return None
+	authorization = request.headers.get("authorization", "")
+	if authorization.lower().startswith("bearer "):
+		from .core.security import verify_token
+		subject = verify_token(authorization.split(" ", 1)[1])
+		if subject:
+			return f"user:{subject}"
+	return f"host:{request.client.host}" if request.client else None
+
+
+def track_writes(session_factory):
+	"""Mark the session's caller sticky to the primary after it commits a write"""
+	def on_flush(session, flush_context):
+		session.info["has_writes"] = True
+
+	def on_execute(orm_execute_state):
+		if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+			orm_execute_state.session.info["has_writes"] = True
+
+	def on_commit(session):
+		if session.info.pop("has_writes", False):
+			replica_stickiness.mark(session.info.get("writer_key"))
+
+	event.listen(session_factory, "after_flush", on_flush)
+	event.listen(session_factory, "do_orm_execute", on_execute)
+	event.listen(session_factory, "after_commit", on_commit)
+	return session_factory
+
+
 # Create engine lazily to avoid import issues
 _engine = None
 _SessionLocal = None
+_read_engine = None
+_ReadSessionLocal = None
 
 
 def get_engine():
@@ -66,6 +335,8 @@ def get_engine():
 	global _engine
 	if _engine is None:
 		_engine = create_database_engine()
+		if use_sqlite_performance_mode(_engine):
+			event.listen(_engine, "connect", apply_sqlite_pragmas)
 	return _engine
 
 
@@ -74,15 +345,71 @@ def get_session_local():
 	global _SessionLocal
 	if _SessionLocal is None:
 		_SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+		if use_sqlite_performance_mode(get_engine()) and settings.sqlite_serialize_writes:
+			sqlite_write_queue.install(_SessionLocal)
+		if settings.read_database_url:
+			track_writes(_SessionLocal)
 	return _SessionLocal
 
 
-def get_db():
-	from sqlalchemy.orm import Session
+def get_read_engine():
+	"""Get or create the read replica engine (None when not configured)"""
+	global _read_engine
+	if _read_engine is None and settings.read_database_url:
+		_read_engine = create_read_database_engine()
+	return _read_engine
+
+
+def get_read_session_local():
+	"""Get or create the replica session factory (None when not configured)"""
+	global _ReadSessionLocal
+	if _ReadSessionLocal is None and get_read_engine() is not None:
+		_ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=get_read_engine())
+	return _ReadSessionLocal
+
+
+def get_session_factory():
+	"""Session factory for work that outlives the request (background jobs)"""
+	return get_session_local()
+
+
+def get_read_session_factory(request: Request):
+	"""Session factory for reads that outlive the endpoint (streamed responses).
+
+	Same routing as get_read_db: the replica when configured, the primary for
+	callers that wrote recently.
+	"""
+	read_session_local = get_read_session_local()
+	if read_session_local is None or replica_stickiness.is_sticky(get_writer_key(request)):
+		return get_session_local()
+	return read_session_local
+
+
+def get_db(request: Request = None):
 	db: Session = get_session_local()()
+	if request is not None and settings.read_database_url:
+		db.info["writer_key"] = get_writer_key(request)
 	try:
 		yield db
 	finally:
 		db.close()
 
 
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+	"""Session for read-only endpoints.
+
+	Uses the read replica when one is configured, except for callers that
+	wrote recently, who stay on the primary session until the sticky window
+	passes. Without a replica this is simply the primary session.
+	"""
+	read_session_local = get_read_session_local()
+	if read_session_local is None or replica_stickiness.is_sticky(get_writer_key(request)):
+		yield db
+		return
+	replica: Session = read_session_local()
+	try:
+		yield replica
+	finally:
+		replica.close()
+
+
@@ -0,0 +1,187 @@
+"""
+Shared authentication dependencies.
+
+The bearer token is decoded once per request (FastAPI caches a dependency's
+result for the duration of a request, so an endpoint and its permission check
+share it). For tokens without role/version claims the user's
+id/email/role/active flag are loaded and kept in a small TTL + LRU cache.
+User edits invalidate the entry immediately in this process; the TTL bounds
+staleness in other worker processes.
+
+Tokens issued by create_user_access_token carry the user's role and
+token version, and those requests are authorized from the claims alone: the
+role claim decides permissions (a refusal costs no database work at all) and
+the version claim is compared with the user's current token_version from
+core.revocation.token_versions, a per-worker cache of versions only.
+Bumping the version (role change, soft delete) revokes every outstanding
+token. Handlers that need the user row load it themselves. The user cache
+above serves tokens minted before the claims existed, which fall back to the
+stored role. Individual tokens (logout) are revoked by jti through
+core.revocation.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Annotated, Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .core.config import settings
+from .core.roles import Permission, has_permission
+from .core.revocation import revocation_list, token_versions
+from .core.security import decode_token
+from .database import get_db
+from .models.user import User
+
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+	"""Detached snapshot of the authenticated user (email only for legacy tokens)"""
+	id: int
+	role: str
+	email: Optional[str] = None
+	is_active: bool = True
+	token_version: int = 0
+
+	@classmethod
+	def from_user(cls, user: User) -> "CurrentUser":
+		return cls(
+			id=user.id,
+			email=user.email,
+			role=user.role,
+			is_active=user.is_active,
+			token_version=user.token_version or 0,
+		)
+
+
+class UserCache:
+	"""Thread-safe TTL + LRU cache of CurrentUser snapshots keyed by user id"""
+
+	def __init__(self, ttl_seconds: float, max_entries: int):
+		self.ttl_seconds = ttl_seconds
+		self.max_entries = max_entries
+		self._entries: "OrderedDict[int, tuple[float, CurrentUser]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, user_id: int) -> Optional[CurrentUser]:
+		with self._lock:
+			entry = self._entries.get(user_id)
+			if entry is None or entry[0] <= time.monotonic():
+				if entry is not None:
+					del self._entries[user_id]
+				self.misses += 1
+				return None
+			self._entries.move_to_end(user_id)
+			self.hits += 1
+			return entry[1]
+
+	def put(self, user: CurrentUser):
+		if self.ttl_seconds <= 0 or self.max_entries <= 0:
+			return
+		with self._lock:
+			self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+			self._entries.move_to_end(user.id)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+	def invalidate(self, user_id: int):
+		with self._lock:
+			self._entries.pop(user_id, None)
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self.hits = 0
+			self.misses = 0
+
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				"entries": len(self._entries),
+				"max_entries": self.max_entries,
+				"ttl_seconds": self.ttl_seconds,
+				"hits": self.hits,
+				"misses": self.misses,
+			}
+
+
+user_cache = UserCache(settings.user_cache_ttl_seconds, settings.user_cache_max_entries)
+
+
+def get_token_claims(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)) -> dict:
+	claims = decode_token(token)
+	if not claims or not claims.get("sub"):
+		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+	# Bloom filter first: tokens that were never revoked cost no database work
+	if "jti" in claims and revocation_list.is_revoked(claims["jti"], db):
+		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+	return claims
+
+
+def get_current_user_id(claims: dict = Depends(get_token_claims)) -> int:
+	return int(claims["sub"])
+
+
+def load_current_user(db: Session, user_id: int) -> CurrentUser:
+	"""Cached user lookup; 401 if the user no longer exists or was deactivated"""
+	user = user_cache.get(user_id)
+	if user is None:
+		row = db.scalar(select(User).where(User.id == user_id))
+		if row is None:
+			raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+		user = CurrentUser.from_user(row)
+		user_cache.put(user)
+	if not user.is_active:
+		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive")
+	return user
+
+
+def get_current_user(
+	claims: dict = Depends(get_token_claims),
+	db: Session = Depends(get_db),
+) -> CurrentUser:
+	user_id = int(claims["sub"])
+	if "role" in claims and "ver" in claims:
+		# Deleted and deactivated users have no current version
+		if token_versions.current(user_id, db) != claims["ver"]:
+			raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+		return CurrentUser(id=user_id, role=claims["role"], token_version=claims["ver"])
+	# Tokens minted before role/version claims existed fall back to the stored role
+	return load_current_user(db, user_id)
+
+
+def check_permission(role: str, permission: Permission):
+	"""Raise 403 unless the role grants the permission"""
+	if not has_permission(role, permission):
+		raise HTTPException(
+			status_code=status.HTTP_403_FORBIDDEN,
+			detail=f"Insufficient permissions. Required: {permission.value}"
+		)
+
+
+def require_permission(permission: Permission):
+	"""Dependency factory: the current user, after checking one permission"""
+
+	def dependency(
+		claims: dict = Depends(get_token_claims),
+		db: Session = Depends(get_db),
+	) -> CurrentUser:
+		if "role" in claims:
+			# Refuse before the version check, so refusals cost no database work
+			check_permission(claims["role"], permission)
+			return get_current_user(claims, db)
+		user = get_current_user(claims, db)
+		check_permission(user.role, permission)
+		return user
+
+	return dependency
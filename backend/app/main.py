@@ -1,8 +1,13 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 import os
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from .routers import auth as auth_router
 from .routers import risks as risks_router
 from .routers import users as users_router
@@ -12,14 +17,38 @@ from .routers import config_manager as config_router
 from .routers import snapshots as snapshots_router
 from .routers import rbs as rbs_router
 from .routers import audit as audit_router
+from .routers import reports as reports_router
+from .core.compression import CompressionMiddleware
 from .core.config import settings
+from .core.hashing import PasswordHasherBusy
+from .core.instrumentation import QueryStatsMiddleware, install_query_instrumentation
+from .core.revocation import refresh_revocations_safely
+from .database import get_session_local
 
 # Import models to ensure they are registered with SQLAlchemy
 from . import models
 
 
+async def refresh_token_revocations():
+	# Picks up logouts made in other worker processes
+	while True:
+		await run_in_threadpool(refresh_revocations_safely, get_session_local())
+		await asyncio.sleep(settings.token_revocation_refresh_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	# Sync endpoints run on this pool; size it against the DB connection pool
+	anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+	refresher = asyncio.create_task(refresh_token_revocations())
+	try:
+		yield
+	finally:
+		refresher.cancel()
+
+
 def create_app() -> FastAPI:
-	app = FastAPI(title="Risk Platform API", version="0.1.0")
+	app = FastAPI(title="Risk Platform API", version="0.1.0", lifespan=lifespan)
 
 	# CORS - allow origins based on configuration
 	
@@ -29,8 +58,29 @@ def create_app() -> FastAPI:
 		allow_credentials=True,
 		allow_methods=["*"],
 		allow_headers=["*"],
+		# Pagination metadata travels in headers so list responses stay plain arrays
+		expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 	)
 
+	# Per-request SQL query counts and timing
+	if settings.sql_instrumentation_enabled:
+		install_query_instrumentation()
+		app.add_middleware(QueryStatsMiddleware)
+
+	# brotli/gzip by Accept-Encoding; added last so it wraps (and compresses for) every other middleware
+	if settings.compression_enabled:
+		app.add_middleware(
+			CompressionMiddleware,
+			minimum_size=settings.compression_minimum_size,
+			gzip_level=settings.compression_gzip_level,
+			brotli_quality=settings.compression_brotli_quality,
+		)
+
+	@app.exception_handler(PasswordHasherBusy)
+	async def password_hasher_busy(request, exc: PasswordHasherBusy):
+		# Shed password work instead of queueing it without bound
+		return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 	# Routers
 	app.include_router(auth_router.router)
 	app.include_router(risks_router.router)
@@ -41,6 +91,7 @@ def create_app() -> FastAPI:
 	app.include_router(snapshots_router.router)
 	app.include_router(rbs_router.router)
 	app.include_router(audit_router.router)
+	app.include_router(reports_router.router)
 
 	# Serve built SPA if present (frontend/dist)
 	# Expect dist placed at app/static/frontend
@@ -50,7 +101,7 @@ def create_app() -> FastAPI:
 		app.mount("/app", StaticFiles(directory=static_root), name="frontend")
 
 		@app.get("/app/{full_path:path}", response_class=HTMLResponse)
-		async def spa_fallback(full_path: str):
+		def spa_fallback(full_path: str):
 			with open(index_file, "r", encoding="utf-8") as f:
 				return f.read()
 
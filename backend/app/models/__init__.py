@@ -7,5 +7,7 @@ from .action_item import ActionItem
 from .snapshot import Snapshot
 from .rbs import RBSNode
 from .audit_log import AuditLog
+from .revoked_token import RevokedToken
+from .risk_aggregate import RiskAggregate
 
-__all__ = ["Risk", "User", "ActionItem", "Snapshot", "RBSNode", "AuditLog"]
+__all__ = ["Risk", "User", "ActionItem", "Snapshot", "RBSNode", "AuditLog", "RevokedToken", "RiskAggregate"]
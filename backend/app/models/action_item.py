@@ -1,12 +1,24 @@
 from datetime import datetime, timezone
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, Boolean, func, select, text
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from ..database import Base
+from .risk import Risk
 
 
 class ActionItem(Base):
     __tablename__ = "action_items"
+    __table_args__ = (
+        Index("ix_action_items_status_due_date", "status", "due_date"),
+        Index("ix_action_items_risk_created", "risk_id", "created_at"),
+        # Overdue checks only ever look at open work
+        Index(
+            "ix_action_items_open_due_date",
+            "due_date",
+            postgresql_where=text("status IN ('pending', 'in_progress')"),
+            sqlite_where=text("status IN ('pending', 'in_progress')"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
@@ -46,3 +58,14 @@ class ActionItem(Base):
 
     def __repr__(self):
         return f"<ActionItem(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+
+# Counted in the same SELECT that loads a risk (a correlated subquery served by
+# ix_action_items_risk_created), so serializing a page of risks never loads
+# their action items. Defined here because it needs both tables.
+Risk.action_items_count = column_property(
+    select(func.count(ActionItem.id))
+    .where(ActionItem.risk_id == Risk.id)
+    .correlate_except(ActionItem)
+    .scalar_subquery()
+)
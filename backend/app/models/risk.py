@@ -1,13 +1,49 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, Integer, String, Text, event, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from ..database import Base
 
 
+def compute_score(probability: int | None, impact: int | None) -> int | None:
+	# Risk Score = Probability × Impact
+	if probability is None or impact is None:
+		return None
+	return int(probability) * int(impact)
+
+
+def risk_level_for_score(score: int | None) -> str:
+	if score is None:
+		return "Not Assessed"
+	elif score <= 4:
+		return "Low"
+	elif score <= 8:
+		return "Medium"
+	elif score <= 15:
+		return "High"
+	else:
+		return "Critical"
+
+
 class Risk(Base):
 	__tablename__ = "risks"
+	__table_args__ = (
+		# Access paths used by list_risks (filters + default created_at sort)
+		Index("ix_risks_owner_status_created", "owner_id", "status", "created_at"),
+		Index("ix_risks_status_created", "status", "created_at"),
+		Index("ix_risks_rbs_node_created", "rbs_node_id", "created_at"),
+		Index("ix_risks_created_at", "created_at"),
+		# Name conflict checks during spreadsheet import
+		Index("ix_risks_risk_name", "risk_name"),
+		# Open risks are the bulk of day-to-day reads
+		Index(
+			"ix_risks_open_created",
+			"created_at",
+			postgresql_where=text("status = 'open'"),
+			sqlite_where=text("status = 'open'"),
+		),
+	)
 
 	id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 	risk_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -17,6 +53,10 @@ class Risk(Base):
 	probability: Mapped[int | None] = mapped_column(Integer, nullable=True)
 	impact: Mapped[int | None] = mapped_column(Integer, nullable=True)
 	
+	# Persisted from probability/impact on every write so they can be indexed
+	score: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+	risk_level: Mapped[str] = mapped_column(String(20), nullable=False, default="Not Assessed", index=True)
+	
 	# Risk details
 	scope: Mapped[str] = mapped_column(String(32), nullable=False, default="project")
 	risk_owner: Mapped[str] = mapped_column(String(100), nullable=True, default="Unassigned")
@@ -38,30 +78,48 @@ class Risk(Base):
 	owner = relationship("User", back_populates="risks", foreign_keys=[owner_id])
 	action_items = relationship("ActionItem", back_populates="risk")
 
-	@property
-	def score(self) -> int | None:
-		# Risk Score = Probability × Impact
-		if self.probability is None or self.impact is None:
-			return None
-		return int(self.probability) * int(self.impact)
-
-	@property
-	def action_items_count(self) -> int:
-		# Count of action items for this risk
-		return len(self.action_items) if self.action_items else 0
-
-	@property
-	def risk_level(self) -> str:
-		score = self.score
-		if score is None:
-			return "Not Assessed"
-		elif score <= 4:
-			return "Low"
-		elif score <= 8:
-			return "Medium"
-		elif score <= 15:
-			return "High"
-		else:
-			return "Critical"
+	@validates("probability", "impact")
+	def _sync_score(self, key, value):
+		probability = value if key == "probability" else self.probability
+		impact = value if key == "impact" else self.impact
+		self.score = compute_score(probability, impact)
+		self.risk_level = risk_level_for_score(self.score)
+		return value
+
+	# action_items_count is a column_property (correlated count), added in models/action_item.py
+
+
+# Full-text search over the register. SQLite keeps an external-content FTS5
+# table in sync with triggers; Postgres uses a GIN expression index, which the
+# planner maintains itself. Alembic migration f4b6d8e0a2c3 creates the same
+# objects on existing databases.
+SEARCH_COLUMNS = ("risk_name", "risk_description", "notes", "probability_basis", "impact_basis")
+
+_fts_columns = ", ".join(SEARCH_COLUMNS)
+_fts_new = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+_fts_old = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+
+SQLITE_FTS_DDL = [
+	f"CREATE VIRTUAL TABLE IF NOT EXISTS risks_fts USING fts5({_fts_columns}, "
+	"content='risks', content_rowid='id', tokenize='porter unicode61')",
+	f"CREATE TRIGGER IF NOT EXISTS risks_fts_ai AFTER INSERT ON risks BEGIN "
+	f"INSERT INTO risks_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new}); END",
+	f"CREATE TRIGGER IF NOT EXISTS risks_fts_ad AFTER DELETE ON risks BEGIN "
+	f"INSERT INTO risks_fts(risks_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old}); END",
+	f"CREATE TRIGGER IF NOT EXISTS risks_fts_au AFTER UPDATE OF {_fts_columns} ON risks BEGIN "
+	f"INSERT INTO risks_fts(risks_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old}); "
+	f"INSERT INTO risks_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new}); END",
+]
 
+POSTGRES_SEARCH_VECTOR = "to_tsvector('english', " + " || ' ' || ".join(
+	f"coalesce({c}, '')" for c in SEARCH_COLUMNS
+) + ")"
 
+for _statement in SQLITE_FTS_DDL:
+	event.listen(Risk.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Risk.__table__, "before_drop", DDL("DROP TABLE IF EXISTS risks_fts").execute_if(dialect="sqlite"))
+event.listen(
+	Risk.__table__,
+	"after_create",
+	DDL(f"CREATE INDEX IF NOT EXISTS ix_risks_search ON risks USING gin ({POSTGRES_SEARCH_VECTOR})").execute_if(dialect="postgresql"),
+)
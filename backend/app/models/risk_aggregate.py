@@ -0,0 +1,34 @@
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+
+
+class RiskAggregate(Base):
+    """Risk counts per (owner, status, probability, impact, scope, RBS node).
+
+    Maintained alongside every risk write by services.risk_aggregates so the
+    dashboard reads a few dozen cells instead of scanning the risks table.
+    Key columns are NOT NULL so the unique constraint can drive upserts:
+    0 stands for "not set" in probability, impact and rbs_node_id.
+    """
+
+    __tablename__ = "risk_aggregates"
+    __table_args__ = (
+        UniqueConstraint(
+            "owner_id", "status", "probability", "impact", "scope", "rbs_node_id",
+            name="uq_risk_aggregates_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    probability: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    impact: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    scope: Mapped[str] = mapped_column(String(32), nullable=False)
+    rbs_node_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    risk_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RiskAggregate(owner_id={self.owner_id}, status='{self.status}', p={self.probability}, i={self.impact}, risk_count={self.risk_count})>"
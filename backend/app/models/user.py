@@ -21,6 +21,9 @@ class User(Base):
 
 	# Soft delete flag
 	is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+
+	# Embedded in access tokens as "ver"; bumping it revokes every token issued before
+	token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 	
 	created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
@@ -1,63 +1,69 @@
-from typing import List, Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..core.etag import make_etag, not_modified, query_params_key, table_version
+from ..core.responses import json_list_response
+from ..database import get_db, get_read_db
+from ..models.action_item import ActionItem as ActionItemModel
 from ..schemas.action_item import ActionItem, ActionItemCreate, ActionItemUpdate
-from ..core.roles import has_permission, Permission
-from ..services.auth import get_current_user
+from ..core.roles import Permission
+from ..dependencies import CurrentUser, require_permission
 from ..services.action_items import ActionItemService
-from ..core.security import verify_token
+from ..services.pagination import InvalidCursor, estimate_count, next_cursor
 
 router = APIRouter(prefix="/action-items", tags=["action-items"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return int(user_id)
-
-
-def check_permission(permission: Permission, user_id: int, db: Session):
-    """Check if user has permission, raise 403 if not"""
-    user = get_current_user(db, user_id)
-    if not has_permission(user.role, permission):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Insufficient permissions. Required: {permission.value}"
-        )
-
 @router.get("/", response_model=List[ActionItem])
-async def get_action_items(
+def get_action_items(
+    request: Request,
+    response: Response,
     risk_id: int = None,
     status: str = None,
     assigned_to: int = None,
-    db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id)
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (unpaged when omitted)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    include_total: bool = Query(False, description="Return the (estimated) match count in X-Total-Count"),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(require_permission(Permission.VIEW_ACTION_ITEMS))
 ):
     """Get action items with optional filtering"""
-    # View permission
-    check_permission(Permission.VIEW_ACTION_ITEMS, user_id, db)
     service = ActionItemService(db)
-    return service.get_action_items(
-        risk_id=risk_id,
-        status=status,
-        assigned_to=assigned_to
-    )
+    query = service.action_items_query(risk_id, status, assigned_to)
+    etag = make_etag(query_params_key(request), table_version(db, query, ActionItemModel.updated_at))
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+
+    try:
+        items = service.get_action_items(
+            risk_id=risk_id,
+            status=status,
+            assigned_to=assigned_to,
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    next_page = next_cursor(items, limit, "created_at") if limit else None
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    if include_total:
+        response.headers["X-Total-Count"] = str(estimate_count(db, query))
+    return json_list_response(ActionItem, items, response)
 
 
 @router.get("/{action_item_id}", response_model=ActionItem)
-async def get_action_item(
+def get_action_item(
     action_item_id: int,
-    db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(require_permission(Permission.VIEW_ACTION_ITEMS))
 ):
     """Get a specific action item by ID"""
-    # View permission
-    check_permission(Permission.VIEW_ACTION_ITEMS, user_id, db)
     service = ActionItemService(db)
     action_item = service.get_action_item(action_item_id)
     if not action_item:
@@ -65,34 +71,33 @@ async def get_action_item(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Action item not found"
         )
+    cached = not_modified(request, response, make_etag(action_item.id, action_item.updated_at))
+    if cached is not None:
+        return cached
     return action_item
 
 
 @router.post("/", response_model=ActionItem, status_code=status.HTTP_201_CREATED)
-async def create_action_item(
+def create_action_item(
     action_item: ActionItemCreate,
     db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id)
+    user: CurrentUser = Depends(require_permission(Permission.CREATE_ACTION_ITEMS))
 ):
     """Create a new action item"""
-    # Create permission
-    check_permission(Permission.CREATE_ACTION_ITEMS, user_id, db)
     service = ActionItemService(db)
-    return service.create_action_item(action_item, user_id)
+    return service.create_action_item(action_item, user.id)
 
 
 @router.put("/{action_item_id}", response_model=ActionItem)
-async def update_action_item(
+def update_action_item(
     action_item_id: int,
     action_item_update: ActionItemUpdate,
     db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id)
+    user: CurrentUser = Depends(require_permission(Permission.EDIT_ACTION_ITEMS))
 ):
     """Update an existing action item"""
-    # Edit permission
-    check_permission(Permission.EDIT_ACTION_ITEMS, user_id, db)
     service = ActionItemService(db)
-    updated_item = service.update_action_item(action_item_id, action_item_update, user_id)
+    updated_item = service.update_action_item(action_item_id, action_item_update, user.id)
     if not updated_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,16 +107,14 @@ async def update_action_item(
 
 
 @router.delete("/{action_item_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_action_item(
+def delete_action_item(
     action_item_id: int,
     db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id)
+    user: CurrentUser = Depends(require_permission(Permission.DELETE_ACTION_ITEMS))
 ):
     """Delete an action item"""
-    # Delete permission
-    check_permission(Permission.DELETE_ACTION_ITEMS, user_id, db)
     service = ActionItemService(db)
-    success = service.delete_action_item(action_item_id, user_id)
+    success = service.delete_action_item(action_item_id, user.id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -120,16 +123,14 @@ async def delete_action_item(
 
 
 @router.patch("/{action_item_id}/status", response_model=ActionItem)
-async def update_action_item_status(
+def update_action_item_status(
     action_item_id: int,
     status: str,
     progress_percentage: int = None,
     db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id)
+    user: CurrentUser = Depends(require_permission(Permission.EDIT_ACTION_ITEMS))
 ):
     """Update action item status and progress"""
-    # Edit permission
-    check_permission(Permission.EDIT_ACTION_ITEMS, user_id, db)
     service = ActionItemService(db)
     updated_item = service.update_status(action_item_id, status, progress_percentage)
     if not updated_item:
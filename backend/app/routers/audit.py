@@ -1,46 +1,39 @@
-from typing import Annotated, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.security import OAuth2PasswordBearer
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
-from ..core.security import verify_token
-from ..database import get_db
+from ..core.responses import json_list_response
+from ..database import get_read_db
+from ..dependencies import CurrentUser, get_current_user
 from ..schemas.audit import AuditLogRead, AuditLogFilter, RiskTrendDataPoint
 from ..services.audit import (
+    audit_log_query,
     get_audit_logs, 
     get_risk_audit_trail, 
     get_action_item_audit_trail,
     get_risk_trend_data
 )
-from ..services.auth import get_current_user
+from ..services.pagination import InvalidCursor, estimate_count, next_cursor
 
 router = APIRouter(prefix="/audit", tags=["audit"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
-
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return int(user_id)
 
 
 @router.get("/logs", response_model=List[AuditLogRead])
 def get_audit_logs_endpoint(
-    db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
     entity_type: Optional[str] = Query(None, description="Filter by entity type"),
     entity_id: Optional[int] = Query(None, description="Filter by entity ID"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     action: Optional[str] = Query(None, description="Filter by action"),
     limit: int = Query(100, ge=1, le=1000, description="Number of logs to return"),
-    offset: int = Query(0, ge=0, description="Number of logs to skip")
+    offset: int = Query(0, ge=0, description="Number of logs to skip"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
+    include_total: bool = Query(False, description="Return the (estimated) match count in X-Total-Count")
 ):
     """Get audit logs with optional filtering"""
     
-    # Get current user to check permissions
-    user = get_current_user(db, current_user_id)
-    
     # Only managers and admins can view audit logs
     if user.role not in ["manager", "admin"]:
         raise HTTPException(
@@ -48,15 +41,26 @@ def get_audit_logs_endpoint(
             detail="Insufficient permissions to view audit logs"
         )
     
-    logs = get_audit_logs(
-        db=db,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        user_id=user_id,
-        action=action,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        logs = get_audit_logs(
+            db=db,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            user_id=user_id,
+            action=action,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    next_page = next_cursor(logs, limit, "timestamp")
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    if include_total:
+        query = audit_log_query(db, entity_type, entity_id, user_id, action)
+        response.headers["X-Total-Count"] = str(estimate_count(db, query))
     
     # Convert to response format with user email
     result = []
@@ -74,23 +78,20 @@ def get_audit_logs_endpoint(
             "timestamp": log.timestamp,
             "user_email": log.user.email if log.user else None
         }
-        result.append(AuditLogRead(**log_dict))
+        result.append(log_dict)
     
-    return result
+    return json_list_response(AuditLogRead, result, response)
 
 
 @router.get("/risks/{risk_id}/trail", response_model=List[AuditLogRead])
 def get_risk_audit_trail_endpoint(
     risk_id: int,
-    db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
     limit: int = Query(50, ge=1, le=500, description="Number of logs to return")
 ):
     """Get audit trail for a specific risk"""
     
-    # Get current user to check permissions
-    user = get_current_user(db, current_user_id)
-    
     # Check if user can access this risk
     from ..services.risk import get_risk
     risk = get_risk(db, user.id, risk_id, user.role)
@@ -126,15 +127,12 @@ def get_risk_audit_trail_endpoint(
 @router.get("/action-items/{action_item_id}/trail", response_model=List[AuditLogRead])
 def get_action_item_audit_trail_endpoint(
     action_item_id: int,
-    db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
     limit: int = Query(50, ge=1, le=500, description="Number of logs to return")
 ):
     """Get audit trail for a specific action item"""
     
-    # Get current user to check permissions
-    user = get_current_user(db, current_user_id)
-    
     # Check if user can access this action item
     from ..models.action_item import ActionItem
     action_item = db.get(ActionItem, action_item_id)
@@ -179,15 +177,12 @@ def get_action_item_audit_trail_endpoint(
 @router.get("/risks/{risk_id}/trend", response_model=List[RiskTrendDataPoint])
 def get_risk_trend_endpoint(
     risk_id: int,
-    db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
     days: int = Query(30, ge=1, le=365, description="Number of days to look back")
 ):
     """Get risk trend data for probability, impact, and score over time"""
     
-    # Get current user to check permissions
-    user = get_current_user(db, current_user_id)
-    
     # Check if user can access this risk
     from ..services.risk import get_risk
     risk = get_risk(db, user.id, risk_id, user.role)
@@ -1,21 +1,28 @@
-from typing import Annotated
+import math
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from ..database import get_db
+from ..dependencies import get_current_user_id, get_token_claims, user_cache
 from ..models.user import User
 from ..schemas.user import UserCreate, UserRead, Token
-from ..services.auth import authenticate_user, create_user_access_token, register_user
+from ..core.config import settings
+from ..core.revocation import revoke_token, token_versions
+from ..core.throttle import SlidingWindowLimiter, client_ip
+from ..services.auth import authenticate_user_async, create_user_access_token, register_user, revoke_user_tokens
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 DbDep = Depends(get_db)
 
+# Every attempt counts against the client IP; only failures count against the account
+login_ip_limiter = SlidingWindowLimiter(settings.login_ip_max_attempts, settings.login_ip_window_seconds)
+login_account_limiter = SlidingWindowLimiter(settings.login_account_max_failures, settings.login_account_window_seconds)
+
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 def register(payload: UserCreate, db: Session = DbDep):
@@ -26,23 +33,59 @@ def register(payload: UserCreate, db: Session = DbDep):
 	return user
 
 
+def _too_many_attempts(retry_after: float) -> HTTPException:
+	return HTTPException(
+		status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+		detail="Too many login attempts, try again later",
+		headers={"Retry-After": str(math.ceil(retry_after))},
+	)
+
+
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = DbDep):
-	user = authenticate_user(db, email=form_data.username, password=form_data.password)
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = DbDep):
+	# Async so waiting on bcrypt holds no request thread; hashing has its own pool
+	ip = client_ip(
+		request.client.host if request.client else None,
+		request.headers.get("x-forwarded-for"),
+		settings.trusted_proxies,
+	)
+	account = form_data.username.strip().lower()
+
+	retry_after = login_ip_limiter.hit(ip)
+	if retry_after is None:
+		retry_after = login_account_limiter.retry_after(account)
+	if retry_after is not None:
+		raise _too_many_attempts(retry_after)
+
+	user = await authenticate_user_async(db, email=form_data.username, password=form_data.password)
 	if not user:
+		login_account_limiter.hit(account)
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+	login_account_limiter.reset(account)
 	token = create_user_access_token(user)
 	return Token(access_token=token)
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(claims: dict = Depends(get_token_claims), db: Session = DbDep):
+	"""Revoke the access token used for this request."""
+	user_id = int(claims["sub"])
+	if "jti" in claims:
+		revoke_token(db, claims, user_id=user_id)
+	else:
+		# Tokens minted before jti existed can only be revoked all at once
+		user = db.get(User, user_id)
+		if user:
+			revoke_user_tokens(user)
+			db.commit()
+			user_cache.invalidate(user_id)
+			token_versions.invalidate(user_id)
+	return None
+
+
 @router.get("/me", response_model=UserRead)
-def me(token: Annotated[str, Depends(oauth2_scheme)], db: Session = DbDep):
-	# For simplicity in Phase 1: decode subject and fetch user
-	from ..core.security import verify_token
-	user_id = verify_token(token)
-	if not user_id:
-		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-	user = db.get(User, int(user_id))
+def me(user_id: int = Depends(get_current_user_id), db: Session = DbDep):
+	user = db.get(User, user_id)
 	if not user:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 	return user
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import Dict, Any
 import os
@@ -7,9 +6,9 @@ from pathlib import Path
 
 from ..core.security import verify_token
 from ..core.config import settings
+from ..dependencies import get_current_user_id
 
 router = APIRouter(prefix="/config", tags=["config"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 class ConfigUpdateRequest(BaseModel):
@@ -18,13 +17,6 @@ class ConfigUpdateRequest(BaseModel):
     platform: str  # "vercel", "netlify", "render", "local"
 
 
-def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return user_id
-
-
 @router.post("/update-frontend")
 async def update_frontend_config(
     request: ConfigUpdateRequest,
@@ -1,36 +1,33 @@
-from typing import Annotated, List
+from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ..core.security import verify_token
-from ..database import get_db
+from ..core.etag import make_etag, not_modified, table_version
+from ..database import get_db, get_read_db
+from ..dependencies import CurrentUser, get_current_user
+from ..models.rbs import RBSNode
 from ..schemas.rbs import RBSNodeCreate, RBSNodeRead, RBSNodeUpdate, RBSNodeTree
 from ..services import rbs as rbs_service
-from ..models.user import User
 
 
 router = APIRouter(prefix="/rbs", tags=["rbs"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return int(user_id)
-
-
-def get_current_user(db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)) -> User:
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+def nodes_etag(db: Session, current_user: CurrentUser) -> str:
+    """Validator for the node list and tree: count and latest update of the visible nodes"""
+    stmt = select(RBSNode)
+    if current_user.role not in ["manager", "admin"]:
+        stmt = stmt.where(RBSNode.owner_id == current_user.id)
+    return make_etag(current_user.id, current_user.role, table_version(db, stmt, RBSNode.updated_at))
 
 
 @router.get("", response_model=List[RBSNodeRead])
-def list_nodes(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_nodes(request: Request, response: Response, db: Session = Depends(get_read_db), current_user: CurrentUser = Depends(get_current_user)):
+    cached = not_modified(request, response, nodes_etag(db, current_user))
+    if cached is not None:
+        return cached
     # Managers and admins can see all RBS nodes, others only see their own
     if current_user.role in ["manager", "admin"]:
         return rbs_service.list_all_nodes(db)
@@ -39,7 +36,10 @@ def list_nodes(db: Session = Depends(get_db), current_user: User = Depends(get_c
 
 
 @router.get("/tree", response_model=List[RBSNodeTree])
-def list_tree(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_tree(request: Request, response: Response, db: Session = Depends(get_read_db), current_user: CurrentUser = Depends(get_current_user)):
+    cached = not_modified(request, response, nodes_etag(db, current_user))
+    if cached is not None:
+        return cached
     # Managers and admins can see all RBS nodes, others only see their own
     if current_user.role in ["manager", "admin"]:
         roots = rbs_service.list_all_tree(db)
@@ -61,12 +61,12 @@ def list_tree(db: Session = Depends(get_db), current_user: User = Depends(get_cu
 
 
 @router.post("", response_model=RBSNodeRead, status_code=status.HTTP_201_CREATED)
-def create_node(payload: RBSNodeCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_node(payload: RBSNodeCreate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     return rbs_service.create_node(db, owner_id=current_user.id, **payload.model_dump())
 
 
 @router.put("/{node_id}", response_model=RBSNodeRead)
-def update_node(node_id: int, payload: RBSNodeUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def update_node(node_id: int, payload: RBSNodeUpdate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     # Check if user can edit this node (owner or manager/admin)
     if current_user.role in ["manager", "admin"]:
         node = rbs_service.update_node_any(db, node_id=node_id, **payload.model_dump())
@@ -79,7 +79,7 @@ def update_node(node_id: int, payload: RBSNodeUpdate, db: Session = Depends(get_
 
 
 @router.delete("/{node_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_node(node_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def delete_node(node_id: int, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     # Check if user can delete this node (owner or manager/admin)
     if current_user.role in ["manager", "admin"]:
         ok = rbs_service.delete_node_any(db, node_id=node_id)
@@ -92,7 +92,7 @@ def delete_node(node_id: int, db: Session = Depends(get_db), current_user: User
 
 
 @router.post("/{node_id}/move", response_model=RBSNodeRead)
-def move_node(node_id: int, direction: str = Query(pattern="^(up|down)$"), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def move_node(node_id: int, direction: str = Query(pattern="^(up|down)$"), db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     # Check if user can move this node (owner or manager/admin)
     if current_user.role in ["manager", "admin"]:
         node = rbs_service.move_node_any(db, node_id=node_id, direction=direction)
@@ -0,0 +1,67 @@
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from ..core.jobs import Job, job_registry
+from ..core.roles import Permission
+from ..database import get_session_factory
+from ..dependencies import CurrentUser, require_permission
+from ..schemas.job import JobRead
+from ..services.reports import REPORT_FORMATS, run_report_job
+from .risks import risk_filters
+
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+def get_report_job(job_id: str, user: CurrentUser) -> Job:
+    job = job_registry.get(job_id)
+    if not job or job.kind != "risk_report" or (job.owner_id != user.id and user.role != "manager"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+    return job
+
+
+@router.post("", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+def create_report_endpoint(
+    background_tasks: BackgroundTasks,
+    report_format: Literal["pdf", "docx", "xlsx"] = Query(alias="format"),
+    title: str = Query(default="Risk Register", min_length=1, max_length=200),
+    filters: dict = Depends(risk_filters),
+    sort_by: Optional[str] = Query(default=None),
+    order: str = Query(default="desc"),
+    session_factory=Depends(get_session_factory),
+    user: CurrentUser = Depends(require_permission(Permission.EXPORT_DATA)),
+):
+    """Render a report of the matching risks (same filters as GET /risks) in the background.
+
+    Poll GET /reports/{job_id}; once it has completed, fetch the file from
+    GET /reports/{job_id}/download.
+    """
+    job = job_registry.create("risk_report", owner_id=user.id)
+    background_tasks.add_task(
+        run_report_job, job, session_factory, report_format, title, user.id, user.role, sort_by, order, filters
+    )
+    return job
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def report_status_endpoint(job_id: str, user: CurrentUser = Depends(require_permission(Permission.EXPORT_DATA))):
+    return get_report_job(job_id, user)
+
+
+@router.get("/{job_id}/download", response_class=FileResponse)
+def download_report_endpoint(job_id: str, user: CurrentUser = Depends(require_permission(Permission.EXPORT_DATA))):
+    job = get_report_job(job_id, user)
+    if job.status == "failed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=job.error or "Report generation failed")
+    if job.status != "completed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Report is not ready yet")
+    if not job.artifact or not os.path.exists(job.artifact):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report has expired")
+    return FileResponse(
+        job.artifact,
+        media_type=REPORT_FORMATS[job.result["format"]],
+        filename=job.result["filename"],
+    )
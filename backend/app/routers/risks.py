@@ -1,95 +1,210 @@
-from typing import Annotated, Optional
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ..core.security import verify_token
-from ..core.roles import has_permission, Permission
-from ..database import get_db
-from ..schemas.risk import RiskCreate, RiskRead, RiskUpdate
-from ..services.risk import create_risk, delete_risk, get_risk, list_risks, update_risk, get_risk_owners
-from ..services.auth import get_current_user
+from ..core.roles import Permission
+from ..database import get_db, get_read_db, get_read_session_factory, get_session_factory
+from ..dependencies import CurrentUser, get_current_user, require_permission
+from ..core.config import settings
+from ..core.etag import make_etag, not_modified, query_params_key, table_version, table_version_with_children
+from ..core.jobs import job_registry
+from ..core.responses import json_list_response
+from ..schemas.job import JobRead
+from ..models.action_item import ActionItem
+from ..models.risk import Risk
+from ..schemas.risk import RISK_SUMMARY_FIELDS, RiskBulkRequest, RiskBulkResponse, RiskCreate, RiskRead, RiskStats, RiskSummary, RiskUpdate
+from ..services.pagination import InvalidCursor, estimate_count, next_cursor
+from ..services.risk_export import EXPORT_FORMATS, stream_risk_export
+from ..services.risk_import import run_import_job
+from ..services.risk import bulk_write_risks, create_risk, delete_risk, get_risk, list_risks, update_risk, get_risk_owners, risk_list_query, risk_sort_key, risk_stats
 
 
 router = APIRouter(prefix="/risks", tags=["risks"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-	user_id = verify_token(token)
-	if not user_id:
-		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-	return int(user_id)
+def parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """Requested RiskRead fields from ?fields=a,b,c ("summary" expands to the list view's fields)"""
+    if fields is None:
+        return None
+    names = []
+    for name in (part.strip() for part in fields.split(",")):
+        if name == "summary":
+            names.extend(RISK_SUMMARY_FIELDS)
+        elif name:
+            names.append(name)
+    unknown = sorted(set(names) - RiskSummary.model_fields.keys())
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(names))
 
 
-def check_permission(permission: Permission, user_id: int, db: Session):
-	"""Check if user has permission, raise 403 if not"""
-	user = get_current_user(db, user_id)
-	if not has_permission(user.role, permission):
-		raise HTTPException(
-			status_code=status.HTTP_403_FORBIDDEN,
-			detail=f"Insufficient permissions. Required: {permission.value}"
-		)
-
-
-@router.get("", response_model=list[RiskRead])
-def list_risks_endpoint(
+def risk_filters(
     status_filter: Optional[str] = Query(default=None, alias="status"),
     min_severity: Optional[int] = Query(default=None),
     min_likelihood: Optional[int] = Query(default=None),
     min_probability: Optional[int] = Query(default=None),
     min_impact: Optional[int] = Query(default=None),
+    min_score: Optional[int] = Query(default=None, ge=1, le=25),
+    risk_level: Optional[Literal["Low", "Medium", "High", "Critical", "Not Assessed"]] = Query(default=None),
     search: Optional[str] = Query(default=None),
     risk_owner: Optional[str] = Query(default=None),
     rbs_node_id: Optional[int] = Query(default=None),
-    sort_by: Optional[str] = Query(default=None),
-    order: str = Query(default="desc"),
-    limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id),
-):
-    # Check permission to view risks
-    check_permission(Permission.VIEW_RISKS, user_id, db)
-    
-    # Get user role for filtering
-    from ..services.auth import get_current_user
-    user = get_current_user(db, user_id)
-    
+) -> dict:
+    """Filters shared by the risk list and export"""
     # Use min_probability if provided, otherwise fall back to min_likelihood for backward compatibility
     probability_filter = min_probability if min_probability is not None else min_likelihood
-    
-    return list_risks(
-        db,
-        owner_id=user_id,
+    return dict(
         status=status_filter,
         min_severity=min_severity,
         min_likelihood=probability_filter,
         min_impact=min_impact,
+        min_score=min_score,
+        risk_level=risk_level,
         search=search,
         risk_owner=risk_owner,
         rbs_node_id=rbs_node_id,
+    )
+
+
+@router.get("", response_model=list[RiskRead])
+def list_risks_endpoint(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(risk_filters),
+    sort_by: Optional[str] = Query(default=None),
+    order: str = Query(default="desc"),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
+    include_total: bool = Query(default=False, description="Return the (estimated) match count in X-Total-Count"),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated RiskRead fields to return (id is always included), or 'summary'; only these columns are read",
+    ),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(require_permission(Permission.VIEW_RISKS)),
+):
+    selected = parse_fields(fields)
+    # Validator: the filtered rows' count and latest update, plus their action
+    # items (each risk carries its action_items_count)
+    stmt, _ = risk_list_query(db, user.id, user_role=user.role, **filters)
+    etag = make_etag(
+        user.id,
+        user.role,
+        query_params_key(request),
+        table_version_with_children(db, stmt, Risk.id, Risk.updated_at, ActionItem.risk_id, ActionItem.updated_at),
+    )
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+
+    try:
+        risks = list_risks(
+            db,
+            owner_id=user.id,
+            sort_by=sort_by,
+            order=order,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            user_role=user.role,
+            fields=selected,
+            **filters,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_page = next_cursor(risks, limit, risk_sort_key(sort_by))
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    if include_total:
+        response.headers["X-Total-Count"] = str(estimate_count(db, stmt))
+    if selected is not None:
+        # Bypasses the RiskRead response model: unrequested fields are left out, not null
+        rows = [{"id": risk.id, **{name: getattr(risk, name) for name in selected}} for risk in risks]
+        return json_list_response(RiskSummary, rows, response, exclude_unset=True)
+    return json_list_response(RiskRead, risks, response)
+
+
+@router.get("/stats", response_model=RiskStats)
+def risk_stats_endpoint(
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    risk_owner: Optional[str] = Query(default=None),
+    rbs_node_id: Optional[int] = Query(default=None),
+    include_owners: bool = Query(default=True, description="Also count per risk owner (scans the risks table)"),
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(require_permission(Permission.VIEW_RISKS)),
+):
+    """Counts by status, level, owner and RBS node plus the probability x impact heatmap"""
+    return risk_stats(
+        db,
+        owner_id=user.id,
+        user_role=user.role,
+        status=status_filter,
+        risk_owner=risk_owner,
+        rbs_node_id=rbs_node_id,
+        include_owners=include_owners,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_risks_endpoint(
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    filters: dict = Depends(risk_filters),
+    sort_by: Optional[str] = Query(default=None),
+    order: str = Query(default="desc"),
+    include_action_items: bool = Query(default=False, description="Nest each risk's action items (NDJSON only)"),
+    session_factory=Depends(get_read_session_factory),
+    user: CurrentUser = Depends(require_permission(Permission.VIEW_RISKS)),
+):
+    """Stream every matching risk (same filters and visibility as GET /risks, no page limit)"""
+    if include_action_items and export_format != "ndjson":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nested action items need format=ndjson")
+    body = stream_risk_export(
+        session_factory,
+        export_format,
+        owner_id=user.id,
+        user_role=user.role,
         sort_by=sort_by,
         order=order,
-        limit=limit,
-        offset=offset,
-        user_role=user.role,
+        include_action_items=include_action_items,
+        **filters,
+    )
+    filename = f"risks-{datetime.now(timezone.utc):%Y%m%d}.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
 @router.get("/owners", response_model=list[str])
 def get_risk_owners_endpoint(
-    db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    return get_risk_owners(db, user_id)
+    etag = make_etag(user.id, table_version(db, select(Risk).where(Risk.owner_id == user.id), Risk.updated_at))
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    return get_risk_owners(db, user.id)
 
 
 @router.post("", response_model=RiskRead, status_code=status.HTTP_201_CREATED)
-def create_risk_endpoint(payload: RiskCreate, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    # Check permission to create risks
-    check_permission(Permission.CREATE_RISKS, user_id, db)
+def create_risk_endpoint(
+    payload: RiskCreate,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(require_permission(Permission.CREATE_RISKS)),
+):
     # Convert payload to dict and handle new fields
     risk_data = payload.model_dump()
     
@@ -99,49 +214,106 @@ def create_risk_endpoint(payload: RiskCreate, db: Session = Depends(get_db), use
     if "impact" not in risk_data:
         risk_data["impact"] = 3
     
-    risk = create_risk(db, owner_id=user_id, **risk_data)
+    risk = create_risk(db, owner_id=user.id, **risk_data)
     return risk
 
 
+@router.post("/bulk", response_model=RiskBulkResponse)
+def bulk_risks_endpoint(
+    payload: RiskBulkRequest,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """Create, update and delete many risks in one transaction.
+
+    Each operation is checked against the caller's permissions individually;
+    failures are reported per item instead of failing the request.
+    """
+    if len(payload.operations) > settings.risk_bulk_max_operations:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.risk_bulk_max_operations} operations per request",
+        )
+    return bulk_write_risks(db, owner_id=user.id, user_role=user.role, operations=payload.operations, atomic=payload.atomic)
+
+
+@router.post("/import", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+def import_risks_endpoint(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Excel workbook (Risks sheet) or CSV"),
+    on_conflict: Literal["skip", "update", "create"] = Query(default="skip", description="Rows whose risk name already exists"),
+    session_factory=Depends(get_session_factory),
+    user: CurrentUser = Depends(require_permission(Permission.CREATE_RISKS)),
+):
+    """Start a background import of a spreadsheet; poll GET /risks/import/{job_id} for progress."""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    if suffix not in (".xlsx", ".xlsm", ".csv"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload a .xlsx or .csv file")
+
+    # Copy in chunks to a file the background task owns (the upload is closed with the request)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as handle:
+        shutil.copyfileobj(file.file, handle, 1024 * 1024)
+
+    job = job_registry.create("risk_import", owner_id=user.id)
+    background_tasks.add_task(
+        run_import_job, job, session_factory, handle.name, file.filename, user.id, user.role, on_conflict
+    )
+    return job
+
+
+@router.get("/import/{job_id}", response_model=JobRead)
+def import_status_endpoint(job_id: str, user: CurrentUser = Depends(get_current_user)):
+    job = job_registry.get(job_id)
+    if not job or (job.owner_id != user.id and user.role != "manager"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
+
+
 @router.get("/{risk_id}", response_model=RiskRead)
-def get_risk_endpoint(risk_id: int, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    # Get user role for filtering
-    from ..services.auth import get_current_user
-    user = get_current_user(db, user_id)
-    
-    risk = get_risk(db, owner_id=user_id, risk_id=risk_id, user_role=user.role)
+def get_risk_endpoint(
+    risk_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    risk = get_risk(db, owner_id=user.id, risk_id=risk_id, user_role=user.role)
     if not risk:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Risk not found")
+    # The risk row carries action_items_count, so item changes must show up in the validator
+    etag = make_etag(
+        risk.id,
+        risk.updated_at,
+        table_version(db, select(ActionItem).where(ActionItem.risk_id == risk.id), ActionItem.updated_at),
+    )
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
     return risk
 
 
 @router.put("/{risk_id}", response_model=RiskRead)
-def update_risk_endpoint(risk_id: int, payload: RiskUpdate, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    # Check permission to edit risks
-    check_permission(Permission.EDIT_RISKS, user_id, db)
-    
-    # Get user role for filtering
-    from ..services.auth import get_current_user
-    user = get_current_user(db, user_id)
-    
+def update_risk_endpoint(
+    risk_id: int,
+    payload: RiskUpdate,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(require_permission(Permission.EDIT_RISKS)),
+):
     # Only update fields that were actually sent by the client. Still allow explicit nulls.
     update_data = payload.model_dump(exclude_unset=True)
-    risk = update_risk(db, owner_id=user_id, risk_id=risk_id, user_role=user.role, **update_data)
+    risk = update_risk(db, owner_id=user.id, risk_id=risk_id, user_role=user.role, **update_data)
     if not risk:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Risk not found")
     return risk
 
 
 @router.delete("/{risk_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_risk_endpoint(risk_id: int, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    # Check permission to delete risks
-    check_permission(Permission.DELETE_RISKS, user_id, db)
-    
-    # Get user role for filtering
-    from ..services.auth import get_current_user
-    user = get_current_user(db, user_id)
-    
-    success = delete_risk(db, owner_id=user_id, risk_id=risk_id, user_role=user.role)
+def delete_risk_endpoint(
+    risk_id: int,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(require_permission(Permission.DELETE_RISKS)),
+):
+    success = delete_risk(db, owner_id=user.id, risk_id=risk_id, user_role=user.role)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Risk not found")
     return None
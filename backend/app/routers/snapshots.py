@@ -1,6 +1,5 @@
-from typing import List, Annotated
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.security import OAuth2PasswordBearer
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 import json
@@ -8,38 +7,20 @@ import tempfile
 import os
 from datetime import datetime
 
-from ..database import get_db
-from ..models.user import User
+from ..core.responses import json_list_response
+from ..database import get_db, get_read_db
+from ..dependencies import CurrentUser, get_current_user
 from ..schemas.snapshot import Snapshot as SnapshotSchema, SnapshotCreate, SnapshotUpdate, SnapshotRestore
 from ..models.snapshot import Snapshot
 from ..services.snapshot import SnapshotService
-from ..core.security import verify_token
 
 router = APIRouter(prefix="/snapshots", tags=["snapshots"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
-
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return int(user_id)
-
-
-def get_current_user(
-    user_id: Annotated[int, Depends(get_current_user_id)],
-    db: Session = Depends(get_db)
-) -> User:
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
 
 
 @router.post("/", response_model=SnapshotSchema, status_code=status.HTTP_201_CREATED)
 def create_snapshot(
     snapshot_data: SnapshotCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new snapshot of current risk and action item data"""
@@ -50,19 +31,19 @@ def create_snapshot(
 
 @router.get("/", response_model=List[SnapshotSchema])
 def get_snapshots(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all snapshots for the current user"""
     snapshot_service = SnapshotService(db)
     snapshots = snapshot_service.get_snapshots(current_user.id)
-    return snapshots
+    return json_list_response(SnapshotSchema, snapshots)
 
 
 @router.get("/{snapshot_id}", response_model=SnapshotSchema)
 def get_snapshot(
     snapshot_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific snapshot by ID"""
@@ -89,7 +70,7 @@ def get_snapshot(
 def update_snapshot(
     snapshot_id: int,
     snapshot_data: SnapshotUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update snapshot metadata"""
@@ -122,7 +103,7 @@ def update_snapshot(
 @router.delete("/{snapshot_id}")
 def delete_snapshot(
     snapshot_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a snapshot"""
@@ -156,7 +137,7 @@ def delete_snapshot(
 def restore_snapshot(
     snapshot_id: int,
     restore_data: SnapshotRestore,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Restore data from a snapshot"""
@@ -195,7 +176,7 @@ def restore_snapshot(
 @router.get("/{snapshot_id}/export")
 def export_snapshot(
     snapshot_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Export a snapshot as a downloadable JSON file"""
@@ -272,7 +253,7 @@ def export_snapshot(
 @router.post("/import")
 def import_snapshot(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Import a snapshot from an uploaded JSON file"""
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Literal
 import psutil
 import os
@@ -9,17 +9,20 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
 import subprocess
 import sys
 from pathlib import Path
-from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from ..core.security import verify_token
-from ..database import get_db, get_engine
+from ..core.hashing import password_hasher
+from ..core.jobs import job_registry
+from ..core.revocation import revocation_list, token_versions
+from ..core.security import token_cache, verify_token
+from ..database import get_db, get_engine, get_pool_status, get_read_engine
 from ..models import User
 from ..core.config import settings
+from ..core.instrumentation import query_report
+from ..dependencies import CurrentUser, get_current_user, get_current_user_id, user_cache
 
 router = APIRouter(prefix="/system", tags=["system"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 class EnvironmentSwitchRequest(BaseModel):
@@ -27,13 +30,6 @@ class EnvironmentSwitchRequest(BaseModel):
     # No complex config needed for now - just switch between equivalent files
 
 
-def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return int(user_id)
-
-
 @router.get("/status")
 def get_system_status(
     db: Session = Depends(get_db),
@@ -117,6 +113,71 @@ def get_system_status(
         )
 
 
+@router.get("/pool")
+def get_pool_statistics(
+    user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """Get connection pool usage (checked-out, overflow, wait time) for sizing workers"""
+    
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database_type": settings.database_type,
+        "pool": get_pool_status(),
+        "replica_pool": get_pool_status(get_read_engine()) if get_read_engine() is not None else None,
+        "settings": {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping
+        }
+    }
+
+
+@router.get("/queries")
+def get_query_statistics(
+    reset: bool = False,
+    user: CurrentUser = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Get per-route SQL query counts and DB time, busiest routes first"""
+    
+    # Anyone signed in can read the report; only admins can clear it
+    if reset and user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can reset query statistics"
+        )
+    
+    routes = query_report.snapshot()
+    if reset:
+        query_report.reset()
+    
+    ranked = sorted(routes.items(), key=lambda item: item[1]["db_ms"], reverse=True)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "enabled": settings.sql_instrumentation_enabled,
+        "repeat_warning_threshold": settings.sql_repeat_warning_threshold,
+        "routes": [{"route": route, **entry} for route, entry in ranked]
+    }
+
+
+@router.get("/caches")
+def get_cache_statistics(
+    user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """Get counters for the in-process auth caches, hashing queue and job registry"""
+    
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "token_revocations": revocation_list.stats(),
+        "token_versions": token_versions.stats(),
+        "jobs": job_registry.stats(),
+        "user_cache": user_cache.stats()
+    }
+
+
 @router.get("/ports")
 def get_port_status(
     user_id: int = Depends(get_current_user_id)
@@ -477,7 +538,7 @@ class FrontendSwitchRequest(BaseModel):
 
 
 @router.post("/switch-environment")
-async def switch_backend_environment(
+def switch_backend_environment(
     request: BackendSwitchRequest,
     fastapi_request: Request,
     authorization: str | None = Header(default=None)
@@ -1,53 +1,37 @@
-from typing import Annotated, Optional
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from ..core.security import verify_token
-from ..core.roles import Role, get_available_roles, get_role_permissions_list, has_permission, Permission
+from ..core.revocation import token_versions
+from ..core.roles import Role, get_available_roles, get_role_permissions_list, Permission
 from ..database import get_db
+from ..dependencies import CurrentUser, get_current_user, require_permission, user_cache
 from ..models.user import User
 from ..schemas.user import UserRead, UserCreate, UserUpdate
-from ..services.auth import register_user, get_current_user
+from ..services.auth import register_user, revoke_user_tokens
+from ..services.pagination import InvalidCursor, estimate_count, next_cursor, paginate
 from ..models.action_item import ActionItem
 from ..models.audit_log import AuditLog
 
 router = APIRouter(prefix="/users", tags=["users"])
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
-
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-    user_id = verify_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return int(user_id)
-
-
-def check_permission(permission: Permission, user_id: int, db: Session):
-    """Check if user has permission, raise 403 if not"""
-    user = get_current_user(db, user_id)
-    if not has_permission(user.role, permission):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Insufficient permissions. Required: {permission.value}"
-        )
 
 
 @router.get("", response_model=list[UserRead])
 def list_users_endpoint(
+    response: Response,
     search: Optional[str] = Query(default=None),
     role: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
+    include_total: bool = Query(default=False, description="Return the (estimated) match count in X-Total-Count"),
     db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user_id),
+    user: CurrentUser = Depends(require_permission(Permission.VIEW_USERS)),
 ):
     """
     List all users with optional filtering.
     """
-    # Check permission to view users
-    check_permission(Permission.VIEW_USERS, user_id, db)
     query = db.query(User)
     if hasattr(User, "is_active"):
         query = query.filter(User.is_active.is_(True))
@@ -60,9 +44,21 @@ def list_users_endpoint(
     # if role:
     #     query = query.filter(User.role == role)
     
-    # Apply pagination
-    users = query.offset(offset).limit(limit).all()
+    if include_total:
+        response.headers["X-Total-Count"] = str(estimate_count(db, query))
+    
+    # Apply pagination (stable id order; a cursor replaces the offset)
+    try:
+        query = paginate(db, query, User.id, User.id, "id", False, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not cursor:
+        query = query.offset(offset)
+    users = query.limit(limit).all()
     
+    next_page = next_cursor(users, limit, "id")
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
     return users
 
 
@@ -70,7 +66,7 @@ def list_users_endpoint(
 def get_user_endpoint(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Get a specific user by ID.
@@ -90,13 +86,11 @@ def get_user_endpoint(
 def create_user_endpoint(
     user_data: UserCreate,
     db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    current_user: CurrentUser = Depends(require_permission(Permission.CREATE_USERS)),
 ):
     """
     Create a new user (admin endpoint).
     """
-    # Check permission to create users
-    check_permission(Permission.CREATE_USERS, current_user_id, db)
     # Check if user already exists
     existing = db.query(User).filter(User.email == user_data.email).first()
     if existing:
@@ -127,13 +121,11 @@ def update_user_endpoint(
     user_id: int,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    current_user: CurrentUser = Depends(require_permission(Permission.EDIT_USERS)),
 ):
     """
     Update a user (admin endpoint).
     """
-    # Check permission to edit users
-    check_permission(Permission.EDIT_USERS, current_user_id, db)
     import json
     
     # Get the user to update
@@ -163,11 +155,16 @@ def update_user_endpoint(
     # Update fields
     if user_data.email is not None:
         user.email = user_data.email
-    if user_data.role is not None:
+    if user_data.role is not None and user_data.role != user.role:
         user.role = user_data.role
+        # Outstanding tokens carry the old role claim
+        revoke_user_tokens(user)
     
     db.commit()
     db.refresh(user)
+    # Drop the cached role/email/token version so the change applies to the user's next request
+    user_cache.invalidate(user.id)
+    token_versions.invalidate(user.id)
     return user
 
 
@@ -181,7 +178,7 @@ def get_available_roles_endpoint():
 def get_user_permissions_endpoint(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Get permissions for a specific user based on their role."""
     user = db.query(User).filter(User.id == user_id).first()
@@ -198,7 +195,7 @@ def get_user_permissions_endpoint(
 def soft_delete_user_endpoint(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user_id: int = Depends(get_current_user_id),
+    current_user: CurrentUser = Depends(require_permission(Permission.DELETE_USERS)),
 ):
     """Soft delete a user (admin endpoint).
 
@@ -206,11 +203,9 @@ def soft_delete_user_endpoint(
     - User is marked inactive and excluded from listings and fetches.
     - No DB rows are deleted to preserve audit integrity.
     """
-    # Check permission to delete users
-    check_permission(Permission.DELETE_USERS, current_user_id, db)
 
     # Prevent self-delete to avoid locking yourself out
-    if user_id == current_user_id:
+    if user_id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You cannot delete your own account.",
@@ -245,5 +240,8 @@ def soft_delete_user_endpoint(
         )
 
     user.is_active = False
+    revoke_user_tokens(user)
     db.commit()
+    user_cache.invalidate(user_id)
+    token_versions.invalidate(user_id)
     return None
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobRead(BaseModel):
+    id: str
+    kind: str
+    status: Literal["queued", "running", "completed", "failed"]
+    progress: Dict[str, Any] = Field(default_factory=dict, description="Running counts, updated as the job advances")
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal, Optional, List, Union
+from typing import Annotated, Any, Dict, Literal, Optional, List, Union
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
@@ -73,3 +73,90 @@ class RiskRead(RiskBase):
 	model_config = ConfigDict(from_attributes=True)
 
 
+# What a list row needs; GET /risks?fields=summary expands to these
+RISK_SUMMARY_FIELDS = ("risk_name", "score", "risk_level", "status", "risk_owner")
+
+
+class RiskSummary(BaseModel):
+	"""Sparse list item for GET /risks?fields=...: id plus the requested RiskRead fields.
+
+	Serialized with exclude_unset, so fields that were not requested are
+	absent rather than null.
+	"""
+	id: int
+	risk_name: Optional[str] = None
+	risk_description: Optional[str] = None
+	probability: Optional[int] = None
+	impact: Optional[int] = None
+	scope: Optional[str] = None
+	risk_owner: Optional[str] = None
+	rbs_node_id: Optional[int] = None
+	latest_reviewed_date: Optional[datetime] = None
+	probability_basis: Optional[str] = None
+	impact_basis: Optional[str] = None
+	notes: Optional[str] = None
+	status: Optional[str] = None
+	owner_id: Optional[int] = None
+	created_at: Optional[datetime] = None
+	updated_at: Optional[datetime] = None
+	score: Optional[int] = None
+	risk_level: Optional[str] = None
+	action_items_count: Optional[int] = None
+
+
+class RiskHeatmapCell(BaseModel):
+	probability: int
+	impact: int
+	count: int
+
+
+class RiskStats(BaseModel):
+	total: int
+	average_score: Optional[float] = Field(None, description="Mean score of assessed risks")
+	by_status: Dict[str, int]
+	by_level: Dict[str, int]
+	by_owner: Optional[Dict[str, int]] = Field(None, description="Omitted when include_owners=false")
+	by_rbs_node: Dict[int, int]
+	heatmap: List[RiskHeatmapCell] = Field(description="Non-empty probability x impact cells")
+
+
+# Bulk writes (POST /risks/bulk)
+class RiskBulkCreate(BaseModel):
+	op: Literal["create"]
+	data: RiskCreate
+
+
+class RiskBulkUpdate(BaseModel):
+	op: Literal["update"]
+	id: int
+	data: RiskUpdate
+
+
+class RiskBulkDelete(BaseModel):
+	op: Literal["delete"]
+	id: int
+
+
+RiskBulkOperation = Annotated[Union[RiskBulkCreate, RiskBulkUpdate, RiskBulkDelete], Field(discriminator="op")]
+
+
+class RiskBulkRequest(BaseModel):
+	# Validated item by item in the service, so one bad row doesn't reject the batch
+	operations: List[Dict[str, Any]] = Field(description="Operations: {op: create, data}, {op: update, id, data} or {op: delete, id}")
+	atomic: bool = Field(default=False, description="Write nothing if any operation fails")
+
+
+class RiskBulkItemResult(BaseModel):
+	index: int
+	op: Optional[str] = None
+	status: Literal["created", "updated", "deleted", "error"]
+	id: Optional[int] = None
+	error: Optional[str] = None
+
+
+class RiskBulkResponse(BaseModel):
+	created: int = 0
+	updated: int = 0
+	deleted: int = 0
+	failed: int = 0
+	results: List[RiskBulkItemResult]
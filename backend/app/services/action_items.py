@@ -5,19 +5,20 @@ from sqlalchemy import and_
 
 from ..models.action_item import ActionItem
 from ..schemas.action_item import ActionItemCreate, ActionItemUpdate
+from .pagination import paginate
 
 
 class ActionItemService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_action_items(
+    def action_items_query(
         self,
         risk_id: Optional[int] = None,
         status: Optional[str] = None,
         assigned_to: Optional[int] = None
-    ) -> List[ActionItem]:
-        """Get action items with optional filtering"""
+    ):
+        """Filtered (unordered) action item query"""
         query = self.db.query(ActionItem)
         
         if risk_id:
@@ -28,8 +29,27 @@ class ActionItemService:
             
         if assigned_to:
             query = query.filter(ActionItem.assigned_to == assigned_to)
-            
-        return query.order_by(ActionItem.created_at.desc()).all()
+        
+        return query
+
+    def get_action_items(
+        self,
+        risk_id: Optional[int] = None,
+        status: Optional[str] = None,
+        assigned_to: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[ActionItem]:
+        """Get action items with optional filtering, newest first.
+        
+        Unpaged unless a limit is given; pass the cursor from a previous page
+        to continue after it.
+        """
+        query = self.action_items_query(risk_id, status, assigned_to)
+        query = paginate(self.db, query, ActionItem.created_at, ActionItem.id, "created_at", True, cursor)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     def get_action_item(self, action_item_id: int) -> Optional[ActionItem]:
         """Get a specific action item by ID"""
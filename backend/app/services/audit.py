@@ -1,11 +1,12 @@
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, insert
 
 from ..models.audit_log import AuditLog
 from ..models.risk import Risk
 from ..models.action_item import ActionItem
+from .pagination import paginate
 
 
 def log_audit_event(
@@ -39,6 +40,31 @@ def log_audit_event(
     return audit_log
 
 
+def log_audit_events(db: Session, events: List[Dict[str, Any]]) -> None:
+    """Insert many audit rows in one executemany statement.
+    
+    Each event holds log_audit_event's fields. Unlike log_audit_event this
+    does not commit, so the rows land in the caller's transaction.
+    """
+    
+    if not events:
+        return
+    rows = [
+        {
+            "entity_type": event["entity_type"],
+            "entity_id": event["entity_id"],
+            "user_id": event["user_id"],
+            "action": event["action"],
+            "changes": event.get("changes") or {},
+            "description": event.get("description"),
+            "ip_address": event.get("ip_address"),
+            "user_agent": event.get("user_agent"),
+        }
+        for event in events
+    ]
+    db.execute(insert(AuditLog), rows)
+
+
 def get_risk_changes(old_risk: Risk, new_risk: Risk) -> Dict[str, Any]:
     """Extract changes between old and new risk objects"""
     changes = {}
@@ -121,16 +147,14 @@ def get_action_item_changes(old_item: ActionItem, new_item: ActionItem) -> Dict[
     return changes
 
 
-def get_audit_logs(
+def audit_log_query(
     db: Session,
     entity_type: Optional[str] = None,
     entity_id: Optional[int] = None,
     user_id: Optional[int] = None,
-    action: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0
-) -> List[AuditLog]:
-    """Get audit logs with optional filtering"""
+    action: Optional[str] = None
+):
+    """Filtered (unordered) audit log query"""
     
     from ..models.user import User
     
@@ -145,7 +169,30 @@ def get_audit_logs(
     if action:
         query = query.filter(AuditLog.action == action)
     
-    return query.order_by(desc(AuditLog.timestamp)).limit(limit).offset(offset).all()
+    return query
+
+
+def get_audit_logs(
+    db: Session,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None
+) -> List[AuditLog]:
+    """Get audit logs with optional filtering, newest first.
+    
+    Pass the cursor from a previous page to continue after it (offset is
+    ignored in that case).
+    """
+    
+    query = audit_log_query(db, entity_type, entity_id, user_id, action)
+    query = paginate(db, query, AuditLog.timestamp, AuditLog.id, "timestamp", True, cursor)
+    if not cursor:
+        query = query.offset(offset)
+    return query.limit(limit).all()
 
 
 def get_risk_audit_trail(db: Session, risk_id: int, limit: int = 50) -> List[AuditLog]:
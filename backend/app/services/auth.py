@@ -1,22 +1,28 @@
+from functools import lru_cache
 from typing import Optional
 
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from ..core.hashing import password_hasher, pwd_context
 from ..core.security import create_access_token
 from ..models.user import User
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 def get_password_hash(password: str) -> str:
-	return pwd_context.hash(password)
+	return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-	return pwd_context.verify(plain_password, hashed_password)
+	return password_hasher.verify(plain_password, hashed_password)
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+	# Verified against when the account does not exist, so unknown emails
+	# cost the same bcrypt work as wrong passwords
+	return pwd_context.hash("not-a-real-password")
 
 
 def register_user(db: Session, email: str, password: str, role: str = "viewer") -> User:
@@ -42,8 +48,36 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
 	return user
 
 
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+	return db.scalar(select(User).where(User.email == email))
+
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+	"""authenticate_user for async endpoints: the lookup runs on the request
+	threadpool, bcrypt on the dedicated hashing pool."""
+	user = await run_in_threadpool(get_user_by_email, db, email)
+	hashed = user.hashed_password if user else await run_in_threadpool(_dummy_hash)
+	if not await password_hasher.verify_async(password, hashed) or not user:
+		return None
+	return user
+
+
 def create_user_access_token(user: User) -> str:
-	return create_access_token(subject=str(user.id))
+	# Role and token version travel in the token so requests authorize without a user lookup
+	return create_access_token(
+		subject=str(user.id),
+		claims={"role": user.role, "ver": user.token_version or 0},
+	)
+
+
+def revoke_user_tokens(user: User) -> None:
+	"""Invalidate every access token issued to the user so far.
+
+	Only bumps the column: the caller commits, then drops the user from
+	token_versions so this worker re-reads the committed version (a failed
+	commit leaves the cached version, and the user's tokens, as they were).
+	"""
+	user.token_version = (user.token_version or 0) + 1
 
 
 def get_current_user(db: Session, user_id: int) -> User:
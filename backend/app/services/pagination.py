@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort key name and the
+(sort value, id) of the last row on a page. The next page continues strictly
+after that tuple, so page N costs the same as page 1 and rows inserted while
+a client is paging do not shift what it sees.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.orm import Session
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to a different sort"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(key: str, value: Any, row_id: int) -> str:
+    payload = json.dumps({"k": key, "v": _encode_value(value), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> tuple[Any, int]:
+    """Return the (sort value, id) stored in a cursor issued for `key`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, row_id = _decode_value(payload["v"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if payload.get("k") != key:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return value, row_id
+
+
+def _nulls_sort_high(db: Session) -> bool:
+    # Postgres sorts NULL above every value; SQLite and MySQL sort it below
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def keyset_order(column, id_column, descending: bool) -> list:
+    if column is id_column:
+        return [id_column.desc() if descending else id_column.asc()]
+    if descending:
+        return [column.desc(), id_column.desc()]
+    return [column.asc(), id_column.asc()]
+
+
+def keyset_after(db: Session, column, id_column, value: Any, last_id: int, descending: bool):
+    """Predicate selecting rows that sort strictly after (value, last_id)"""
+    if column is id_column:
+        return id_column < last_id if descending else id_column > last_id
+
+    tie = id_column < last_id if descending else id_column > last_id
+    # Whether NULLs come after every non-NULL value in this traversal
+    nulls_last = _nulls_sort_high(db) != descending
+
+    if value is None:
+        same = and_(column.is_(None), tie)
+        return same if nulls_last else or_(column.is_not(None), same)
+
+    beyond = column < value if descending else column > value
+    clauses = [beyond, and_(column == value, tie)]
+    if nulls_last:
+        clauses.append(column.is_(None))
+    return or_(*clauses)
+
+
+def paginate(db: Session, stmt, column, id_column, key: str, descending: bool, cursor: Optional[str]):
+    """Apply keyset ordering (and the cursor position, if any) to a select"""
+    if cursor:
+        value, last_id = decode_cursor(cursor, key)
+        stmt = stmt.where(keyset_after(db, column, id_column, value, last_id, descending))
+    return stmt.order_by(*keyset_order(column, id_column, descending))
+
+
+def next_cursor(rows: List[Any], limit: int, key: str) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page"""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(key, getattr(last, key), last.id)
+
+
+def estimate_count(db: Session, stmt) -> int:
+    """Row count for a filtered select.
+
+    Postgres answers from the planner's estimate (cheap, approximate); other
+    databases run an exact COUNT(*), which is fine at SQLite's scale.
+    """
+    stmt = getattr(stmt, "statement", stmt)  # accept legacy Query objects too
+    stmt = stmt.order_by(None).limit(None).offset(None)
+    if db.get_bind().dialect.name == "postgresql":
+        compiled = stmt.compile(bind=db.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
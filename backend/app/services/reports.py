@@ -0,0 +1,269 @@
+"""
+Server-side report rendering (XLSX, PDF, DOCX) from a risk query.
+
+A report runs as a background job (core.jobs): it reads the same query as the
+streaming export (filters, visibility and order of GET /risks) in batches,
+renders to a temporary file and leaves that file on the job for
+GET /reports/{job_id}/download. The registry deletes the file when the job
+expires.
+
+XLSX goes through openpyxl's write-only mode, which streams rows to disk, so
+a workbook of the whole register costs no more memory than one batch. PDF
+pages are compressed as they fill, and python-docx keeps the document in
+memory, so PDF and DOCX list at most `report_document_max_rows` risks and say
+so when more matched.
+"""
+
+import os
+import re
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.jobs import Job, job_registry
+from ..models.risk import Risk
+from .risk_export import CSV_COLUMNS, export_query, iter_risk_batches
+
+
+REPORT_FORMATS = {
+	"xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+	"pdf": "application/pdf",
+	"docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Columns of the PDF/DOCX table; the workbook has every export column
+DOCUMENT_COLUMNS = (
+	("Risk", "risk_name"),
+	("Probability", "probability"),
+	("Impact", "impact"),
+	("Score", "score"),
+	("Level", "risk_level"),
+	("Status", "status"),
+	("Owner", "risk_owner"),
+)
+
+
+class ReportDependencyError(RuntimeError):
+	"""Raised when the library for a report format is not installed"""
+
+
+def _text(value: Any) -> str:
+	if value is None:
+		return ""
+	if isinstance(value, datetime):
+		return value.strftime("%Y-%m-%d")
+	return str(value)
+
+
+def _xlsx_value(value: Any) -> Any:
+	if isinstance(value, datetime) and value.tzinfo is not None:
+		# Excel has no time zones; cells hold naive UTC
+		return value.astimezone(timezone.utc).replace(tzinfo=None)
+	return value
+
+
+def _counted(batches: Iterable[list[Risk]], progress: Callable[[int], None]) -> Iterator[Risk]:
+	rows = 0
+	for risks in batches:
+		yield from risks
+		rows += len(risks)
+		progress(rows)
+
+
+def write_xlsx(path: str, title: str, risks: Iterator[Risk], note: Optional[str]) -> int:
+	try:
+		from openpyxl import Workbook
+	except ImportError as e:
+		raise ReportDependencyError("XLSX reports require openpyxl") from e
+	workbook = Workbook(write_only=True)
+	# Same sheet name and headers as the import expects, so a report can be re-imported
+	sheet = workbook.create_sheet("Risks")
+	sheet.append([header for header, _ in CSV_COLUMNS])
+	rows = 0
+	for risk in risks:
+		sheet.append([_xlsx_value(getattr(risk, name)) for _, name in CSV_COLUMNS])
+		rows += 1
+	workbook.save(path)
+	return rows
+
+
+def write_pdf(path: str, title: str, risks: Iterator[Risk], note: Optional[str]) -> int:
+	try:
+		from reportlab.lib.pagesizes import A4, landscape
+		from reportlab.pdfbase.pdfmetrics import stringWidth
+		from reportlab.pdfgen import canvas
+	except ImportError as e:
+		raise ReportDependencyError("PDF reports require reportlab") from e
+
+	page_width, page_height = landscape(A4)
+	margin, row_height, font_size = 36, 14, 8
+	widths = (300, 55, 45, 40, 70, 75, 185)
+	generated = f"Generated {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC"
+
+	def fit(text: str, width: float, font: str) -> str:
+		# Trim to the column, keeping the start of the text
+		if stringWidth(text, font, font_size) <= width:
+			return text
+		while text and stringWidth(text + "...", font, font_size) > width:
+			text = text[:-1]
+		return text + "..."
+
+	def draw_row(values: list[str], y: float, font: str):
+		pdf.setFont(font, font_size)
+		x = margin
+		for value, width in zip(values, widths):
+			pdf.drawString(x, y, fit(value, width - 6, font))
+			x += width
+
+	pdf = canvas.Canvas(path, pagesize=(page_width, page_height), pageCompression=1)
+	pdf.setTitle(title)
+	page = 0
+
+	def new_page() -> float:
+		nonlocal page
+		if page:
+			pdf.showPage()
+		page += 1
+		y = page_height - margin
+		pdf.setFont("Helvetica-Bold", 14)
+		pdf.drawString(margin, y, title)
+		pdf.setFont("Helvetica", font_size)
+		pdf.drawRightString(page_width - margin, y, f"{generated}  -  page {page}")
+		y -= 2 * row_height
+		draw_row([header for header, _ in DOCUMENT_COLUMNS], y, "Helvetica-Bold")
+		pdf.line(margin, y - 4, page_width - margin, y - 4)
+		return y - row_height
+
+	y = new_page()
+	rows = 0
+	for risk in risks:
+		if y < margin:
+			y = new_page()
+		draw_row([_text(getattr(risk, name)) for _, name in DOCUMENT_COLUMNS], y, "Helvetica")
+		y -= row_height
+		rows += 1
+	if note or not rows:
+		if y < margin + row_height:
+			y = new_page()
+		pdf.setFont("Helvetica-Oblique", font_size)
+		pdf.drawString(margin, y - row_height / 2, note or "No risks matched.")
+	pdf.save()
+	return rows
+
+
+def write_docx(path: str, title: str, risks: Iterator[Risk], note: Optional[str]) -> int:
+	try:
+		from docx import Document
+		from docx.enum.section import WD_ORIENT
+	except ImportError as e:
+		raise ReportDependencyError("DOCX reports require python-docx") from e
+
+	document = Document()
+	section = document.sections[0]
+	section.orientation = WD_ORIENT.LANDSCAPE
+	section.page_width, section.page_height = section.page_height, section.page_width
+	document.add_heading(title, level=1)
+	document.add_paragraph(f"Generated {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC")
+
+	table = document.add_table(rows=1, cols=len(DOCUMENT_COLUMNS))
+	table.style = "Table Grid"
+	for cell, (header, _) in zip(table.rows[0].cells, DOCUMENT_COLUMNS):
+		cell.text = header
+		cell.paragraphs[0].runs[0].bold = True
+	rows = 0
+	for risk in risks:
+		for cell, (_, name) in zip(table.add_row().cells, DOCUMENT_COLUMNS):
+			cell.text = _text(getattr(risk, name))
+		rows += 1
+	if note or not rows:
+		document.add_paragraph(note or "No risks matched.").runs[0].italic = True
+	document.save(path)
+	return rows
+
+
+WRITERS = {"xlsx": write_xlsx, "pdf": write_pdf, "docx": write_docx}
+
+
+def report_filename(title: str, report_format: str) -> str:
+	slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "report"
+	return f"{slug}-{datetime.now(timezone.utc):%Y%m%d}.{report_format}"
+
+
+def render_report(
+	db: Session,
+	path: str,
+	report_format: str,
+	title: str,
+	owner_id: int,
+	user_role: Optional[str],
+	sort_by: Optional[str] = None,
+	order: str = "desc",
+	progress: Optional[Callable[[dict], None]] = None,
+	**filters,
+) -> dict:
+	"""Write a report of the matching risks to `path`; returns row counts"""
+	stmt = export_query(db, owner_id, user_role, sort_by=sort_by, order=order, **filters)
+	total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+
+	def report(rows: int):
+		if progress:
+			progress({"rows": rows, "total": total})
+
+	report(0)
+
+	note = None
+	limit = None if report_format == "xlsx" else settings.report_document_max_rows
+	if limit is not None and total > limit:
+		stmt = stmt.limit(limit)
+		note = f"Showing the first {limit} of {total} risks; the XLSX report lists them all."
+	batches = iter_risk_batches(db, stmt, settings.risk_export_batch_size)
+	rows = WRITERS[report_format](path, title, _counted(batches, report), note)
+	return {"rows": rows, "total": total, "truncated": rows < total}
+
+
+def run_report_job(
+	job: Job,
+	session_factory: Callable[[], Session],
+	report_format: str,
+	title: str,
+	owner_id: int,
+	user_role: Optional[str],
+	sort_by: Optional[str],
+	order: str,
+	filters: dict,
+):
+	"""Background task: render a report to a temporary file kept on the job"""
+	job_registry.start(job)
+	handle, path = tempfile.mkstemp(prefix="riskworks-report-", suffix=f".{report_format}")
+	os.close(handle)
+	try:
+		with session_factory() as db:
+			result = render_report(
+				db,
+				path,
+				report_format,
+				title,
+				owner_id=owner_id,
+				user_role=user_role,
+				sort_by=sort_by,
+				order=order,
+				progress=lambda counts: job_registry.update(job, **counts),
+				**filters,
+			)
+		result.update(
+			format=report_format,
+			filename=report_filename(title, report_format),
+			size=os.path.getsize(path),
+		)
+		job_registry.finish(job, result=result, artifact=path)
+	except ReportDependencyError as e:
+		os.remove(path)
+		job_registry.finish(job, error=str(e))
+	except Exception as e:
+		print(f"Report {job.id} failed: {e}")
+		os.remove(path)
+		job_registry.finish(job, error="Report generation failed")
@@ -1,32 +1,52 @@
-from typing import Iterable, Optional
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
 
-from sqlalchemy import select, desc, asc, distinct
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import delete, insert, select, update, desc, distinct, func
+from sqlalchemy.orm import Session, load_only
 
-from ..models.risk import Risk
+from ..core.roles import Permission, has_permission
+from ..models.action_item import ActionItem
+from ..models.rbs import RBSNode
+from ..models.risk import Risk, compute_score, risk_level_for_score
+from ..schemas.risk import RiskBulkCreate, RiskBulkDelete, RiskBulkOperation, RiskBulkUpdate, RiskUpdate
+from . import risk_aggregates
+from .pagination import paginate
+from .search import apply_risk_search
 
 
-def list_risks(
+RISK_SORT_KEYS = {"created_at", "updated_at", "probability", "impact", "risk_name", "status", "score"}
+
+
+def risk_sort_key(sort_by: Optional[str]) -> str:
+	"""Column a risk listing is ordered by (created_at unless a known key is given)"""
+	return sort_by if sort_by in RISK_SORT_KEYS else "created_at"
+
+
+def visible_risks(stmt, owner_id: int, user_role: Optional[str]):
+	# Managers and viewers can see all risks, others only see their own
+	if user_role in ["manager", "viewer"]:
+		return stmt
+	return stmt.where(Risk.owner_id == owner_id)
+
+
+def risk_list_query(
 	db: Session,
 	owner_id: int,
 	status: Optional[str] = None,
 	min_severity: Optional[int] = None,
 	min_likelihood: Optional[int] = None,
 	min_impact: Optional[int] = None,
+	min_score: Optional[int] = None,
+	risk_level: Optional[str] = None,
 	search: Optional[str] = None,
 	risk_owner: Optional[str] = None,
 	rbs_node_id: Optional[int] = None,
-	sort_by: Optional[str] = None,
-	order: str = "desc",
-	limit: int = 50,
-	offset: int = 0,
 	user_role: Optional[str] = None,
 ):
-	# Managers and viewers can see all risks, others only see their own
-	if user_role in ["manager", "viewer"]:
-		stmt = select(Risk)
-	else:
-		stmt = select(Risk).where(Risk.owner_id == owner_id)
+	"""Filtered (unordered) risk select plus a search relevance ordering, if any"""
+	stmt = visible_risks(select(Risk), owner_id, user_role)
 	if status:
 		stmt = stmt.where(Risk.status == status)
 	if min_severity is not None:
@@ -35,24 +55,127 @@ def list_risks(
 		stmt = stmt.where(Risk.probability >= min_likelihood)
 	if min_impact is not None:
 		stmt = stmt.where(Risk.impact >= min_impact)
+	if min_score is not None:
+		stmt = stmt.where(Risk.score >= min_score)
+	if risk_level:
+		stmt = stmt.where(Risk.risk_level == risk_level)
+	relevance = None
 	if search:
-		like = f"%{search}%"
-		stmt = stmt.where(Risk.risk_name.ilike(like))
+		stmt, relevance = apply_risk_search(db, stmt, search)
 	if risk_owner:
 		stmt = stmt.where(Risk.risk_owner.ilike(f"%{risk_owner}%"))
 	if rbs_node_id is not None:
 		stmt = stmt.where(Risk.rbs_node_id == rbs_node_id)
-	if sort_by == "score":
-		# Sort by computed score (probability * impact)
-		score_expr = Risk.probability * Risk.impact
-		stmt = stmt.order_by(desc(score_expr) if order == "desc" else asc(score_expr))
-	elif sort_by in {"created_at", "updated_at", "probability", "impact", "risk_name", "status"}:
-		col = getattr(Risk, sort_by)
-		stmt = stmt.order_by(desc(col) if order == "desc" else asc(col))
+	return stmt, relevance
+
+
+def list_risks(
+	db: Session,
+	owner_id: int,
+	sort_by: Optional[str] = None,
+	order: str = "desc",
+	limit: int = 50,
+	offset: int = 0,
+	cursor: Optional[str] = None,
+	user_role: Optional[str] = None,
+	fields: Optional[Iterable[str]] = None,
+	**filters,
+):
+	"""One page of risks.
+
+	With `fields`, only those columns (plus id and the sort key) are selected
+	and touching any other column raises, so large text is never read.
+	"""
+	stmt, relevance = risk_list_query(db, owner_id, user_role=user_role, **filters)
+	if fields is not None:
+		columns = {"id", risk_sort_key(sort_by), *fields}.intersection(Risk.__mapper__.column_attrs.keys())
+		stmt = stmt.options(load_only(*(getattr(Risk, name) for name in columns), raiseload=True))
+	if relevance is not None and sort_by not in RISK_SORT_KEYS and not cursor:
+		# Search results without an explicit sort come back best match first
+		stmt = stmt.order_by(relevance, desc(Risk.created_at)).offset(offset)
 	else:
-		stmt = stmt.order_by(desc(Risk.created_at))
-	stmt = stmt.limit(limit).offset(offset)
-	return list(db.scalars(stmt))
+		# Keyset order on (sort key, id); a cursor replaces the offset
+		key = risk_sort_key(sort_by)
+		stmt = paginate(db, stmt, getattr(Risk, key), Risk.id, key, order == "desc", cursor)
+		if not cursor:
+			stmt = stmt.offset(offset)
+	return list(db.scalars(stmt.limit(limit)))
+
+
+def risk_stats(
+	db: Session,
+	owner_id: int,
+	user_role: Optional[str] = None,
+	status: Optional[str] = None,
+	risk_owner: Optional[str] = None,
+	rbs_node_id: Optional[int] = None,
+	include_owners: bool = True,
+) -> dict:
+	"""Dashboard aggregates over the risks the user can see.
+
+	Totals, status and level counts, the heatmap and RBS node counts are
+	folded from the risk_aggregates cells, so their cost does not grow with
+	the register. Owner names are not part of that table: filtering on
+	risk_owner falls back to a GROUP BY over the risks, as does by_owner
+	(skip it with include_owners=False). Filters are exact matches.
+	"""
+	def grouped(*columns):
+		stmt = visible_risks(select(*columns, func.count()).group_by(*columns), owner_id, user_role)
+		if status:
+			stmt = stmt.where(Risk.status == status)
+		if risk_owner:
+			stmt = stmt.where(Risk.risk_owner == risk_owner)
+		if rbs_node_id is not None:
+			stmt = stmt.where(Risk.rbs_node_id == rbs_node_id)
+		return db.execute(stmt).all()
+
+	if risk_owner:
+		cells = grouped(Risk.status, Risk.probability, Risk.impact, Risk.rbs_node_id)
+	else:
+		cells = risk_aggregates.aggregate_cells(
+			db,
+			owner_id=None if user_role in ["manager", "viewer"] else owner_id,
+			status=status,
+			rbs_node_id=rbs_node_id,
+		)
+
+	total, score_total, assessed = 0, 0, 0
+	by_status: dict[str, int] = {}
+	by_level: dict[str, int] = {}
+	by_rbs_node: dict[int, int] = {}
+	heatmap: dict[tuple[int, int], int] = {}
+	for risk_status, probability, impact, node_id, count in cells:
+		total += count
+		by_status[risk_status] = by_status.get(risk_status, 0) + count
+		score = compute_score(probability, impact)
+		level = risk_level_for_score(score)
+		by_level[level] = by_level.get(level, 0) + count
+		if node_id is not None:
+			by_rbs_node[node_id] = by_rbs_node.get(node_id, 0) + count
+		if score is not None:
+			score_total += score * count
+			assessed += count
+			heatmap[(probability, impact)] = heatmap.get((probability, impact), 0) + count
+
+	by_owner: Optional[dict[str, int]] = None
+	if include_owners:
+		by_owner = {}
+		for owner, count in grouped(Risk.risk_owner):
+			owner = owner or "Unassigned"
+			by_owner[owner] = by_owner.get(owner, 0) + count
+
+	return {
+		"total": total,
+		"average_score": round(score_total / assessed, 2) if assessed else None,
+		"by_status": by_status,
+		"by_level": by_level,
+		"by_owner": by_owner,
+		"by_rbs_node": by_rbs_node,
+		"heatmap": [
+			{"probability": probability, "impact": impact, "count": count}
+			for (probability, impact), count in sorted(heatmap.items())
+		],
+	}
 
 
 def create_risk(db: Session, owner_id: int, **risk_data) -> Risk:
@@ -78,6 +201,7 @@ def create_risk(db: Session, owner_id: int, **risk_data) -> Risk:
 	
 	risk = Risk(owner_id=owner_id, **risk_data)
 	db.add(risk)
+	risk_aggregates.record_change(db, new=risk)
 	db.commit()
 	db.refresh(risk)
 	
@@ -129,9 +253,11 @@ def update_risk(db: Session, owner_id: int, risk_id: int, user_role: Optional[st
 		status=risk.status
 	)
 	
+	old_cell = risk_aggregates.aggregate_key(risk)
 	for key, value in updates.items():
 		# Apply all provided fields, including explicit nulls, so rbs_node_id can be cleared
 		setattr(risk, key, value)
+	risk_aggregates.record_change(db, old=dict(zip(risk_aggregates.KEY_FIELDS, old_cell)), new=risk)
 	
 	# updated_at will be automatically updated by SQLAlchemy due to onupdate=datetime.utcnow
 	db.commit()
@@ -173,6 +299,7 @@ def delete_risk(db: Session, owner_id: int, risk_id: int, user_role: Optional[st
 		description=f"Risk '{risk.risk_name}' deleted"
 	)
 	
+	risk_aggregates.record_change(db, old=risk)
 	db.delete(risk)
 	db.commit()
 	return True
@@ -190,3 +317,217 @@ def get_risk_owners(db: Session, owner_id: int) -> list[str]:
 	return [owner for owner in owners if owner]  # Filter out None/empty values
 
 
+# Ids per IN (...) list when loading bulk targets; well under every driver's bind limit
+BULK_CHUNK_SIZE = 500
+
+_bulk_operation = TypeAdapter(RiskBulkOperation)
+
+_BULK_PERMISSIONS = {
+	"create": Permission.CREATE_RISKS,
+	"update": Permission.EDIT_RISKS,
+	"delete": Permission.DELETE_RISKS,
+}
+
+# RiskUpdate fields that may be omitted but not set to null (NOT NULL columns)
+_NOT_NULL_UPDATE_FIELDS = tuple(
+	column.name for column in Risk.__table__.columns if not column.nullable and column.name in RiskUpdate.model_fields
+)
+
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+	for start in range(0, len(items), size):
+		yield items[start:start + size]
+
+
+def _bulk_error(index: int, raw: Any, error: str) -> dict:
+	op = raw.get("op") if isinstance(raw, dict) else None
+	risk_id = raw.get("id") if isinstance(raw, dict) else None
+	return {
+		"index": index,
+		"op": op if isinstance(op, str) else None,
+		"status": "error",
+		"id": risk_id if isinstance(risk_id, int) else None,
+		"error": error,
+	}
+
+
+def _validation_message(error: ValidationError) -> str:
+	first = error.errors()[0]
+	loc = first["loc"]
+	if loc and loc[0] in _BULK_PERMISSIONS:
+		loc = loc[1:]  # drop the union tag pydantic prefixes ("create.data.impact")
+	location = ".".join(str(part) for part in loc)
+	return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def bulk_write_risks(
+	db: Session,
+	owner_id: int,
+	user_role: Optional[str],
+	operations: list[dict],
+	atomic: bool = False,
+) -> dict:
+	"""Apply many create/update/delete operations in one transaction.
+
+	All operations are validated and permission-checked before anything is
+	written; their targets and referenced RBS nodes are loaded with a few
+	IN (...) queries rather than one lookup per row. Valid operations are then
+	written with executemany statements (creates via INSERT ... RETURNING)
+	and their audit rows with a single batch insert, followed by one commit.
+
+	Returns counts plus one result per operation, in request order. With
+	atomic=True nothing is written if any operation fails.
+	"""
+	results: list[Optional[dict]] = [None] * len(operations)
+	parsed = []
+	for index, raw in enumerate(operations):
+		try:
+			op = _bulk_operation.validate_python(raw)
+		except ValidationError as e:
+			results[index] = _bulk_error(index, raw, _validation_message(e))
+			continue
+		if not has_permission(user_role, _BULK_PERMISSIONS[op.op]):
+			results[index] = _bulk_error(index, raw, f"Insufficient permissions. Required: {_BULK_PERMISSIONS[op.op].value}")
+			continue
+		parsed.append((index, op))
+
+	# Load everything the batch refers to up front
+	target_ids = list({op.id for _, op in parsed if not isinstance(op, RiskBulkCreate)})
+	targets: dict[int, Risk] = {}
+	for chunk in _chunks(target_ids):
+		targets.update((risk.id, risk) for risk in db.scalars(select(Risk).where(Risk.id.in_(chunk))))
+
+	delete_ids = list({op.id for _, op in parsed if isinstance(op, RiskBulkDelete)})
+	with_action_items: set[int] = set()
+	for chunk in _chunks(delete_ids):
+		with_action_items.update(db.scalars(select(ActionItem.risk_id).where(ActionItem.risk_id.in_(chunk)).distinct()))
+
+	node_ids = list({op.data.rbs_node_id for _, op in parsed if not isinstance(op, RiskBulkDelete) and op.data.rbs_node_id is not None})
+	known_nodes: set[int] = set()
+	for chunk in _chunks(node_ids):
+		known_nodes.update(db.scalars(select(RBSNode.id).where(RBSNode.id.in_(chunk))))
+
+	valid = []
+	seen_ids: set[int] = set()
+	for index, op in parsed:
+		error = None
+		if not isinstance(op, RiskBulkCreate):
+			risk = targets.get(op.id)
+			# Same visibility rule as the single-risk endpoints: managers may touch any risk
+			if risk is None or (user_role != "manager" and risk.owner_id != owner_id):
+				error = "Risk not found"
+			elif op.id in seen_ids:
+				error = "Risk appears more than once in this batch"
+			elif isinstance(op, RiskBulkDelete) and op.id in with_action_items:
+				error = "Risk has action items"
+			elif isinstance(op, RiskBulkUpdate):
+				nulls = [field for field in _NOT_NULL_UPDATE_FIELDS if field in op.data.model_fields_set and getattr(op.data, field) is None]
+				if nulls:
+					error = f"{nulls[0]} cannot be null"
+			seen_ids.add(op.id)
+		if error is None and not isinstance(op, RiskBulkDelete):
+			node_id = op.data.rbs_node_id
+			if node_id is not None and node_id not in known_nodes:
+				error = f"RBS node {node_id} not found"
+		if error:
+			results[index] = {"index": index, "op": op.op, "status": "error", "id": getattr(op, "id", None), "error": error}
+		else:
+			valid.append((index, op))
+
+	failed = sum(1 for result in results if result is not None)
+	if atomic and failed:
+		for index, op in valid:
+			results[index] = {"index": index, "op": op.op, "status": "error", "id": getattr(op, "id", None), "error": "Not applied: other operations in this atomic batch failed"}
+		return {"created": 0, "updated": 0, "deleted": 0, "failed": len(operations), "results": results}
+
+	now = datetime.now(timezone.utc)
+	creates = [(index, op) for index, op in valid if isinstance(op, RiskBulkCreate)]
+	updates = [(index, op) for index, op in valid if isinstance(op, RiskBulkUpdate)]
+	deletes = [(index, op) for index, op in valid if isinstance(op, RiskBulkDelete)]
+	audit_events = []
+	cells: Counter = Counter()
+
+	try:
+		if creates:
+			rows = []
+			for _, op in creates:
+				row = op.data.model_dump()
+				# Core inserts bypass Risk's validators, so derive score/level here
+				row["score"] = compute_score(row["probability"], row["impact"])
+				row["risk_level"] = risk_level_for_score(row["score"])
+				rows.append({**row, "owner_id": owner_id, "created_at": now, "updated_at": now})
+				risk_aggregates.track(cells, new=rows[-1])
+			# RETURNING order is not guaranteed, so have SQLAlchemy hand ids back
+			# in parameter order: Postgres keeps batching (matched through a
+			# sentinel), SQLite falls back to one INSERT per row in this transaction.
+			new_ids = db.scalars(insert(Risk).returning(Risk.id, sort_by_parameter_order=True), rows).all()
+			for (index, op), risk_id in zip(creates, new_ids):
+				results[index] = {"index": index, "op": "create", "status": "created", "id": risk_id, "error": None}
+				audit_events.append({
+					"entity_type": "risk",
+					"entity_id": risk_id,
+					"user_id": owner_id,
+					"action": "create",
+					"description": f"Risk '{op.data.risk_name}' created",
+				})
+
+		if updates:
+			from .audit import get_risk_changes
+			rows = []
+			for index, op in updates:
+				risk = targets[op.id]
+				values = op.data.model_dump(exclude_unset=True)
+				results[index] = {"index": index, "op": "update", "status": "updated", "id": op.id, "error": None}
+				if not values:
+					continue
+				# Transient copy with the new values, for the audit diff
+				current = {field: getattr(risk, field) for field in op.data.model_fields}
+				changes = get_risk_changes(risk, Risk(**{**current, **values}))
+				probability = values.get("probability", risk.probability)
+				impact = values.get("impact", risk.impact)
+				score = compute_score(probability, impact)
+				rows.append({"id": op.id, **values, "score": score, "risk_level": risk_level_for_score(score), "updated_at": now})
+				current_cell = {field: getattr(risk, field) for field in risk_aggregates.KEY_FIELDS}
+				risk_aggregates.track(cells, old=current_cell, new={**current_cell, **values})
+				if changes:
+					audit_events.append({
+						"entity_type": "risk",
+						"entity_id": op.id,
+						"user_id": owner_id,
+						"action": "update",
+						"changes": changes,
+						"description": f"Risk '{values.get('risk_name', risk.risk_name)}' updated",
+					})
+			if rows:
+				# ORM bulk UPDATE by primary key: rows sharing a key set go out as one executemany
+				db.execute(update(Risk), rows)
+
+		if deletes:
+			for index, op in deletes:
+				results[index] = {"index": index, "op": "delete", "status": "deleted", "id": op.id, "error": None}
+				risk_aggregates.track(cells, old=targets[op.id])
+				audit_events.append({
+					"entity_type": "risk",
+					"entity_id": op.id,
+					"user_id": owner_id,
+					"action": "delete",
+					"description": f"Risk '{targets[op.id].risk_name}' deleted",
+				})
+			for chunk in _chunks([op.id for _, op in deletes]):
+				db.execute(delete(Risk).where(Risk.id.in_(chunk)), execution_options={"synchronize_session": False})
+
+		risk_aggregates.apply_deltas(db, cells)
+		from .audit import log_audit_events
+		log_audit_events(db, audit_events)
+		db.commit()
+	except Exception:
+		db.rollback()
+		raise
+
+	return {
+		"created": len(creates),
+		"updated": len(updates),
+		"deleted": len(deletes),
+		"failed": failed,
+		"results": results,
+	}
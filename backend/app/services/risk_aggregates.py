@@ -0,0 +1,136 @@
+"""
+Incrementally maintained risk counts (the risk_aggregates table).
+
+Every risk write path turns its changes into +1/-1 deltas on the cells a risk
+leaves and enters, and applies them with apply_deltas() before committing,
+so the counts commit or roll back together with the risks themselves.
+rebuild() recomputes the whole table from the risks (snapshot restore,
+repairs) and check() lists cells that have drifted; scripts/risk_aggregates.py
+runs both from the command line.
+"""
+
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models.risk import Risk
+from ..models.risk_aggregate import RiskAggregate
+
+
+KEY_FIELDS = ("owner_id", "status", "probability", "impact", "scope", "rbs_node_id")
+
+
+def aggregate_key(values: Any) -> tuple:
+	"""Cell key for a Risk (or a dict of risk column values); 0 stands for NULL"""
+	if isinstance(values, dict):
+		get = values.get
+	else:
+		def get(field):
+			return getattr(values, field, None)
+	return (
+		get("owner_id"),
+		get("status") or "open",
+		get("probability") or 0,
+		get("impact") or 0,
+		get("scope") or "project",
+		get("rbs_node_id") or 0,
+	)
+
+
+def track(deltas: Counter, old: Any = None, new: Any = None):
+	"""Record a risk moving from `old` to `new` (None for create/delete)"""
+	if old is not None:
+		deltas[aggregate_key(old)] -= 1
+	if new is not None:
+		deltas[aggregate_key(new)] += 1
+
+
+def apply_deltas(db: Session, deltas: Counter):
+	"""Add the non-zero deltas to their cells in the current transaction (no commit)"""
+	rows = [{**dict(zip(KEY_FIELDS, key)), "risk_count": delta} for key, delta in deltas.items() if delta]
+	if not rows:
+		return
+	table = RiskAggregate.__table__
+	dialect = db.get_bind().dialect.name
+	if dialect in ("postgresql", "sqlite"):
+		upsert = (postgresql if dialect == "postgresql" else sqlite).insert(table)
+		upsert = upsert.on_conflict_do_update(
+			index_elements=list(KEY_FIELDS),
+			set_={"risk_count": table.c.risk_count + upsert.excluded.risk_count},
+		)
+		db.execute(upsert, rows)
+	else:
+		for row in rows:
+			match = [table.c[field] == row[field] for field in KEY_FIELDS]
+			result = db.execute(update(table).where(*match).values(risk_count=table.c.risk_count + row["risk_count"]))
+			if result.rowcount == 0:
+				db.execute(table.insert().values(**row))
+	if any(row["risk_count"] < 0 for row in rows):
+		db.execute(delete(table).where(table.c.risk_count <= 0))
+
+
+def record_change(db: Session, old: Any = None, new: Any = None):
+	"""apply_deltas for a single risk write"""
+	deltas: Counter = Counter()
+	track(deltas, old, new)
+	apply_deltas(db, deltas)  # no-op when the risk stayed in its cell
+
+
+def _grouped_risks():
+	key = (
+		Risk.owner_id,
+		Risk.status,
+		func.coalesce(Risk.probability, 0),
+		func.coalesce(Risk.impact, 0),
+		Risk.scope,
+		func.coalesce(Risk.rbs_node_id, 0),
+	)
+	return select(*key, func.count()).group_by(*key)
+
+
+def rebuild(db: Session) -> int:
+	"""Recompute every cell from the risks table (no commit); returns the cell count"""
+	table = RiskAggregate.__table__
+	db.execute(delete(table))
+	rows = [{**dict(zip(KEY_FIELDS, row[:-1])), "risk_count": row[-1]} for row in db.execute(_grouped_risks())]
+	if rows:
+		db.execute(table.insert(), rows)
+	return len(rows)
+
+
+def check(db: Session) -> list[dict]:
+	"""Cells whose stored count differs from a fresh GROUP BY over the risks"""
+	expected = {tuple(row[:-1]): row[-1] for row in db.execute(_grouped_risks())}
+	stored = {
+		tuple(getattr(cell, field) for field in KEY_FIELDS): cell.risk_count
+		for cell in db.scalars(select(RiskAggregate))
+	}
+	drift = []
+	for key in sorted(set(expected) | set(stored), key=repr):
+		if expected.get(key, 0) != stored.get(key, 0):
+			drift.append({**dict(zip(KEY_FIELDS, key)), "expected": expected.get(key, 0), "stored": stored.get(key, 0)})
+	return drift
+
+
+def aggregate_cells(
+	db: Session,
+	owner_id: Optional[int] = None,
+	status: Optional[str] = None,
+	rbs_node_id: Optional[int] = None,
+):
+	"""(status, probability, impact, rbs_node_id, count) rows, NULLs restored"""
+	columns = (RiskAggregate.status, RiskAggregate.probability, RiskAggregate.impact, RiskAggregate.rbs_node_id)
+	stmt = select(*columns, func.sum(RiskAggregate.risk_count)).group_by(*columns)
+	if owner_id is not None:
+		stmt = stmt.where(RiskAggregate.owner_id == owner_id)
+	if status:
+		stmt = stmt.where(RiskAggregate.status == status)
+	if rbs_node_id is not None:
+		stmt = stmt.where(RiskAggregate.rbs_node_id == rbs_node_id)
+	return [
+		(cell_status, probability or None, impact or None, node_id or None, int(count))
+		for cell_status, probability, impact, node_id, count in db.execute(stmt)
+	]
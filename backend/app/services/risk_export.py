@@ -0,0 +1,149 @@
+"""
+Streaming export of the risk register as NDJSON or CSV.
+
+Rows come from one ordered select executed with yield_per, so the driver
+hands them over in batches of `risk_export_batch_size` (a server-side cursor
+on Postgres) and only the current batch is held in memory: it is serialized
+and sent before the next one is fetched. Filters, visibility and ordering are
+those of list_risks, without the page limit.
+
+NDJSON rows can carry their action items nested (one IN (...) query per
+batch); the CSV columns use the spreadsheet headers, so an export can be fed
+back through POST /risks/import.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.action_item import ActionItem
+from ..models.risk import Risk
+from ..schemas.action_item import ActionItem as ActionItemSchema
+from ..schemas.risk import RiskRead
+from .pagination import keyset_order
+from .risk import RISK_SORT_KEYS, _chunks, risk_list_query, risk_sort_key
+
+
+EXPORT_FORMATS = {
+	"ndjson": "application/x-ndjson",
+	"csv": "text/csv",  # Starlette appends the charset
+}
+
+# CSV header -> risk attribute
+CSV_COLUMNS = (
+	("ID", "id"),
+	("Risk Name", "risk_name"),
+	("Description", "risk_description"),
+	("Status", "status"),
+	("Probability", "probability"),
+	("Impact", "impact"),
+	("Score", "score"),
+	("Risk Level", "risk_level"),
+	("Scope", "scope"),
+	("Risk Owner", "risk_owner"),
+	("RBS Node ID", "rbs_node_id"),
+	("Probability Basis", "probability_basis"),
+	("Impact Basis", "impact_basis"),
+	("Notes", "notes"),
+	("Latest Reviewed Date", "latest_reviewed_date"),
+	("Action Items", "action_items_count"),
+	("Created At", "created_at"),
+	("Updated At", "updated_at"),
+)
+
+
+def export_query(
+	db: Session,
+	owner_id: int,
+	user_role: Optional[str],
+	sort_by: Optional[str] = None,
+	order: str = "desc",
+	**filters,
+):
+	"""The list_risks select (same filters, visibility and order) without paging"""
+	stmt, relevance = risk_list_query(db, owner_id, user_role=user_role, **filters)
+	if relevance is not None and sort_by not in RISK_SORT_KEYS:
+		return stmt.order_by(relevance, desc(Risk.created_at), desc(Risk.id))
+	key = risk_sort_key(sort_by)
+	return stmt.order_by(*keyset_order(getattr(Risk, key), Risk.id, order == "desc"))
+
+
+def iter_risk_batches(db: Session, stmt, batch_size: int) -> Iterator[list[Risk]]:
+	result = db.execute(stmt.execution_options(yield_per=batch_size))
+	for batch in result.scalars().partitions():
+		yield batch
+		# Nothing is modified; let the batch go before the next one is loaded
+		for risk in batch:
+			db.expunge(risk)
+
+
+def action_items_by_risk(db: Session, risk_ids: list[int]) -> dict[int, list[ActionItem]]:
+	items: dict[int, list[ActionItem]] = {risk_id: [] for risk_id in risk_ids}
+	for sub in _chunks(risk_ids):
+		stmt = select(ActionItem).where(ActionItem.risk_id.in_(sub)).order_by(ActionItem.risk_id, ActionItem.created_at, ActionItem.id)
+		for item in db.scalars(stmt):
+			items[item.risk_id].append(item)
+	return items
+
+
+def ndjson_lines(db: Session, stmt, include_action_items: bool, batch_size: int) -> Iterator[str]:
+	for risks in iter_risk_batches(db, stmt, batch_size):
+		items = action_items_by_risk(db, [risk.id for risk in risks]) if include_action_items else None
+		lines = []
+		for risk in risks:
+			row = RiskRead.model_validate(risk).model_dump(mode="json")
+			if items is not None:
+				row["action_items"] = [ActionItemSchema.model_validate(item).model_dump(mode="json") for item in items[risk.id]]
+			lines.append(json.dumps(row, separators=(",", ":")) + "\n")
+		yield "".join(lines)
+
+
+def _csv_value(value: Any) -> Any:
+	if value is None:
+		return ""
+	if isinstance(value, datetime):
+		return value.isoformat()
+	return value
+
+
+def csv_chunks(db: Session, stmt, batch_size: int) -> Iterator[str]:
+	buffer = io.StringIO()
+	writer = csv.writer(buffer)
+	# BOM so Excel reads the file as UTF-8; the importer strips it again
+	buffer.write("\ufeff")
+	writer.writerow([header for header, _ in CSV_COLUMNS])
+	for risks in iter_risk_batches(db, stmt, batch_size):
+		for risk in risks:
+			writer.writerow([_csv_value(getattr(risk, name)) for _, name in CSV_COLUMNS])
+		yield buffer.getvalue()
+		buffer.seek(0)
+		buffer.truncate(0)
+	if buffer.tell():
+		yield buffer.getvalue()  # header only: nothing matched
+
+
+def stream_risk_export(
+	session_factory: Callable[[], Session],
+	export_format: str,
+	owner_id: int,
+	user_role: Optional[str],
+	sort_by: Optional[str] = None,
+	order: str = "desc",
+	include_action_items: bool = False,
+	batch_size: Optional[int] = None,
+	**filters,
+) -> Iterator[str]:
+	"""Export body, generated batch by batch in a session the stream owns"""
+	batch_size = batch_size or settings.risk_export_batch_size
+	with session_factory() as db:
+		stmt = export_query(db, owner_id, user_role, sort_by=sort_by, order=order, **filters)
+		if export_format == "csv":
+			yield from csv_chunks(db, stmt, batch_size)
+		else:
+			yield from ndjson_lines(db, stmt, include_action_items, batch_size)
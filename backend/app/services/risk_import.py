@@ -0,0 +1,228 @@
+"""
+Streaming risk import from Excel (.xlsx) or CSV uploads.
+
+Rows are read one at a time (openpyxl's read-only iterator, csv.reader) and
+handled in chunks of `risk_import_chunk_size`: each chunk is mapped to bulk
+operations, checked for risk-name conflicts with one indexed IN (...) lookup,
+and written through bulk_write_risks. Only the current chunk is held in
+memory, so memory use stays flat however large the sheet is. Progress is
+published on the job after every chunk.
+"""
+
+import csv
+import os
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.jobs import Job, job_registry
+from ..models.risk import Risk
+from .risk import _chunks, bulk_write_risks, visible_risks
+
+
+# Spreadsheet header (lower-cased) -> risk field; same columns the Reports export writes
+COLUMN_FIELDS = {
+	"title": "risk_name",
+	"risk name": "risk_name",
+	"title/risk name": "risk_name",
+	"description": "risk_description",
+	"status": "status",
+	"probability": "probability",
+	"impact": "impact",
+	"scope": "scope",
+	"risk owner": "risk_owner",
+	"probability basis": "probability_basis",
+	"impact basis": "impact_basis",
+	"notes": "notes",
+	"latest reviewed date": "latest_reviewed_date",
+}
+
+# Errors kept on the job; the counts stay exact beyond this
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFormatError(ValueError):
+	"""Raised when an upload is not a readable spreadsheet with a header row"""
+
+
+def iter_xlsx_rows(path: str, sheet_name: str = "Risks") -> Iterator[tuple]:
+	try:
+		from openpyxl import load_workbook
+	except ImportError as e:
+		raise ImportFormatError("Excel import requires openpyxl; upload a CSV instead") from e
+	try:
+		workbook = load_workbook(path, read_only=True, data_only=True)
+	except Exception as e:
+		raise ImportFormatError("Not a readable .xlsx file") from e
+	try:
+		sheet = workbook[sheet_name] if sheet_name in workbook.sheetnames else workbook.worksheets[0]
+		yield from sheet.iter_rows(values_only=True)
+	finally:
+		workbook.close()
+
+
+def iter_csv_rows(path: str) -> Iterator[tuple]:
+	# utf-8-sig drops the BOM Excel puts in front of CSV exports
+	with open(path, newline="", encoding="utf-8-sig") as handle:
+		for row in csv.reader(handle):
+			yield tuple(row)
+
+
+def iter_rows(path: str, filename: str) -> Iterator[tuple]:
+	if filename.lower().endswith(".csv"):
+		return iter_csv_rows(path)
+	if filename.lower().endswith((".xlsx", ".xlsm")):
+		return iter_xlsx_rows(path)
+	raise ImportFormatError("Upload a .xlsx or .csv file")
+
+
+def _cell(value: Any) -> Any:
+	if isinstance(value, str):
+		value = value.strip()
+		return value or None
+	return value
+
+
+def row_to_risk(header: list[Optional[str]], row: tuple) -> dict:
+	"""Map one sheet row to RiskCreate fields, dropping blank cells"""
+	data = {}
+	for column, value in zip(header, row):
+		value = _cell(value)
+		if column is None or value is None:
+			continue
+		if column in ("probability", "impact"):
+			if isinstance(value, (str, float)):
+				try:
+					value = int(float(value))
+				except ValueError:
+					pass  # left for validation to report
+		elif column != "latest_reviewed_date":
+			value = str(value)
+			if column == "status":
+				value = value.lower().replace(" ", "_")
+		data[column] = value
+	return data
+
+
+def import_risk_rows(
+	db: Session,
+	rows: Iterator[tuple],
+	owner_id: int,
+	user_role: Optional[str],
+	on_conflict: str = "skip",
+	chunk_size: Optional[int] = None,
+	progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+	"""Import risks from an iterator of sheet rows (first row is the header).
+
+	A row whose risk name already exists among the risks the user can see (or
+	appears earlier in the file) is a conflict, handled per `on_conflict`: "skip" it, "update" the existing
+	risk with the row's non-blank cells, or "create" a duplicate anyway.
+	Returns the totals plus the first MAX_REPORTED_ERRORS row errors.
+	"""
+	chunk_size = chunk_size or settings.risk_import_chunk_size
+	rows = iter(rows)
+	header_row = next(rows, None)
+	if header_row is None:
+		raise ImportFormatError("The sheet is empty")
+	header = [COLUMN_FIELDS.get(str(cell).strip().lower()) if cell is not None else None for cell in header_row]
+	if "risk_name" not in header:
+		raise ImportFormatError("No risk name column (expected 'Title', 'Risk Name' or 'Title/Risk Name')")
+
+	totals = {"rows": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 0}
+	errors: list[dict] = []
+
+	def flush(chunk: list[tuple[int, dict]]):
+		names = list({data["risk_name"] for _, data in chunk if isinstance(data.get("risk_name"), str)})
+		existing: dict[str, int] = {}
+		if on_conflict != "create":
+			# Served by ix_risks_risk_name; earlier chunks are already committed, so
+			# this also catches duplicates from earlier in the file. Only risks the
+			# importer can see (as in GET /risks) count as conflicts.
+			for sub in _chunks(names):
+				stmt = visible_risks(select(Risk.id, Risk.risk_name).where(Risk.risk_name.in_(sub)), owner_id, user_role)
+				for risk_id, name in db.execute(stmt):
+					existing.setdefault(name, risk_id)
+
+		operations, row_numbers, seen = [], [], set()
+		for row_number, data in chunk:
+			name = data.get("risk_name")
+			conflict_id = existing.get(name)
+			if name is not None and on_conflict == "skip" and (conflict_id is not None or name in seen):
+				totals["skipped"] += 1
+				continue
+			if on_conflict == "update" and conflict_id is not None:
+				operations.append({"op": "update", "id": conflict_id, "data": data})
+			else:
+				operations.append({"op": "create", "data": data})
+			seen.add(name)
+			row_numbers.append(row_number)
+
+		result = bulk_write_risks(db, owner_id=owner_id, user_role=user_role, operations=operations)
+		totals["created"] += result["created"]
+		totals["updated"] += result["updated"]
+		totals["failed"] += result["failed"]
+		for item in result["results"]:
+			if item["status"] == "error" and len(errors) < MAX_REPORTED_ERRORS:
+				errors.append({"row": row_numbers[item["index"]], "error": item["error"]})
+		if progress:
+			progress(dict(totals))
+
+	chunk: list[tuple[int, dict]] = []
+	chunk_names: set = set()
+	for row_number, row in enumerate(rows, start=2):
+		if not any(_cell(value) is not None for value in row):
+			continue  # blank line
+		totals["rows"] += 1
+		data = row_to_risk(header, row)
+		name = data.get("risk_name")
+		if on_conflict == "update" and name is not None and name in chunk_names:
+			# Write what we have first, so this repeat updates the risk created above
+			flush(chunk)
+			chunk, chunk_names = [], set()
+		chunk.append((row_number, data))
+		chunk_names.add(name)
+		if len(chunk) >= chunk_size:
+			flush(chunk)
+			chunk, chunk_names = [], set()
+	if chunk:
+		flush(chunk)
+
+	return {**totals, "errors": errors}
+
+
+def run_import_job(
+	job: Job,
+	session_factory: Callable[[], Session],
+	path: str,
+	filename: str,
+	owner_id: int,
+	user_role: Optional[str],
+	on_conflict: str,
+):
+	"""Background task: import an uploaded file, publishing progress on the job"""
+	job_registry.start(job)
+	try:
+		with session_factory() as db:
+			result = import_risk_rows(
+				db,
+				iter_rows(path, filename),
+				owner_id=owner_id,
+				user_role=user_role,
+				on_conflict=on_conflict,
+				progress=lambda totals: job_registry.update(job, **totals),
+			)
+		job_registry.finish(job, result=result)
+	except ImportFormatError as e:
+		job_registry.finish(job, error=str(e))
+	except Exception as e:
+		print(f"Risk import {job.id} failed: {e}")
+		job_registry.finish(job, error="Import failed; rows written before the error were kept")
+	finally:
+		try:
+			os.remove(path)
+		except OSError:
+			pass
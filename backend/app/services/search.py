@@ -0,0 +1,74 @@
+import re
+import weakref
+from typing import Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.orm import Session
+
+from ..models.risk import Risk, POSTGRES_SEARCH_VECTOR
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+risks_fts = table("risks_fts", column("rowid"), column("rank"))
+
+# Engines known to have (or lack) the SQLite FTS table, checked once per engine
+_sqlite_fts_available: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def search_tokens(term: str) -> list[str]:
+	"""Split user input into plain word tokens (drops FTS operators and quotes)"""
+	return _TOKEN.findall(term or "")
+
+
+def sqlite_match_query(tokens: list[str]) -> str:
+	# Every token must match, each as a prefix: "data" "bre"*
+	return " ".join(f'"{token}"*' for token in tokens)
+
+
+def postgres_tsquery(tokens: list[str]) -> str:
+	return " & ".join(f"{token}:*" for token in tokens)
+
+
+def name_contains(term: str):
+	# Case-insensitive substring match; % and _ in the term are literal
+	return Risk.risk_name.icontains(term, autoescape=True)
+
+
+def has_sqlite_fts(db: Session) -> bool:
+	engine = db.get_bind()
+	if engine not in _sqlite_fts_available:
+		found = db.execute(
+			text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'risks_fts'")
+		).first()
+		_sqlite_fts_available[engine] = found is not None
+	return _sqlite_fts_available[engine]
+
+
+def apply_risk_search(db: Session, stmt, term: str) -> Tuple[object, Optional[object]]:
+	"""Restrict a Risk select to full-text matches.
+
+	Returns the filtered statement and an expression to order by for
+	relevance (best match first), or None when falling back to a plain
+	substring match on the risk name.
+	"""
+	tokens = search_tokens(term)
+	if not tokens:
+		# Nothing indexable (e.g. "%%" or "-"): match the term literally in names
+		return stmt.where(name_contains(term)), None
+
+	dialect = db.get_bind().dialect.name
+	if dialect == "sqlite" and has_sqlite_fts(db):
+		stmt = stmt.join(risks_fts, risks_fts.c.rowid == Risk.id).where(
+			text("risks_fts MATCH :fts_query").bindparams(fts_query=sqlite_match_query(tokens))
+		)
+		# FTS5 rank is bm25(), where lower means more relevant
+		return stmt, risks_fts.c.rank.asc()
+
+	if dialect == "postgresql":
+		vector = literal_column(POSTGRES_SEARCH_VECTOR)
+		query = func.to_tsquery("english", postgres_tsquery(tokens))
+		stmt = stmt.where(vector.op("@@")(query))
+		return stmt, func.ts_rank(vector, query).desc()
+
+	return stmt.where(name_contains(term)), None
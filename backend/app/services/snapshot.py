@@ -7,6 +7,7 @@ from ..models.snapshot import Snapshot
 from ..models.risk import Risk
 from ..models.action_item import ActionItem
 from ..schemas.snapshot import SnapshotCreate, SnapshotUpdate
+from . import risk_aggregates
 
 
 class SnapshotService:
@@ -126,6 +127,7 @@ class SnapshotService:
             # Clear existing data
             self.db.query(ActionItem).delete()
             self.db.query(Risk).delete()
+            risk_aggregates.rebuild(self.db)
             self.db.commit()
 
             # Restore risks and create ID mapping
@@ -215,6 +217,9 @@ class SnapshotService:
                 self.db.add(action_item)
                 restored_action_items += 1
 
+            # Restore replaces the whole register, so recount rather than track deltas
+            self.db.flush()
+            risk_aggregates.rebuild(self.db)
             self.db.commit()
 
             return {
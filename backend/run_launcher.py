@@ -7,6 +7,11 @@ import webbrowser
 import urllib.request
 import urllib.error
 from uvicorn import Config, Server
+
+# The desktop build is single-user SQLite; opt into the WAL/pragma profile
+# before settings are loaded by the app import below.
+os.environ.setdefault("SQLITE_PERFORMANCE_MODE", "true")
+
 import app.main  # ensure PyInstaller collects the FastAPI app package
 
 
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark /auth/login throughput and its effect on other endpoints.
+
+Fires a burst of concurrent logins at the app (in-process, over ASGI) while a
+second client keeps polling an authenticated sync endpoint (GET /risks), then
+reports login throughput, how many logins were shed with 503, and the
+latency of the other endpoint during the burst. Because bcrypt runs on the
+dedicated hashing pool, GET /risks latency should stay close to its idle
+value however large the login burst is.
+
+Login throttling is disabled for the run so every request reaches bcrypt.
+
+Usage (from the backend directory):
+    python scripts/benchmark_login.py [--logins 200] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.hashing import password_hasher
+from app.core.throttle import SlidingWindowLimiter
+from app.database import Base, get_db
+from app.main import create_app
+from app.routers import auth as auth_router
+from app.services.auth import create_user_access_token, register_user
+
+
+def percentile(values: list[float], pct: float) -> float:
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(logins: int, concurrency: int) -> None:
+	db_fd, db_path = tempfile.mkstemp(suffix=".db")
+	os.close(db_fd)
+	engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+	Base.metadata.create_all(bind=engine)
+	SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+	with SessionLocal() as db:
+		register_user(db, email="bench@example.com", password="bench-pass", role="manager")
+		reader = register_user(db, email="reader@example.com", password="reader-pass", role="viewer")
+		reader_headers = {"Authorization": f"Bearer {create_user_access_token(reader)}"}
+
+	def override_get_db():
+		db = SessionLocal()
+		try:
+			yield db
+		finally:
+			db.close()
+
+	app = create_app()
+	app.dependency_overrides[get_db] = override_get_db
+	auth_router.login_ip_limiter = SlidingWindowLimiter(0, 1)
+	auth_router.login_account_limiter = SlidingWindowLimiter(0, 1)
+
+	transport = httpx.ASGITransport(app=app)
+	async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+		async def poll_once() -> float:
+			started = time.perf_counter()
+			r = await client.get("/risks", headers=reader_headers)
+			r.raise_for_status()
+			return time.perf_counter() - started
+
+		idle = [await poll_once() for _ in range(20)]
+
+		statuses: dict[int, int] = {}
+		semaphore = asyncio.Semaphore(concurrency)
+		done = asyncio.Event()
+
+		async def one_login():
+			async with semaphore:
+				r = await client.post("/auth/login", data={"username": "bench@example.com", "password": "bench-pass"})
+				statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+		busy: list[float] = []
+
+		async def poller():
+			while not done.is_set():
+				busy.append(await poll_once())
+				await asyncio.sleep(0.01)
+
+		poll_task = asyncio.create_task(poller())
+		started = time.perf_counter()
+		await asyncio.gather(*(one_login() for _ in range(logins)))
+		elapsed = time.perf_counter() - started
+		done.set()
+		await poll_task
+
+	engine.dispose()
+	os.remove(db_path)
+
+	ok = statuses.get(200, 0)
+	print(f"Hashing pool: {password_hasher.workers} workers, queue limit {password_hasher.queue_limit}")
+	print(f"Logins: {logins} at concurrency {concurrency} in {elapsed:.2f}s")
+	print(f"  succeeded:  {ok} ({ok / elapsed:.1f}/s)")
+	print(f"  shed (503): {statuses.get(503, 0)}")
+	print(f"  other:      {sum(v for k, v in statuses.items() if k not in (200, 503))}")
+	print("GET /risks latency (ms)      p50      p95")
+	print(f"  idle:               {statistics.median(idle) * 1000:8.1f} {percentile(idle, 0.95) * 1000:8.1f}")
+	print(f"  during login burst: {statistics.median(busy) * 1000:8.1f} {percentile(busy, 0.95) * 1000:8.1f}")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--logins", type=int, default=200)
+	parser.add_argument("--concurrency", type=int, default=50)
+	args = parser.parse_args()
+	asyncio.run(run(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of the list endpoints.
+
+Loads --rows risks, action items and audit logs into an in-memory SQLite
+database, then times turning the loaded ORM rows into the response body
+both ways:
+
+- response_model:  FastAPI's default (validate into models, dump to Python
+                   objects, json.dumps through JSONResponse)
+- adapter:         core.responses.json_list_response (cached TypeAdapter,
+                   one dump_json pass)
+
+Both produce the same bytes; the script checks that before timing. Query time
+is left out, so the numbers are the serialization cost alone.
+
+Usage (from the backend directory):
+	python scripts/benchmark_serialization.py [--rows 1000] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.responses import json_list_response
+from app.database import Base
+from app.models import ActionItem, AuditLog, Risk, User
+from app.schemas.action_item import ActionItem as ActionItemSchema
+from app.schemas.audit import AuditLogRead
+from app.schemas.risk import RiskRead
+
+
+def seed(db, rows: int) -> None:
+	user = User(email="bench@example.com", hashed_password="x", role="manager")
+	db.add(user)
+	db.flush()
+	started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+	for i in range(rows):
+		risk = Risk(
+			risk_name=f"Supplier risk {i}",
+			risk_description="Single-source component with a long lead time. " * 4,
+			probability=i % 5 + 1,
+			impact=(i * 3) % 5 + 1,
+			risk_owner=f"Owner {i % 12}",
+			status="open",
+			owner_id=user.id,
+			latest_reviewed_date=started + timedelta(days=i % 90),
+		)
+		db.add(risk)
+		db.flush()
+		db.add(ActionItem(risk_id=risk.id, title=f"Qualify a second source {i}", created_by=user.id, due_date=started + timedelta(days=30)))
+		db.add(AuditLog(entity_type="risk", entity_id=risk.id, user_id=user.id, action="create", changes={"risk_name": risk.risk_name, "probability": risk.probability}))
+	db.commit()
+
+
+def default_body(field, items) -> bytes:
+	async def _run():
+		return await serialize_response(field=field, response_content=items, is_coroutine=True)
+
+	return JSONResponse(anyio.run(_run)).body
+
+
+def median_time(fn, repeat: int) -> float:
+	timings = []
+	for _ in range(repeat):
+		started = time.perf_counter()
+		fn()
+		timings.append(time.perf_counter() - started)
+	return statistics.median(timings)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--rows", type=int, default=1000)
+	parser.add_argument("--repeat", type=int, default=20, help="timed runs per endpoint (median is reported)")
+	args = parser.parse_args()
+
+	engine = create_engine("sqlite://")
+	Base.metadata.create_all(bind=engine)
+	SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	with SessionLocal() as db:
+		seed(db, args.rows)
+		risks = list(db.scalars(select(Risk)))
+		items = list(db.scalars(select(ActionItem)))
+		logs = [
+			{**AuditLogRead.model_validate(log).model_dump(exclude={"user_email"}), "user_email": log.user.email}
+			for log in db.scalars(select(AuditLog))
+		]
+		cases = (
+			("GET /risks", RiskRead, risks),
+			("GET /action-items/", ActionItemSchema, items),
+			("GET /audit/logs", AuditLogRead, logs),
+		)
+
+		print(f"Serializing {args.rows} rows per endpoint (median of {args.repeat} runs), ms per 1k rows")
+		for label, schema, rows in cases:
+			field = create_response_field(name="Response", type_=list[schema])
+			before = default_body(field, rows)
+			after = json_list_response(schema, rows).body
+			assert before == after, f"{label}: bodies differ"
+
+			default_ms = median_time(lambda: default_body(field, rows), args.repeat) * 1000 * 1000 / len(rows)
+			adapter_ms = median_time(lambda: json_list_response(schema, rows), args.repeat) * 1000 * 1000 / len(rows)
+			print(
+				f"{label:>20}: response_model {default_ms:7.2f} ms  adapter {adapter_ms:7.2f} ms  "
+				f"({default_ms / adapter_ms:.1f}x, {len(after) / len(rows):.0f} bytes/row)"
+			)
+
+	engine.dispose()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite commit throughput with and without the performance profile.
+
+Runs the same concurrent insert/commit workload twice against a fresh
+temporary database:
+
+- default:  stock pysqlite settings (rollback journal, synchronous=FULL)
+- profile:  WAL + pragma profile + serialized writer queue
+            (what SQLITE_PERFORMANCE_MODE=true enables)
+
+Usage (from the backend directory):
+    python scripts/benchmark_sqlite_commits.py [--threads 8] [--commits 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SQLiteWriteQueue, apply_sqlite_pragmas
+from app.core.config import settings
+from app.models import AuditLog, User
+
+
+def run_workload(use_profile: bool, threads: int, commits: int) -> dict:
+	db_fd, db_path = tempfile.mkstemp(suffix=".db")
+	os.close(db_fd)
+	engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+	if use_profile:
+		event.listen(engine, "connect", apply_sqlite_pragmas)
+	Base.metadata.create_all(bind=engine)
+
+	SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	if use_profile:
+		SQLiteWriteQueue(timeout=settings.sqlite_busy_timeout / 1000).install(SessionLocal)
+
+	with SessionLocal() as db:
+		user = User(email="bench@example.com", hashed_password="x", role="manager")
+		db.add(user)
+		db.commit()
+		user_id = user.id
+
+	errors = []
+	lock = threading.Lock()
+
+	def worker(worker_id: int):
+		with SessionLocal() as db:
+			for i in range(commits):
+				try:
+					db.add(AuditLog(
+						entity_type="benchmark",
+						entity_id=worker_id * commits + i,
+						user_id=user_id,
+						action="create",
+						changes={"n": i},
+					))
+					db.commit()
+				except OperationalError as e:
+					db.rollback()
+					with lock:
+						errors.append(str(e.orig))
+
+	started = time.perf_counter()
+	pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+	for t in pool:
+		t.start()
+	for t in pool:
+		t.join()
+	elapsed = time.perf_counter() - started
+
+	engine.dispose()
+	for suffix in ("", "-wal", "-shm"):
+		try:
+			os.remove(db_path + suffix)
+		except FileNotFoundError:
+			pass
+
+	attempted = threads * commits
+	succeeded = attempted - len(errors)
+	return {
+		"elapsed": elapsed,
+		"succeeded": succeeded,
+		"errors": len(errors),
+		"commits_per_sec": succeeded / elapsed if elapsed else 0.0,
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--threads", type=int, default=8)
+	parser.add_argument("--commits", type=int, default=200, help="commits per thread")
+	args = parser.parse_args()
+
+	print(f"Workload: {args.threads} threads x {args.commits} commits")
+	results = {}
+	for label, use_profile in (("default", False), ("profile", True)):
+		results[label] = run_workload(use_profile, args.threads, args.commits)
+		r = results[label]
+		print(
+			f"{label:>8}: {r['commits_per_sec']:8.1f} commits/s  "
+			f"({r['succeeded']} ok, {r['errors']} locked errors, {r['elapsed']:.2f}s)"
+		)
+
+	if results["default"]["commits_per_sec"]:
+		speedup = results["profile"]["commits_per_sec"] / results["default"]["commits_per_sec"]
+		print(f"Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+	main()
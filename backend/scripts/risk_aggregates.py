@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Check or rebuild the risk_aggregates table behind GET /risks/stats.
+
+The table is kept in step with every risk write made through the app. Writes
+that bypass it (raw SQL, the seeding scripts in this folder) leave it stale;
+`check` lists the cells that disagree with the risks table and exits 1 if
+any do, `rebuild` recomputes the whole table in one transaction.
+
+Usage (from the backend directory):
+    python scripts/risk_aggregates.py check
+    python scripts/risk_aggregates.py rebuild
+"""
+
+import argparse
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_session_local
+from app.services import risk_aggregates
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("command", choices=["check", "rebuild"])
+	args = parser.parse_args()
+
+	with get_session_local()() as db:
+		if args.command == "rebuild":
+			cells = risk_aggregates.rebuild(db)
+			db.commit()
+			print(f"Rebuilt risk_aggregates: {cells} cells")
+			return 0
+
+		drift = risk_aggregates.check(db)
+		for cell in drift:
+			print(f"  {cell}")
+		if drift:
+			print(f"{len(drift)} cells out of step; run: python scripts/risk_aggregates.py rebuild")
+			return 1
+		print("risk_aggregates matches the risks table")
+		return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,25 @@
+import pytest
+
+from app.core.jobs import job_registry
+from app.core.revocation import revocation_list, token_versions
+from app.core.security import token_cache
+from app.dependencies import user_cache
+from app.routers.auth import login_account_limiter, login_ip_limiter
+
+
+def _reset():
+    user_cache.clear()
+    token_cache.clear()
+    login_ip_limiter.clear()
+    login_account_limiter.clear()
+    revocation_list.clear()
+    token_versions.clear()
+    job_registry.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    # Each test builds a fresh database, so user ids repeat across tests
+    _reset()
+    yield
+    _reset()
@@ -0,0 +1,257 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.core.security import create_access_token, decode_token
+from app.core.revocation import token_versions
+from app.dependencies import CurrentUser, UserCache, user_cache
+from app.models.user import User
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def user_selects(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def test_user_cache_expires_and_evicts_least_recent():
+    cache = UserCache(ttl_seconds=0.05, max_entries=2)
+    for user_id in (1, 2):
+        cache.put(CurrentUser(id=user_id, email=f"u{user_id}@example.com", role="viewer"))
+    assert cache.get(1) is not None  # 1 is now most recent
+    cache.put(CurrentUser(id=3, email="u3@example.com", role="viewer"))
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+
+    time.sleep(0.06)
+    assert cache.get(1) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_user_loaded_once_then_served_from_cache(app_overridden, db_session, test_engine):
+    app = app_overridden
+    manager = make_auth_header(db_session, "cached@example.com", "manager")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            with user_selects(test_engine) as first:
+                r = await client.get("/risks", headers=manager)
+                assert r.status_code == 200
+            # One token_version lookup; the role comes from the token
+            assert len(first) == 1
+
+            with user_selects(test_engine) as second:
+                r = await client.get("/risks", headers=manager)
+                assert r.status_code == 200
+            assert second == []
+
+    anyio.run(_run)
+
+
+def test_role_change_revokes_outstanding_tokens(app_overridden, db_session):
+    app = app_overridden
+    manager = make_auth_header(db_session, "boss@example.com", "manager")
+    editor_user = register_user(db_session, email="ed@example.com", password="pass123", role="editor")
+    editor = {"Authorization": f"Bearer {create_user_access_token(editor_user)}"}
+    payload = {"risk_name": "Cached role", "probability": 2, "impact": 2}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            r = await client.post("/risks", json=payload, headers=editor)
+            assert r.status_code == 201
+
+            r = await client.put(f"/users/{editor_user.id}", json={"role": "viewer"}, headers=manager)
+            assert r.status_code == 200
+            # The demotion revokes the token carrying the old role claim
+            r = await client.post("/risks", json=payload, headers=editor)
+            assert r.status_code == 401
+
+            db_session.refresh(editor_user)
+            relogin = {"Authorization": f"Bearer {create_user_access_token(editor_user)}"}
+            r = await client.post("/risks", json=payload, headers=relogin)
+            assert r.status_code == 403
+
+    anyio.run(_run)
+
+
+
+def test_failed_role_change_commit_keeps_tokens_valid(app_overridden, db_session, monkeypatch):
+    app = app_overridden
+    manager = make_auth_header(db_session, "boss-rollback@example.com", "manager")
+    editor_user = register_user(db_session, email="ed-rollback@example.com", password="pass123", role="editor")
+    editor = {"Authorization": f"Bearer {create_user_access_token(editor_user)}"}
+
+    def failing_commit():
+        raise RuntimeError("database went away")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            assert (await client.get("/risks", headers=editor)).status_code == 200
+
+            with monkeypatch.context() as patch:
+                patch.setattr(db_session, "commit", failing_commit)
+                with pytest.raises(RuntimeError):
+                    await client.put(f"/users/{editor_user.id}", json={"role": "viewer"}, headers=manager)
+            db_session.rollback()
+
+            # The version bump never reached the database, so the token still works
+            assert (await client.get("/risks", headers=editor)).status_code == 200
+
+    anyio.run(_run)
+
+def test_permission_refused_from_claims_without_user_lookup(app_overridden, db_session, test_engine):
+    app = app_overridden
+    viewer = make_auth_header(db_session, "claims@example.com", "viewer")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            with user_selects(test_engine) as selects:
+                r = await client.post("/risks", json={"risk_name": "Nope"}, headers=viewer)
+            assert r.status_code == 403
+            assert selects == []
+
+    anyio.run(_run)
+
+
+def test_tokens_without_role_claims_still_authorize(app_overridden, db_session):
+    app = app_overridden
+    user = register_user(db_session, email="legacy@example.com", password="pass123", role="editor")
+    legacy = {"Authorization": f"Bearer {create_access_token(subject=str(user.id))}"}
+    assert "role" not in decode_token(create_access_token(subject=str(user.id)))
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            r = await client.post("/risks", json={"risk_name": "Legacy"}, headers=legacy)
+            assert r.status_code == 201
+
+    anyio.run(_run)
+
+
+def test_soft_deleted_user_is_rejected_immediately(app_overridden, db_session):
+    app = app_overridden
+    manager = make_auth_header(db_session, "admin@example.com", "manager")
+    viewer_user = register_user(db_session, email="gone@example.com", password="pass123", role="viewer")
+    viewer = {"Authorization": f"Bearer {create_user_access_token(viewer_user)}"}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            assert (await client.get("/risks", headers=viewer)).status_code == 200
+            assert (await client.delete(f"/users/{viewer_user.id}", headers=manager)).status_code == 204
+            assert (await client.get("/risks", headers=viewer)).status_code == 401
+
+    anyio.run(_run)
+
+
+def test_claims_tokens_never_load_the_user_row(app_overridden, db_session, test_engine):
+    app = app_overridden
+    manager = make_auth_header(db_session, "stateless@example.com", "manager")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            assert (await client.get("/risks", headers=manager)).status_code == 200
+            # Stand-in for the user cache TTL running out: authorization does not depend on it
+            user_cache.clear()
+            with user_selects(test_engine) as selects:
+                for path in ("/risks", "/action-items/", "/rbs"):
+                    assert (await client.get(path, headers=manager)).status_code == 200
+            assert selects == []
+            assert user_cache.stats()["entries"] == 0
+
+    anyio.run(_run)
+
+
+def test_version_bump_from_another_worker_applies_on_refresh(app_overridden, db_session, test_engine):
+    app = app_overridden
+    user = register_user(db_session, email="elsewhere@example.com", password="pass123", role="editor")
+    headers = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            assert (await client.get("/risks", headers=headers)).status_code == 200
+
+            # Another worker demotes the user: this worker still has the old version
+            db_session.query(User).filter(User.id == user.id).update({"role": "viewer", "token_version": User.token_version + 1})
+            db_session.commit()
+            assert (await client.get("/risks", headers=headers)).status_code == 200
+
+            token_versions.refresh(sessionmaker(bind=test_engine))
+            assert (await client.get("/risks", headers=headers)).status_code == 401
+
+    anyio.run(_run)
@@ -0,0 +1,286 @@
+import gzip
+import json
+import os
+import tempfile
+import zlib
+from typing import Generator
+
+import anyio
+import brotli
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.core.config import settings
+from app.database import Base, get_db, get_read_session_factory
+from app.services.auth import register_user, create_user_access_token
+from app.services.risk import bulk_write_risks
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    # The stream opens its own session, after the endpoint has returned
+    app.dependency_overrides[get_read_session_factory] = lambda: sessionmaker(bind=db_session.get_bind())
+    return app
+
+
+def make_user(db_session, email: str, role: str):
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    return user, {"Authorization": f"Bearer {create_user_access_token(user)}"}
+
+def asgi_get(app, path, accept_encoding=None, method="GET", headers=()):
+    """Run one request through the ASGI app and return the raw messages it sent"""
+    request_headers = [(name.encode(), value.encode()) for name, value in headers]
+    if accept_encoding is not None:
+        request_headers.append((b"accept-encoding", accept_encoding.encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": request_headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    messages = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            # Streaming responses listen for a disconnect until they finish
+            await anyio.sleep_forever()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    anyio.run(app, scope, receive, send)
+    start = messages[0]
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, [m.get("body", b"") for m in messages[1:]]
+
+
+PAYLOAD = {"rows": [{"id": i, "risk_name": f"Supplier risk {i}", "notes": "Long lead time " * 5} for i in range(200)]}
+
+
+def make_app(minimum_size=1024):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/big")
+    def big():
+        return PAYLOAD
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        def lines():
+            for i in range(5):
+                yield json.dumps({"batch": i, "pad": "x" * 500}) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(b"already" * 500), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/pdf")
+    def pdf():
+        return Response(b"%PDF-1.4" + b"0" * 5000, media_type="application/pdf")
+
+    return app
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("*", "br"),
+    ("deflate, identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_large_json_is_compressed_with_the_preferred_encoding():
+    app = make_app()
+    plain = json.dumps(PAYLOAD, separators=(",", ":")).encode()
+
+    status, headers, chunks = asgi_get(app, "/big", "gzip, br")
+    assert status == 200
+    assert headers["content-encoding"] == "br"
+    assert headers["vary"] == "Accept-Encoding"
+    body = b"".join(chunks)
+    assert int(headers["content-length"]) == len(body) < len(plain) / 4
+    assert brotli.decompress(body) == plain
+
+    status, headers, chunks = asgi_get(app, "/big", "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(b"".join(chunks)) == plain
+
+
+def test_identity_small_encoded_and_binary_responses_pass_through():
+    app = make_app()
+
+    _, headers, chunks = asgi_get(app, "/big")
+    assert "content-encoding" not in headers
+    assert json.loads(b"".join(chunks)) == PAYLOAD
+
+    _, headers, chunks = asgi_get(app, "/small", "gzip, br")
+    assert "content-encoding" not in headers
+    assert b"".join(chunks) == b'{"ok":true}'
+
+    # Not encoded a second time
+    _, headers, chunks = asgi_get(app, "/encoded", "gzip, br")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(b"".join(chunks)) == b"already" * 500
+
+    _, headers, chunks = asgi_get(app, "/pdf", "gzip, br")
+    assert "content-encoding" not in headers
+    assert b"".join(chunks).startswith(b"%PDF")
+
+    _, headers, chunks = asgi_get(app, "/big", "gzip", method="HEAD")
+    assert "content-encoding" not in headers
+
+
+def test_minimum_size_is_configurable():
+    _, headers, _ = asgi_get(make_app(minimum_size=1), "/small", "gzip")
+    assert headers["content-encoding"] == "gzip"
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_streamed_responses_are_compressed_chunk_by_chunk(encoding):
+    status, headers, chunks = asgi_get(make_app(), "/stream", encoding)
+    assert status == 200
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+
+    if encoding == "gzip":
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        decode = decoder.decompress
+    else:
+        decode = brotli.Decompressor().process
+    # Every chunk is flushed, so each batch can be decoded as soon as it arrives
+    lines = []
+    for chunk in chunks[:5]:
+        text = decode(chunk).decode()
+        assert text.endswith("\n")
+        lines.extend(text.splitlines())
+    assert [json.loads(line)["batch"] for line in lines] == [0, 1, 2, 3, 4]
+    decode(chunks[5])
+    if encoding == "gzip":
+        assert decoder.eof
+
+
+def seed(db_session, owner_id: int, count: int) -> None:
+    bulk_write_risks(
+        db_session,
+        owner_id=owner_id,
+        user_role="manager",
+        operations=[{"op": "create", "data": {"risk_name": f"Risk {i:03d}", "probability": 3, "impact": 2}} for i in range(count)],
+    )
+
+
+def get(app, path, headers, **params):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get(path, params=params, headers=headers)
+
+    return anyio.run(_run)
+
+
+def test_api_lists_and_exports_are_compressed(app_overridden, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "risk_export_batch_size", 20)
+    manager, headers = make_user(db_session, "compress@example.com", "manager")
+    seed(db_session, manager.id, 60)
+
+    r = get(app_overridden, "/risks", {**headers, "Accept-Encoding": "gzip"}, limit=60)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-encoding"] == "gzip"
+    assert len(r.json()) == 60
+    plain = get(app_overridden, "/risks", {**headers, "Accept-Encoding": "identity"}, limit=60)
+    assert "content-encoding" not in plain.headers
+    assert r.content == plain.content
+
+    # Conditional GETs still answer 304 (weak ETags hold across codings)
+    cached = get(app_overridden, "/risks", {**headers, "Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]}, limit=60)
+    assert cached.status_code == 304
+    assert "content-encoding" not in cached.headers
+
+    r = get(app_overridden, "/risks/export", {**headers, "Accept-Encoding": "br"})
+    assert r.headers["content-encoding"] == "br"
+    assert len(r.text.splitlines()) == 60
+
+
+def test_compression_can_be_disabled(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "compression_enabled", False)
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: db_session
+    manager, headers = make_user(db_session, "compress-off@example.com", "manager")
+    seed(db_session, manager.id, 30)
+
+    r = get(app, "/risks", {**headers, "Accept-Encoding": "gzip, br"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
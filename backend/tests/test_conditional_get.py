@@ -0,0 +1,226 @@
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def request(app, method, url, headers, **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.request(method, url, headers=headers, **kwargs)
+
+    return anyio.run(_run)
+
+
+def revalidate(app, url, headers, **kwargs):
+    """GET a resource, then GET it again with its ETag; returns both responses"""
+    first = request(app, "GET", url, headers, **kwargs)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    second = request(app, "GET", url, {**headers, "If-None-Match": etag}, **kwargs)
+    return first, second
+
+
+def create_risk(app, headers, name: str) -> dict:
+    r = request(app, "POST", "/risks", headers, json={"risk_name": name, "probability": 2, "impact": 3})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_risk_list_not_modified_until_a_risk_changes(app_overridden, db_session):
+    headers = make_auth_header(db_session, "etag-list@example.com", "manager")
+    risk = create_risk(app_overridden, headers, "Supplier delay")
+    create_risk(app_overridden, headers, "Budget overrun")
+
+    first, second = revalidate(app_overridden, "/risks", headers)
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["cache-control"] == "private, no-cache"
+
+    r = request(app_overridden, "PUT", f"/risks/{risk['id']}", headers, json={"impact": 5})
+    assert r.status_code == 200
+    after_update = request(app_overridden, "GET", "/risks", {**headers, "If-None-Match": first.headers["etag"]})
+    assert after_update.status_code == 200
+    assert after_update.headers["etag"] != first.headers["etag"]
+
+    r = request(app_overridden, "DELETE", f"/risks/{risk['id']}", headers)
+    assert r.status_code == 204
+    after_delete = request(app_overridden, "GET", "/risks", {**headers, "If-None-Match": after_update.headers["etag"]})
+    assert after_delete.status_code == 200
+    assert [r["risk_name"] for r in after_delete.json()] == ["Budget overrun"]
+
+
+def test_risk_list_etag_depends_on_query_and_caller(app_overridden, db_session):
+    manager = make_auth_header(db_session, "etag-manager@example.com", "manager")
+    viewer = make_auth_header(db_session, "etag-viewer@example.com", "viewer")
+    create_risk(app_overridden, manager, "Manager risk")
+
+    base = request(app_overridden, "GET", "/risks", manager).headers["etag"]
+    filtered = request(app_overridden, "GET", "/risks", manager, params={"status": "open"}).headers["etag"]
+    as_viewer = request(app_overridden, "GET", "/risks", viewer).headers["etag"]
+    assert len({base, filtered, as_viewer}) == 3
+
+    r = request(app_overridden, "GET", "/risks", {**viewer, "If-None-Match": base})
+    assert r.status_code == 200
+
+
+def test_risk_list_and_detail_change_with_action_items(app_overridden, db_session):
+    headers = make_auth_header(db_session, "etag-actions@example.com", "manager")
+    risk = create_risk(app_overridden, headers, "Vendor lock-in")
+    list_etag = request(app_overridden, "GET", "/risks", headers).headers["etag"]
+    detail, cached = revalidate(app_overridden, f"/risks/{risk['id']}", headers)
+    assert cached.status_code == 304
+
+    r = request(app_overridden, "POST", "/action-items/", headers, json={"risk_id": risk["id"], "title": "Second vendor"})
+    assert r.status_code == 201, r.text
+
+    r = request(app_overridden, "GET", "/risks", {**headers, "If-None-Match": list_etag})
+    assert r.status_code == 200
+    assert r.json()[0]["action_items_count"] == 1
+    r = request(app_overridden, "GET", f"/risks/{risk['id']}", {**headers, "If-None-Match": detail.headers["etag"]})
+    assert r.status_code == 200
+    assert r.json()["action_items_count"] == 1
+
+
+def test_if_none_match_lists_and_wildcard(app_overridden, db_session):
+    headers = make_auth_header(db_session, "etag-match@example.com", "manager")
+    risk = create_risk(app_overridden, headers, "Key staff leave")
+    etag = request(app_overridden, "GET", f"/risks/{risk['id']}", headers).headers["etag"]
+
+    r = request(app_overridden, "GET", f"/risks/{risk['id']}", {**headers, "If-None-Match": f'"other", {etag}'})
+    assert r.status_code == 304
+    r = request(app_overridden, "GET", f"/risks/{risk['id']}", {**headers, "If-None-Match": etag.removeprefix("W/")})
+    assert r.status_code == 304
+    r = request(app_overridden, "GET", f"/risks/{risk['id']}", {**headers, "If-None-Match": "*"})
+    assert r.status_code == 304
+    r = request(app_overridden, "GET", f"/risks/{risk['id']}", {**headers, "If-None-Match": '"other"'})
+    assert r.status_code == 200
+
+
+def test_owners_and_rbs_tree_not_modified(app_overridden, db_session):
+    headers = make_auth_header(db_session, "etag-tree@example.com", "manager")
+    r = request(app_overridden, "POST", "/risks", headers, json={"risk_name": "Audit finding", "risk_owner": "Dana"})
+    assert r.status_code == 201
+
+    first, second = revalidate(app_overridden, "/risks/owners", headers)
+    assert first.json() == ["Dana"]
+    assert second.status_code == 304
+
+    r = request(app_overridden, "POST", "/rbs", headers, json={"name": "Technical"})
+    assert r.status_code == 201, r.text
+    node = r.json()
+    first, second = revalidate(app_overridden, "/rbs/tree", headers)
+    assert second.status_code == 304
+
+    r = request(app_overridden, "PUT", f"/rbs/{node['id']}", headers, json={"name": "Technology"})
+    assert r.status_code == 200, r.text
+    r = request(app_overridden, "GET", "/rbs/tree", {**headers, "If-None-Match": first.headers["etag"]})
+    assert r.status_code == 200
+    assert r.json()[0]["name"] == "Technology"
+
+
+def test_action_items_not_modified(app_overridden, db_session):
+    headers = make_auth_header(db_session, "etag-items@example.com", "manager")
+    risk = create_risk(app_overridden, headers, "Late delivery")
+    r = request(app_overridden, "POST", "/action-items/", headers, json={"risk_id": risk["id"], "title": "Expedite"})
+    assert r.status_code == 201, r.text
+    item = r.json()
+
+    listed, cached = revalidate(app_overridden, "/action-items/", headers, params={"risk_id": risk["id"]})
+    assert cached.status_code == 304
+    detail, cached = revalidate(app_overridden, f"/action-items/{item['id']}", headers)
+    assert cached.status_code == 304
+
+    r = request(app_overridden, "PATCH", f"/action-items/{item['id']}/status", headers, params={"status": "completed"})
+    assert r.status_code == 200, r.text
+    r = request(app_overridden, "GET", "/action-items/", {**headers, "If-None-Match": listed.headers["etag"]}, params={"risk_id": risk["id"]})
+    assert r.status_code == 200
+    r = request(app_overridden, "GET", f"/action-items/{item['id']}", {**headers, "If-None-Match": detail.headers["etag"]})
+    assert r.status_code == 200
+    assert r.json()["status"] == "completed"
+
+
+def test_risk_list_validator_is_one_query_scoped_to_visible_risks(app_overridden, db_session):
+    editor = make_auth_header(db_session, "etag-editor@example.com", "editor")
+    other = make_auth_header(db_session, "etag-other@example.com", "editor")
+    create_risk(app_overridden, editor, "Editor risk")
+    other_risk = create_risk(app_overridden, other, "Other editor's risk")
+
+    first, second = revalidate(app_overridden, "/risks", editor)
+    assert second.status_code == 304
+    # The validator is a single aggregate; the page itself is never queried
+    assert int(second.headers["X-DB-Query-Count"]) == 1
+    assert int(first.headers["X-DB-Query-Count"]) == 2
+
+    r = request(app_overridden, "POST", "/action-items/", other, json={"risk_id": other_risk["id"], "title": "Not the editor's"})
+    assert r.status_code == 201, r.text
+    r = request(app_overridden, "GET", "/risks", {**editor, "If-None-Match": first.headers["etag"]})
+    assert r.status_code == 304
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.main import create_app
+from app.database import TimedQueuePool, get_pool_options, get_pool_status, instrument_pool, pool_stats
+from app.core.security import create_access_token
+
+
+@pytest.fixture()
+def pooled_engine() -> Generator:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    engine = instrument_pool(create_engine(
+        f"sqlite:///{db_path}",
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        connect_args={"check_same_thread": False},
+    ))
+    pool_stats.reset()
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        os.remove(db_path)
+
+
+def test_pool_options_only_apply_to_server_databases():
+    assert get_pool_options("sqlite:///./risk_platform.db") == {}
+    options = get_pool_options("postgresql+pg8000://user@localhost/db")
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_pre_ping"] is True
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle"} <= set(options)
+
+
+def test_pool_status_tracks_checkouts_and_overflow(pooled_engine):
+    held = [pooled_engine.connect() for _ in range(3)]
+    for conn in held:
+        conn.execute(text("SELECT 1"))
+
+    busy = get_pool_status(pooled_engine)
+    assert busy["pool_class"] == "TimedQueuePool"
+    assert busy["checked_out"] == 3
+    assert busy["overflow"] == 1
+    assert busy["checkouts"] == 3
+    assert busy["wait_ms"]["max"] >= 0
+
+    for conn in held:
+        conn.close()
+
+    idle = get_pool_status(pooled_engine)
+    assert idle["checked_out"] == 0
+
+
+def test_pool_endpoint_requires_auth_and_reports_stats():
+    app = create_app()
+    token = create_access_token(subject="1")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            unauthorized = await client.get("/system/pool")
+            assert unauthorized.status_code == 401
+
+            resp = await client.get("/system/pool", headers={"Authorization": f"Bearer {token}"})
+            assert resp.status_code == 200
+            body = resp.json()
+            assert "pool" in body and "wait_ms" in body["pool"]
+            assert body["settings"]["pool_size"] >= 1
+
+    anyio.run(_run)
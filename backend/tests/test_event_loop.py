@@ -0,0 +1,132 @@
+import os
+import tempfile
+import time
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.main as main_module
+from app.main import create_app
+from app.core.config import settings
+from app.database import Base, get_db
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_slow_query_does_not_stall_other_requests(app_overridden, db_session, test_engine):
+    app = app_overridden
+    headers = make_auth_header(db_session, "slow@example.com", "viewer")
+    stalled = []
+
+    def slow_action_items(conn, cursor, statement, parameters, context, executemany):
+        # A blocking driver call, like a slow query against a busy database
+        if "FROM action_items" in statement and not stalled:
+            stalled.append(statement)
+            time.sleep(1.0)
+
+    event.listen(test_engine, "before_cursor_execute", slow_action_items)
+    finished = {}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            started = time.perf_counter()
+
+            async def slow():
+                r = await client.get("/action-items/", headers=headers)
+                assert r.status_code == 200, r.text
+                finished["slow"] = time.perf_counter() - started
+
+            async def health():
+                await anyio.sleep(0.2)  # the slow query is under way
+                r = await client.get("/health")
+                assert r.status_code == 200
+                finished["health"] = time.perf_counter() - started
+
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(slow)
+                tg.start_soon(health)
+
+    try:
+        anyio.run(_run)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", slow_action_items)
+
+    assert stalled
+    assert finished["slow"] >= 1.0
+    # Answered while the query was still running, not after it
+    assert finished["health"] < 0.7
+
+
+def test_threadpool_size_sets_the_anyio_limiter(monkeypatch):
+    monkeypatch.setattr(settings, "threadpool_size", 7)
+    # Keep the startup refresh loop off the real database
+    monkeypatch.setattr(main_module, "refresh_revocations_safely", lambda session_factory: None)
+    app = create_app()
+
+    async def _run():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        assert limiter.total_tokens == 40
+        async with app.router.lifespan_context(app):
+            assert limiter.total_tokens == 7
+
+    anyio.run(_run)
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import AuditLog, Risk, User
+from app.services.audit import get_audit_logs
+from app.services.pagination import InvalidCursor, decode_cursor, encode_cursor, next_cursor
+from app.services.risk import list_risks
+
+
+@pytest.fixture()
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    session.add(User(id=1, email="pages@example.com", hashed_password="x", role="manager"))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def walk(fetch, limit, key):
+    rows, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        rows.extend(page)
+        cursor = next_cursor(page, limit, key)
+        if cursor is None:
+            return rows
+
+
+def test_cursor_round_trip():
+    when = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor("created_at", when, 9), "created_at") == (when, 9)
+    assert decode_cursor(encode_cursor("score", None, 3), "score") == (None, 3)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("score", 4, 3), "created_at")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("%%%", "score")
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_risk_pages_cover_ties_and_nulls(db_session, order):
+    # Several equal scores plus unscored (NULL) risks straddle page boundaries
+    values = [(1, 4), (2, 2), (4, 1), None, (5, 5), (2, 2), None, (3, 3), (1, 1), None]
+    for n, pi in enumerate(values):
+        p, i = pi if pi else (None, None)
+        db_session.add(Risk(risk_name=f"r{n}", owner_id=1, probability=p, impact=i))
+    db_session.commit()
+
+    expected = list_risks(db_session, owner_id=1, sort_by="score", order=order, limit=100, user_role="manager")
+    paged = walk(
+        lambda cursor: list_risks(
+            db_session, owner_id=1, sort_by="score", order=order, limit=3, cursor=cursor, user_role="manager"
+        ),
+        3,
+        "score",
+    )
+    assert [r.id for r in paged] == [r.id for r in expected]
+
+
+def test_audit_pages_are_stable_under_inserts(db_session):
+    stamp = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    for n in range(7):
+        db_session.add(AuditLog(entity_type="risk", entity_id=n, user_id=1, action="update", timestamp=stamp))
+    db_session.commit()
+
+    first = get_audit_logs(db_session, limit=4)
+    # A newer entry arriving mid-walk must not shift the next page
+    db_session.add(AuditLog(entity_type="risk", entity_id=99, user_id=1, action="create"))
+    db_session.commit()
+    second = get_audit_logs(db_session, limit=4, cursor=next_cursor(first, 4, "timestamp"))
+
+    assert len(first) == 4 and len(second) == 3
+    assert {log.id for log in first}.isdisjoint({log.id for log in second})
+    assert 99 not in {log.entity_id for log in first + second}
@@ -0,0 +1,191 @@
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Generator, Optional
+
+import anyio
+import httpx
+import pytest
+from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.core.responses import json_list_response
+from app.database import Base, get_db
+from app.models import ActionItem, AuditLog, Risk, Snapshot
+from app.schemas.action_item import ActionItem as ActionItemSchema
+from app.schemas.audit import AuditLogRead
+from app.schemas.risk import RiskRead
+from app.schemas.snapshot import Snapshot as SnapshotSchema
+from app.services.auth import register_user, create_user_access_token
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+    note: Optional[str] = None
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def request(app, method, url, headers, **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.request(method, url, headers=headers, **kwargs)
+
+    return anyio.run(_run)
+
+
+def default_body(schema, items) -> bytes:
+    """What FastAPI sends for `items` through response_model=list[schema]"""
+    field = create_response_field(name="Response", type_=list[schema])
+
+    async def _run():
+        return await serialize_response(field=field, response_content=items, is_coroutine=True)
+
+    return JSONResponse(anyio.run(_run)).body
+
+
+def seed(app, headers):
+    for i, name in enumerate(["Fournisseur unique", "Überlastung – Q3", "Vendor \"lock-in\""]):
+        r = request(app, "POST", "/risks", headers, json={
+            "risk_name": name,
+            "risk_description": "Line one\nLine two",
+            "probability": i + 1,
+            "impact": 4,
+            "risk_owner": "Zoë",
+            "latest_reviewed_date": "2024-03-01T09:30:00+02:00",
+        })
+        assert r.status_code == 201, r.text
+        r = request(app, "POST", "/action-items/", headers, json={
+            "risk_id": r.json()["id"],
+            "title": f"Mitigate {name}",
+            "due_date": "2024-06-30T17:00:00Z",
+            "progress_percentage": 10 * i,
+        })
+        assert r.status_code == 201, r.text
+
+
+def test_risk_list_bytes_match_response_model(app_overridden, db_session):
+    headers = make_auth_header(db_session, "serialize-risks@example.com", "manager")
+    seed(app_overridden, headers)
+
+    r = request(app_overridden, "GET", "/risks", headers, params={"limit": 2})
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/json"
+    # Headers set on the injected response survive
+    assert "x-next-cursor" in r.headers
+    assert "etag" in r.headers
+
+    ids = [row["id"] for row in r.json()]
+    risks = {risk.id: risk for risk in db_session.scalars(select(Risk).where(Risk.id.in_(ids)))}
+    assert r.content == default_body(RiskRead, [risks[i] for i in ids])
+    assert "Zoë" in r.content.decode("utf-8")
+
+
+def test_action_item_and_snapshot_lists_match_response_model(app_overridden, db_session):
+    headers = make_auth_header(db_session, "serialize-items@example.com", "manager")
+    seed(app_overridden, headers)
+    user_id = db_session.scalar(select(Risk.owner_id))
+    db_session.add(Snapshot(name="Baseline é", risk_data={"risks": [{"risk_name": "Zoë"}]}, created_by=user_id))
+    db_session.commit()
+
+    r = request(app_overridden, "GET", "/action-items/", headers)
+    assert r.status_code == 200, r.text
+    items = {item.id: item for item in db_session.scalars(select(ActionItem))}
+    assert r.content == default_body(ActionItemSchema, [items[row["id"]] for row in r.json()])
+
+    r = request(app_overridden, "GET", "/snapshots/", headers)
+    assert r.status_code == 200, r.text
+    snapshots = {snapshot.id: snapshot for snapshot in db_session.scalars(select(Snapshot))}
+    assert r.content == default_body(SnapshotSchema, [snapshots[row["id"]] for row in r.json()])
+
+
+def test_audit_log_list_matches_response_model(app_overridden, db_session):
+    headers = make_auth_header(db_session, "serialize-audit@example.com", "manager")
+    seed(app_overridden, headers)
+
+    r = request(app_overridden, "GET", "/audit/logs", headers)
+    assert r.status_code == 200, r.text
+    rows = r.json()
+    assert rows and rows[0]["user_email"] == "serialize-audit@example.com"
+
+    logs = {log.id: log for log in db_session.scalars(select(AuditLog))}
+    expected = [
+        AuditLogRead.model_validate(logs[row["id"]]).model_copy(update={"user_email": logs[row["id"]].user.email})
+        for row in rows
+    ]
+    assert r.content == default_body(AuditLogRead, expected)
+
+
+def test_json_list_response_applies_dump_options():
+    rows = [{"id": 1, "name": "Zoë", "created_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}]
+    response = json_list_response(Row, rows, exclude_none=True)
+    assert response.body == '[{"id":1,"name":"Zoë","created_at":"2024-01-02T03:04:05Z"}]'.encode("utf-8")
+
+
+def test_openapi_still_documents_list_schemas(app_overridden):
+    spec = app_overridden.openapi()
+    schema = spec["paths"]["/risks"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"]["$ref"].endswith("/RiskRead")
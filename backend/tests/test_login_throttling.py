@@ -0,0 +1,190 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.core.hashing import PasswordHasher, PasswordHasherBusy
+from app.core.config import settings
+from app.core.throttle import SlidingWindowLimiter, client_ip
+from app.routers import auth as auth_router
+from app.services import auth as auth_service
+from app.services.auth import register_user
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def login(client: httpx.AsyncClient, email: str, password: str):
+    return client.post("/auth/login", data={"username": email, "password": password})
+
+
+def test_sliding_window_limiter():
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=0.1)
+    assert limiter.hit("a") is None
+    assert limiter.hit("a") is None
+    assert 0 < limiter.hit("a") <= 0.1
+    assert limiter.retry_after("b") is None
+    time.sleep(0.11)
+    assert limiter.hit("a") is None
+
+
+def test_hasher_rejects_work_beyond_queue_limit():
+    hasher = PasswordHasher(workers=1, queue_limit=1)
+    gate = threading.Event()
+    running = hasher.submit(gate.wait)
+    queued = hasher.submit(gate.wait)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher.submit(gate.wait)
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        gate.set()
+    running.result(timeout=5)
+    queued.result(timeout=5)
+    assert hasher.stats()["pending"] == 0
+    hasher.submit(lambda: None).result(timeout=5)
+
+
+def test_account_locked_after_repeated_failures(app_overridden, db_session, monkeypatch):
+    app = app_overridden
+    register_user(db_session, email="target@example.com", password="right-pass", role="viewer")
+    register_user(db_session, email="bystander@example.com", password="other-pass", role="viewer")
+    monkeypatch.setattr(auth_router, "login_account_limiter", SlidingWindowLimiter(limit=2, window_seconds=60))
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            assert (await login(client, "target@example.com", "right-pass")).status_code == 200
+            assert (await login(client, "target@example.com", "wrong")).status_code == 401
+            assert (await login(client, "target@example.com", "wrong")).status_code == 401
+
+            # Locked out even with the right password, until the window passes
+            r = await login(client, "Target@example.com", "right-pass")
+            assert r.status_code == 429
+            assert int(r.headers["Retry-After"]) > 0
+
+            assert (await login(client, "bystander@example.com", "other-pass")).status_code == 200
+
+    anyio.run(_run)
+
+
+def test_ip_limited_across_accounts(app_overridden, monkeypatch):
+    app = app_overridden
+    monkeypatch.setattr(auth_router, "login_ip_limiter", SlidingWindowLimiter(limit=3, window_seconds=60))
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            for n in range(3):
+                assert (await login(client, f"nobody{n}@example.com", "x")).status_code == 401
+            assert (await login(client, "nobody9@example.com", "x")).status_code == 429
+
+    anyio.run(_run)
+
+
+def test_client_ip_only_believes_trusted_proxies():
+    # Direct connection: a forged header is ignored
+    assert client_ip("203.0.113.9", "198.51.100.1", "") == "203.0.113.9"
+    assert client_ip("203.0.113.9", "198.51.100.1", "10.0.0.0/8") == "203.0.113.9"
+    # Through our proxy chain: the first hop from the right that is not ours
+    assert client_ip("10.0.0.5", "1.2.3.4, 198.51.100.1, 10.0.0.7", "10.0.0.0/8") == "198.51.100.1"
+    # Platform router: trust the hop it appended
+    assert client_ip("10.1.2.3", "1.2.3.4, 198.51.100.1", "*") == "198.51.100.1"
+    assert client_ip("10.1.2.3", None, "*") == "10.1.2.3"
+
+
+def test_ip_limit_is_per_forwarded_client_behind_a_proxy(app_overridden, monkeypatch):
+    app = app_overridden
+    monkeypatch.setattr(auth_router, "login_ip_limiter", SlidingWindowLimiter(limit=2, window_seconds=60))
+    # httpx's ASGI transport connects from 127.0.0.1, standing in for the proxy
+    monkeypatch.setattr(settings, "trusted_proxies", "127.0.0.1")
+
+    def login_from(client, ip, n):
+        return client.post(
+            "/auth/login",
+            data={"username": f"nobody{n}@example.com", "password": "x"},
+            headers={"X-Forwarded-For": ip},
+        )
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            for n in range(2):
+                assert (await login_from(client, "198.51.100.1", n)).status_code == 401
+            assert (await login_from(client, "198.51.100.1", 3)).status_code == 429
+            # Another client behind the same proxy is not locked out
+            assert (await login_from(client, "198.51.100.2", 4)).status_code == 401
+
+    anyio.run(_run)
+
+
+def test_login_sheds_load_when_hashing_queue_is_full(app_overridden, db_session, monkeypatch):
+    app = app_overridden
+    register_user(db_session, email="busy@example.com", password="pass123", role="viewer")
+
+    async def busy(*args):
+        raise PasswordHasherBusy("Password hashing queue is full")
+
+    monkeypatch.setattr(auth_service.password_hasher, "verify_async", busy)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            r = await login(client, "busy@example.com", "pass123")
+            assert r.status_code == 503
+            assert r.headers["Retry-After"] == "1"
+
+    anyio.run(_run)
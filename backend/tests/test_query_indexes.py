@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User
+from app.services.action_items import ActionItemService
+from app.services.audit import get_audit_logs
+from app.services.risk import list_risks
+
+
+@pytest.fixture()
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    session.add(User(id=1, email="plan@example.com", hashed_password="x", role="editor"))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@contextmanager
+def captured_selects(session):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(session, fn) -> str:
+    """Run fn, then EXPLAIN QUERY PLAN the first SELECT it issued"""
+    with captured_selects(session) as statements:
+        fn()
+    statement, parameters = statements[0]
+    raw = session.connection().connection.dbapi_connection
+    rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_owner_status_listing_uses_composite_index(db_session):
+    plan = query_plan(db_session, lambda: list_risks(db_session, owner_id=1, status="mitigated", user_role="editor"))
+    assert "ix_risks_owner_status_created" in plan
+    assert "TEMP B-TREE" not in plan  # sort served by the index
+
+
+def test_open_risks_listing_is_index_served(db_session):
+    plan = query_plan(db_session, lambda: list_risks(db_session, owner_id=1, status="open", user_role="manager"))
+    assert "ix_risks_open_created" in plan or "ix_risks_status_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_rbs_listing_uses_composite_index(db_session):
+    plan = query_plan(db_session, lambda: list_risks(db_session, owner_id=1, rbs_node_id=3, user_role="manager"))
+    assert "ix_risks_rbs_node_created" in plan
+
+
+def test_audit_entity_filter_uses_composite_index(db_session):
+    plan = query_plan(db_session, lambda: get_audit_logs(db_session, entity_type="risk", entity_id=5))
+    assert "ix_audit_logs_entity_timestamp" in plan
+
+
+def test_overdue_action_items_are_index_served(db_session):
+    plan = query_plan(db_session, lambda: ActionItemService(db_session).get_overdue_action_items())
+    assert "ix_action_items_open_due_date" in plan or "ix_action_items_status_due_date" in plan
+
+
+def test_score_sort_uses_score_index(db_session):
+    plan = query_plan(db_session, lambda: list_risks(db_session, owner_id=1, sort_by="score", user_role="manager"))
+    assert "ix_risks_score" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.core.security import create_access_token
+from app.database import ReplicaStickiness, get_read_db, get_writer_key
+
+
+def make_request(token: str | None = None) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 5000)})
+
+
+@pytest.fixture()
+def replica_factory(monkeypatch):
+    engine = create_engine("sqlite://")
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "get_read_session_local", lambda: factory)
+    monkeypatch.setattr(database, "replica_stickiness", ReplicaStickiness(window_seconds=60))
+    try:
+        yield factory
+    finally:
+        engine.dispose()
+
+
+def test_stickiness_expires_after_window():
+    sticky = ReplicaStickiness(window_seconds=0.05)
+    sticky.mark("user:1")
+    assert sticky.is_sticky("user:1")
+    assert not sticky.is_sticky("user:2")
+    time.sleep(0.06)
+    assert not sticky.is_sticky("user:1")
+
+
+def test_writer_key_prefers_token_subject():
+    assert get_writer_key(make_request(create_access_token(subject="42"))) == "user:42"
+    assert get_writer_key(make_request()) == "host:10.0.0.1"
+    assert get_writer_key(None) is None
+
+
+def test_read_db_uses_replica_unless_caller_wrote_recently(replica_factory):
+    primary = object()
+    request = make_request(create_access_token(subject="7"))
+
+    gen = get_read_db(request, db=primary)
+    session = next(gen)
+    assert session is not primary
+    assert session.get_bind() is replica_factory.kw["bind"]
+    gen.close()
+
+    database.replica_stickiness.mark("user:7")
+    gen = get_read_db(request, db=primary)
+    assert next(gen) is primary
+    gen.close()
+
+    # Other users are unaffected by user 7's write
+    other = make_request(create_access_token(subject="8"))
+    gen = get_read_db(other, db=primary)
+    assert next(gen) is not primary
+    gen.close()
+
+
+def test_read_db_falls_back_to_primary_without_replica(monkeypatch):
+    monkeypatch.setattr(database, "get_read_session_local", lambda: None)
+    primary = object()
+    gen = get_read_db(make_request(), db=primary)
+    assert next(gen) is primary
+    gen.close()
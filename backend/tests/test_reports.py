@@ -0,0 +1,189 @@
+import io
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from docx import Document
+from openpyxl import load_workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db, get_session_factory
+from app.services.auth import register_user, create_user_access_token
+from app.core.config import settings
+from app.core.jobs import job_registry
+from app.services.risk import bulk_write_risks
+from app.services.risk_export import CSV_COLUMNS
+from app.services.risk_import import import_risk_rows, iter_xlsx_rows
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    # Report jobs open their own session
+    app.dependency_overrides[get_session_factory] = lambda: sessionmaker(bind=db_session.get_bind())
+    return app
+
+
+def make_user(db_session, email: str, role: str):
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    return user, {"Authorization": f"Bearer {create_user_access_token(user)}"}
+
+
+def seed(db_session, owner_id: int, count: int, **data) -> list[int]:
+    result = bulk_write_risks(
+        db_session,
+        owner_id=owner_id,
+        user_role="manager",
+        operations=[{"op": "create", "data": {"risk_name": f"Risk {i:03d}", "probability": 1 + i % 5, "impact": 2, **data}} for i in range(count)],
+    )
+    return [item["id"] for item in result["results"]]
+
+
+def call(app, method, url, headers, **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.request(method, url, headers=headers, **kwargs)
+
+    return anyio.run(_run)
+
+
+def render(app, headers, **params) -> tuple[dict, httpx.Response]:
+    """Start a report, then fetch its job and file (background tasks finish with the response)"""
+    r = call(app, "POST", "/reports", headers, params=params)
+    assert r.status_code == 202, r.text
+    job = call(app, "GET", f"/reports/{r.json()['id']}", headers).json()
+    return job, call(app, "GET", f"/reports/{job['id']}/download", headers)
+
+
+def test_xlsx_report_lists_every_risk_and_round_trips(app_overridden, db_session, tmp_path):
+    manager, headers = make_user(db_session, "report-xlsx@example.com", "manager")
+    seed(db_session, manager.id, 120)
+
+    job, r = render(app_overridden, headers, format="xlsx", sort_by="risk_name", order="asc")
+    assert job["status"] == "completed", job
+    assert job["result"]["rows"] == 120
+    assert job["result"]["truncated"] is False
+    assert job["progress"] == {"rows": 120, "total": 120}
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    assert 'filename="risk-register-' in r.headers["content-disposition"]
+
+    workbook = load_workbook(io.BytesIO(r.content), read_only=True)
+    assert workbook.sheetnames == ["Risks"]
+    rows = list(workbook["Risks"].iter_rows(values_only=True))
+    assert list(rows[0]) == [header for header, _ in CSV_COLUMNS]
+    assert len(rows) == 121
+    assert rows[1][rows[0].index("Risk Name")] == "Risk 000"
+    workbook.close()
+
+    path = tmp_path / "report.xlsx"
+    path.write_bytes(r.content)
+
+    # The workbook is a valid import file
+    result = import_risk_rows(db_session, iter_xlsx_rows(str(path)), owner_id=manager.id, user_role="manager")
+    assert result["skipped"] == 120
+
+
+def test_pdf_report_is_capped_with_a_note(app_overridden, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "report_document_max_rows", 50)
+    manager, headers = make_user(db_session, "report-pdf@example.com", "manager")
+    seed(db_session, manager.id, 80)
+
+    job, r = render(app_overridden, headers, format="pdf", title="Quarterly review")
+    assert job["result"]["rows"] == 50
+    assert job["result"]["total"] == 80
+    assert job["result"]["truncated"] is True
+    assert r.headers["content-type"] == "application/pdf"
+    assert r.content.startswith(b"%PDF")
+    assert 'filename="quarterly-review-' in r.headers["content-disposition"]
+
+
+def test_docx_report_applies_filters_and_visibility(app_overridden, db_session):
+    manager, _ = make_user(db_session, "report-manager@example.com", "manager")
+    editor, headers = make_user(db_session, "report-editor@example.com", "editor")
+    seed(db_session, manager.id, 5)
+    seed(db_session, editor.id, 4, status="closed")
+    seed(db_session, editor.id, 2)
+
+    job, r = render(app_overridden, headers, format="docx", status="closed")
+    assert job["result"]["rows"] == 4
+    document = Document(io.BytesIO(r.content))
+    table = document.tables[0]
+    assert [cell.text for cell in table.rows[0].cells][:2] == ["Risk", "Probability"]
+    assert len(table.rows) == 5
+    assert {row.cells[5].text for row in table.rows[1:]} == {"closed"}
+
+
+def test_report_access_and_cleanup(app_overridden, db_session):
+    manager, manager_headers = make_user(db_session, "report-owner@example.com", "manager")
+    editor, editor_headers = make_user(db_session, "report-other@example.com", "editor")
+    viewer, viewer_headers = make_user(db_session, "report-viewer@example.com", "viewer")
+    seed(db_session, editor.id, 3)
+
+    job, r = render(app_overridden, editor_headers, format="xlsx")
+    assert r.status_code == 200
+    # Managers may fetch anyone's report; viewers cannot export at all
+    assert call(app_overridden, "GET", f"/reports/{job['id']}/download", manager_headers).status_code == 200
+    assert call(app_overridden, "POST", "/reports", viewer_headers, params={"format": "pdf"}).status_code == 403
+
+    pending = job_registry.create("risk_report", owner_id=editor.id)
+    r = call(app_overridden, "GET", f"/reports/{pending.id}/download", editor_headers)
+    assert r.status_code == 409
+    imported = job_registry.create("risk_import", owner_id=editor.id)
+    assert call(app_overridden, "GET", f"/reports/{imported.id}", editor_headers).status_code == 404
+
+    path = job_registry.get(job["id"]).artifact
+    assert os.path.exists(path)
+    job_registry.clear()
+    assert not os.path.exists(path)
+    assert call(app_overridden, "GET", f"/reports/{job['id']}/download", editor_headers).status_code == 404
@@ -0,0 +1,146 @@
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.models.action_item import ActionItem
+from app.services.auth import register_user, create_user_access_token
+from app.services.risk import bulk_write_risks
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def request(app, method, url, headers, **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.request(method, url, headers=headers, **kwargs)
+
+    return anyio.run(_run)
+
+
+def capture_statements(engine, fn):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return result, statements
+
+
+def seed_risks_with_items(db_session, owner_id: int, count: int) -> list[int]:
+    result = bulk_write_risks(
+        db_session,
+        owner_id=owner_id,
+        user_role="manager",
+        operations=[{"op": "create", "data": {"risk_name": f"Risk {i}"}} for i in range(count)],
+    )
+    risk_ids = [item["id"] for item in result["results"]]
+    # Risk i gets i % 4 action items
+    for i, risk_id in enumerate(risk_ids):
+        for n in range(i % 4):
+            db_session.add(ActionItem(risk_id=risk_id, title=f"Action {n}", created_by=owner_id))
+    db_session.commit()
+    return risk_ids
+
+
+def test_page_of_200_risks_loads_counts_in_one_select(app_overridden, db_session):
+    user = register_user(db_session, email="counts@example.com", password="pass123", role="manager")
+    headers = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+    risk_ids = seed_risks_with_items(db_session, user.id, 200)
+    db_session.expire_all()
+
+    r, statements = capture_statements(
+        db_session.get_bind(),
+        lambda: request(app_overridden, "GET", "/risks", headers, params={"limit": 200, "sort_by": "risk_name", "order": "asc"}),
+    )
+    assert r.status_code == 200, r.text
+    counts = {row["id"]: row["action_items_count"] for row in r.json()}
+    assert counts == {risk_id: i % 4 for i, risk_id in enumerate(risk_ids)}
+
+    risk_selects = [s for s in statements if s.lstrip().startswith("SELECT risks.")]
+    assert len(risk_selects) == 1
+    assert "count(action_items.id)" in risk_selects[0]
+    # Action items are only read joined to risks (the page and the ETag validator), never per risk
+    item_selects = [s for s in statements if s.lstrip().startswith("SELECT") and "FROM action_items" in s and "risks" not in s]
+    assert item_selects == []
+
+
+def test_detail_and_sparse_fields_include_count(app_overridden, db_session):
+    user = register_user(db_session, email="counts-detail@example.com", password="pass123", role="manager")
+    headers = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+    risk_ids = seed_risks_with_items(db_session, user.id, 4)
+
+    r = request(app_overridden, "GET", f"/risks/{risk_ids[3]}", headers)
+    assert r.json()["action_items_count"] == 3
+
+    r = request(app_overridden, "POST", "/action-items/", headers, json={"risk_id": risk_ids[0], "title": "New"})
+    assert r.status_code == 201, r.text
+    r = request(app_overridden, "GET", "/risks", headers, params={"fields": "action_items_count", "sort_by": "risk_name", "order": "asc"})
+    assert [row["action_items_count"] for row in r.json()] == [1, 1, 2, 3]
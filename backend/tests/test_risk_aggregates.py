@@ -0,0 +1,165 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.models import Risk, RiskAggregate
+from app.services import risk_aggregates
+from app.services.auth import register_user, create_user_access_token
+from app.services.risk import bulk_write_risks, create_risk, delete_risk, update_risk
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def risk_table_selects(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM risks" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def cells(db_session) -> dict:
+    return {
+        (cell.status, cell.probability, cell.impact, cell.rbs_node_id): cell.risk_count
+        for cell in db_session.query(RiskAggregate).all()
+    }
+
+
+def test_single_risk_writes_keep_counts_in_step(db_session):
+    owner = register_user(db_session, email="agg@example.com", password="pass123", role="editor")
+
+    first = create_risk(db_session, owner.id, risk_name="Flood", probability=2, impact=3)
+    create_risk(db_session, owner.id, risk_name="Fire", probability=2, impact=3)
+    create_risk(db_session, owner.id, risk_name="Unrated", probability=None, impact=None)
+    assert cells(db_session) == {("open", 2, 3, 0): 2, ("open", 0, 0, 0): 1}
+
+    update_risk(db_session, owner.id, first.id, user_role="editor", status="mitigated", impact=5)
+    assert cells(db_session) == {("open", 2, 3, 0): 1, ("mitigated", 2, 5, 0): 1, ("open", 0, 0, 0): 1}
+
+    # Edits that don't move a risk between cells leave the table alone
+    update_risk(db_session, owner.id, first.id, user_role="editor", notes="checked")
+    assert delete_risk(db_session, owner.id, first.id, user_role="editor")
+    assert cells(db_session) == {("open", 2, 3, 0): 1, ("open", 0, 0, 0): 1}
+    assert risk_aggregates.check(db_session) == []
+
+
+def test_bulk_writes_keep_counts_in_step(db_session):
+    owner = register_user(db_session, email="agg-bulk@example.com", password="pass123", role="editor")
+    created = bulk_write_risks(db_session, owner.id, "editor", [
+        {"op": "create", "data": {"risk_name": f"R{i}", "probability": 1 + i % 5, "impact": 4}} for i in range(20)
+    ])
+    ids = [result["id"] for result in created["results"]]
+
+    bulk_write_risks(db_session, owner.id, "editor", [
+        {"op": "update", "id": ids[0], "data": {"probability": None}},
+        {"op": "update", "id": ids[1], "data": {"status": "closed"}},
+        {"op": "delete", "id": ids[2]},
+    ])
+    assert risk_aggregates.check(db_session) == []
+    assert sum(cells(db_session).values()) == 19
+
+
+def test_stats_are_served_from_the_aggregate_table(app_overridden, db_session, test_engine):
+    app = app_overridden
+    headers = make_auth_header(db_session, "agg-stats@example.com", "manager")
+    bulk_write_risks(db_session, 1, "manager", [
+        {"op": "create", "data": {"risk_name": f"S{i}", "probability": 5, "impact": 5, "rbs_node_id": None}} for i in range(60)
+    ])
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get("/risks/stats", params={"include_owners": "false"}, headers=headers)
+
+    with risk_table_selects(test_engine) as statements:
+        r = anyio.run(_run)
+    assert r.status_code == 200
+    assert r.json()["total"] == 60
+    assert r.json()["by_owner"] is None
+    assert statements == []
+
+
+def test_check_reports_drift_and_rebuild_repairs_it(db_session):
+    owner = register_user(db_session, email="agg-drift@example.com", password="pass123", role="editor")
+    risk = create_risk(db_session, owner.id, risk_name="Drifter", probability=3, impact=3)
+
+    # A write that bypasses the service layer
+    db_session.execute(update(Risk).where(Risk.id == risk.id).values(status="closed"))
+    db_session.commit()
+    drift = risk_aggregates.check(db_session)
+    assert {(cell["status"], cell["expected"], cell["stored"]) for cell in drift} == {("open", 0, 1), ("closed", 1, 0)}
+
+    assert risk_aggregates.rebuild(db_session) == 1
+    db_session.commit()
+    assert risk_aggregates.check(db_session) == []
+    assert cells(db_session) == {("closed", 3, 3, 0): 1}
@@ -0,0 +1,217 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.models import AuditLog, Risk
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def captured_inserts(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def post_bulk(app, headers, operations, **extra):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.post("/risks/bulk", json={"operations": operations, **extra}, headers=headers)
+
+    return anyio.run(_run)
+
+
+def test_bulk_mixed_operations_report_per_item_results(app_overridden, db_session):
+    app = app_overridden
+    editor = make_auth_header(db_session, "bulk-editor@example.com", "editor")
+    other = make_auth_header(db_session, "bulk-other@example.com", "editor")
+
+    seed = post_bulk(app, editor, [
+        {"op": "create", "data": {"risk_name": "Keep me", "probability": 2, "impact": 2}},
+        {"op": "create", "data": {"risk_name": "Remove me"}},
+    ]).json()
+    keep_id, remove_id = (result["id"] for result in seed["results"])
+    foreign_id = post_bulk(app, other, [{"op": "create", "data": {"risk_name": "Not yours"}}]).json()["results"][0]["id"]
+
+    r = post_bulk(app, editor, [
+        {"op": "create", "data": {"risk_name": "New one", "probability": 4, "impact": 5}},
+        {"op": "create", "data": {"risk_name": "Bad", "probability": 9}},
+        {"op": "update", "id": keep_id, "data": {"probability": 5, "status": "mitigated"}},
+        {"op": "delete", "id": remove_id},
+        {"op": "delete", "id": 999999},
+        {"op": "update", "id": foreign_id, "data": {"notes": "hijack"}},
+        {"op": "rename", "id": keep_id},
+    ])
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["created"], body["updated"], body["deleted"], body["failed"]) == (1, 1, 1, 4)
+    statuses = [result["status"] for result in body["results"]]
+    assert statuses == ["created", "error", "updated", "deleted", "error", "error", "error"]
+    assert body["results"][1]["error"].startswith("data.probability")
+    assert body["results"][4]["error"] == "Risk not found"
+    assert body["results"][5]["error"] == "Risk not found"
+
+    db_session.expire_all()
+    created = db_session.get(Risk, body["results"][0]["id"])
+    assert (created.score, created.risk_level) == (20, "Critical")
+    kept = db_session.get(Risk, keep_id)
+    assert (kept.probability, kept.score, kept.status) == (5, 10, "mitigated")
+    assert db_session.get(Risk, remove_id) is None
+    assert db_session.get(Risk, foreign_id).notes is None
+
+    update_log = db_session.query(AuditLog).filter_by(entity_id=keep_id, action="update").one()
+    assert update_log.changes["probability"] == {"old": 2, "new": 5}
+    assert db_session.query(AuditLog).filter_by(entity_id=remove_id, action="delete").count() == 1
+
+
+def test_null_for_required_column_fails_only_that_update(app_overridden, db_session):
+    app = app_overridden
+    editor = make_auth_header(db_session, "bulk-null@example.com", "editor")
+    seed = post_bulk(app, editor, [
+        {"op": "create", "data": {"risk_name": "Nulled"}},
+        {"op": "create", "data": {"risk_name": "Edited"}},
+        {"op": "create", "data": {"risk_name": "Deleted"}},
+        {"op": "create", "data": {"risk_name": "Unnamed"}},
+    ]).json()
+    nulled_id, edited_id, deleted_id, unnamed_id = (result["id"] for result in seed["results"])
+
+    r = post_bulk(app, editor, [
+        {"op": "update", "id": nulled_id, "data": {"status": None, "notes": "lost"}},
+        {"op": "create", "data": {"risk_name": "Added"}},
+        {"op": "update", "id": edited_id, "data": {"status": "closed", "notes": None}},
+        {"op": "delete", "id": deleted_id},
+        {"op": "update", "id": unnamed_id, "data": {"risk_name": None}},
+    ])
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [result["status"] for result in body["results"]] == ["error", "created", "updated", "deleted", "error"]
+    assert body["results"][0]["error"] == "status cannot be null"
+    assert body["results"][4]["error"] == "risk_name cannot be null"
+
+    db_session.expire_all()
+    assert (db_session.get(Risk, nulled_id).status, db_session.get(Risk, nulled_id).notes) == ("open", None)
+    assert db_session.get(Risk, edited_id).status == "closed"
+    assert db_session.get(Risk, deleted_id) is None
+    assert db_session.get(Risk, unnamed_id).risk_name == "Unnamed"
+    assert db_session.query(Risk).filter_by(risk_name="Added").count() == 1
+
+
+def test_atomic_batch_writes_nothing_when_an_item_fails(app_overridden, db_session):
+    app = app_overridden
+    editor = make_auth_header(db_session, "atomic@example.com", "editor")
+
+    r = post_bulk(app, editor, [
+        {"op": "create", "data": {"risk_name": "Would be created"}},
+        {"op": "update", "id": 424242, "data": {"notes": "missing"}},
+    ], atomic=True)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["created"] == 0 and body["failed"] == 2
+    assert db_session.query(Risk).count() == 0
+
+
+def test_viewer_cannot_write_through_bulk(app_overridden, db_session):
+    app = app_overridden
+    viewer = make_auth_header(db_session, "bulk-viewer@example.com", "viewer")
+
+    body = post_bulk(app, viewer, [{"op": "create", "data": {"risk_name": "Nope"}}]).json()
+    assert body["failed"] == 1
+    assert "create_risks" in body["results"][0]["error"]
+    assert db_session.query(Risk).count() == 0
+
+
+def test_bulk_create_uses_batched_statements(app_overridden, db_session, test_engine):
+    app = app_overridden
+    editor = make_auth_header(db_session, "batched@example.com", "editor")
+    operations = [{"op": "create", "data": {"risk_name": f"Imported {i}", "probability": 3, "impact": 3}} for i in range(300)]
+
+    with captured_inserts(test_engine) as statements:
+        body = post_bulk(app, editor, operations).json()
+    assert body["created"] == 300
+    # The dashboard counts and the audit rows go in one INSERT each, not 300
+    # round trips; risk rows too on Postgres (SQLite inserts them one by one to
+    # return ids in order)
+    assert sum("INSERT INTO audit_logs" in statement for statement in statements) == 1
+    assert sum("INSERT INTO risk_aggregates" in statement for statement in statements) == 1
+    ids = [result["id"] for result in body["results"]]
+    assert len(set(ids)) == 300
+    # Every result (and its audit row) points at the risk created from that operation
+    names = dict(db_session.query(Risk.id, Risk.risk_name))
+    assert [names[risk_id] for risk_id in ids] == [f"Imported {i}" for i in range(300)]
+    audited = dict(db_session.query(AuditLog.entity_id, AuditLog.description).filter_by(action="create"))
+    assert [audited[risk_id] for risk_id in ids] == [f"Risk 'Imported {i}' created" for i in range(300)]
+    assert db_session.query(AuditLog).filter_by(action="create").count() == 300
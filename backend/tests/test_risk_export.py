@@ -0,0 +1,175 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db, get_read_session_factory
+from app.services.auth import register_user, create_user_access_token
+from app.core.config import settings
+from app.models.action_item import ActionItem
+from app.services.risk import bulk_write_risks
+from app.services.risk_export import stream_risk_export
+from app.services.risk_import import COLUMN_FIELDS
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    # The stream opens its own session, after the endpoint has returned
+    app.dependency_overrides[get_read_session_factory] = lambda: sessionmaker(bind=db_session.get_bind())
+    return app
+
+
+def make_user(db_session, email: str, role: str):
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    return user, {"Authorization": f"Bearer {create_user_access_token(user)}"}
+
+
+def seed(db_session, owner_id: int, count: int, **data) -> list[int]:
+    result = bulk_write_risks(
+        db_session,
+        owner_id=owner_id,
+        user_role="manager",
+        operations=[{"op": "create", "data": {"risk_name": f"Risk {i:03d}", "probability": 1 + i % 5, "impact": 2, **data}} for i in range(count)],
+    )
+    return [item["id"] for item in result["results"]]
+
+
+def export(app, headers, **params):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get("/risks/export", params=params, headers=headers)
+
+    return anyio.run(_run)
+
+
+def test_ndjson_export_streams_every_row_past_the_page_cap(app_overridden, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "risk_export_batch_size", 40)
+    manager, headers = make_user(db_session, "export-all@example.com", "manager")
+    seed(db_session, manager.id, 250)
+
+    r = export(app_overridden, headers, sort_by="risk_name", order="asc")
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert r.headers["content-disposition"].startswith('attachment; filename="risks-')
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert len(rows) == 250
+    assert [row["risk_name"] for row in rows[:2]] == ["Risk 000", "Risk 001"]
+    assert rows[0]["score"] == 2
+    assert "action_items" not in rows[0]
+
+
+def test_export_applies_list_filters_and_visibility(app_overridden, db_session):
+    manager, manager_headers = make_user(db_session, "export-manager@example.com", "manager")
+    editor, editor_headers = make_user(db_session, "export-editor@example.com", "editor")
+    seed(db_session, manager.id, 5)
+    seed(db_session, editor.id, 3, status="closed")
+
+    r = export(app_overridden, editor_headers)
+    assert {json.loads(line)["owner_id"] for line in r.text.splitlines()} == {editor.id}
+    assert len(r.text.splitlines()) == 3
+
+    r = export(app_overridden, manager_headers, status="open", min_probability=4)
+    names = sorted(json.loads(line)["risk_name"] for line in r.text.splitlines())
+    assert names == ["Risk 003", "Risk 004"]
+
+
+def test_csv_export_uses_import_headers(app_overridden, db_session):
+    manager, headers = make_user(db_session, "export-csv@example.com", "manager")
+    seed(db_session, manager.id, 3, risk_description='Contains "quotes", commas\nand lines')
+
+    r = export(app_overridden, headers, format="csv", sort_by="risk_name", order="asc")
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "text/csv; charset=utf-8"
+    assert r.text.startswith("\ufeff")
+    rows = list(csv.reader(io.StringIO(r.text.lstrip("\ufeff"))))
+    header, data = rows[0], rows[1:]
+    assert len(data) == 3
+    assert data[0][header.index("Risk Name")] == "Risk 000"
+    assert data[0][header.index("Description")] == 'Contains "quotes", commas\nand lines'
+    # Every editable column is one the spreadsheet import recognises
+    mapped = {COLUMN_FIELDS[column.lower()] for column in header if column.lower() in COLUMN_FIELDS}
+    assert mapped >= {"risk_name", "risk_description", "status", "probability", "impact", "scope", "risk_owner", "notes"}
+
+    r = export(app_overridden, headers, format="csv", status="draft")
+    assert list(csv.reader(io.StringIO(r.text.lstrip("\ufeff")))) == [header]
+
+
+def test_ndjson_export_can_nest_action_items(app_overridden, db_session):
+    manager, headers = make_user(db_session, "export-items@example.com", "manager")
+    risk_ids = seed(db_session, manager.id, 3)
+    for n in range(2):
+        db_session.add(ActionItem(risk_id=risk_ids[1], title=f"Step {n}", created_by=manager.id))
+    db_session.commit()
+
+    r = export(app_overridden, headers, include_action_items="true", sort_by="risk_name", order="asc")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [len(row["action_items"]) for row in rows] == [0, 2, 0]
+    assert [item["title"] for item in rows[1]["action_items"]] == ["Step 0", "Step 1"]
+    assert rows[1]["action_items_count"] == 2
+
+    r = export(app_overridden, headers, format="csv", include_action_items="true")
+    assert r.status_code == 400
+
+
+def test_export_is_generated_batch_by_batch(db_session):
+    manager, _ = make_user(db_session, "export-batches@example.com", "manager")
+    seed(db_session, manager.id, 25)
+
+    factory = sessionmaker(bind=db_session.get_bind())
+    chunks = list(stream_risk_export(factory, "ndjson", owner_id=manager.id, user_role="manager", batch_size=10))
+    assert [chunk.count("\n") for chunk in chunks] == [10, 10, 5]
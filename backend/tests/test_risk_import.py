@@ -0,0 +1,192 @@
+import csv
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db, get_session_factory
+from app.models import Risk
+from app.services.auth import register_user, create_user_access_token
+from app.services.risk_import import import_risk_rows, iter_csv_rows
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: sessionmaker(autoflush=False, bind=db_session.get_bind())
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+
+def upload(app, headers, path: Path, on_conflict: str = "skip"):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            with open(path, "rb") as handle:
+                r = await client.post(
+                    "/risks/import",
+                    params={"on_conflict": on_conflict},
+                    files={"file": (path.name, handle)},
+                    headers=headers,
+                )
+            assert r.status_code == 202, r.text
+            # The background task has run by the time the ASGI call returns
+            return (await client.get(f"/risks/import/{r.json()['id']}", headers=headers)).json()
+
+    return anyio.run(_run)
+
+
+def write_csv(path: Path, rows: list[list]):
+    with open(path, "w", newline="") as handle:
+        csv.writer(handle).writerows(rows)
+
+
+def test_sample_workbooks_import_and_skip_name_conflicts(app_overridden, db_session):
+    app = app_overridden
+    editor = make_auth_header(db_session, "importer@example.com", "editor")
+
+    job = upload(app, editor, SAMPLE_DATA / "test_data_for_import.xlsx")
+    assert job["status"] == "completed"
+    assert job["result"]["created"] == 12 and job["result"]["failed"] == 0
+    assert job["progress"]["rows"] == 12
+    breach = db_session.query(Risk).filter_by(risk_name="Data Breach Risk").one()
+    assert (breach.status, breach.probability, breach.impact, breach.score) == ("closed", 3, 4, 12)
+
+    # Ten names already exist; only the two renamed and two new rows are created
+    job = upload(app, editor, SAMPLE_DATA / "test_data_with_conflicts.xlsx")
+    assert (job["result"]["created"], job["result"]["skipped"]) == (4, 10)
+    assert db_session.query(Risk).count() == 16
+
+
+def test_other_users_cannot_see_an_import_job(app_overridden, db_session):
+    app = app_overridden
+    editor = make_auth_header(db_session, "owner@example.com", "editor")
+    other = make_auth_header(db_session, "nosy@example.com", "editor")
+    job = upload(app, editor, SAMPLE_DATA / "test_data_for_import.xlsx")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get(f"/risks/import/{job['id']}", headers=other)
+
+    assert anyio.run(_run).status_code == 404
+
+
+def test_csv_import_updates_conflicts_and_reports_bad_rows(db_session, tmp_path):
+    owner = register_user(db_session, email="csv@example.com", password="pass123", role="editor")
+    path = tmp_path / "risks.csv"
+    write_csv(path, [
+        ["Risk Name", "Probability", "Impact", "Status", "Notes"],
+        ["Vendor lock-in", "2", "3", "Open", ""],
+        ["", "", "", "", ""],
+        ["Bad scale", "9", "1", "open", ""],
+        ["Vendor lock-in", "4", "", "In Progress", "re-rated"],
+        ["Key staff loss", "1", "1", "open", ""],
+    ])
+
+    result = import_risk_rows(db_session, iter_csv_rows(str(path)), owner.id, "editor", on_conflict="update", chunk_size=2)
+    assert (result["rows"], result["created"], result["updated"], result["failed"]) == (4, 2, 1, 1)
+    assert result["errors"] == [{"row": 4, "error": "data.probability: Input should be less than or equal to 5"}]
+    lock_in = db_session.query(Risk).filter_by(risk_name="Vendor lock-in").one()
+    assert (lock_in.probability, lock_in.impact, lock_in.status, lock_in.notes) == (4, 3, "in_progress", "re-rated")
+
+
+def test_name_conflicts_only_count_risks_the_importer_can_see(db_session, tmp_path):
+    alice = register_user(db_session, email="alice-import@example.com", password="pass123", role="editor")
+    bob = register_user(db_session, email="bob-import@example.com", password="pass123", role="editor")
+    carol = register_user(db_session, email="carol-import@example.com", password="pass123", role="editor")
+    path = tmp_path / "shared.csv"
+    write_csv(path, [["Title", "Probability"], ["Shared name", "2"]])
+
+    result = import_risk_rows(db_session, iter_csv_rows(str(path)), owner_id=alice.id, user_role="editor")
+    assert result["created"] == 1
+
+    # Alice's risk is invisible to the other editors: not skipped, and not "Risk not found" on update
+    result = import_risk_rows(db_session, iter_csv_rows(str(path)), owner_id=bob.id, user_role="editor", on_conflict="skip")
+    assert (result["created"], result["skipped"], result["failed"]) == (1, 0, 0), result
+    result = import_risk_rows(db_session, iter_csv_rows(str(path)), owner_id=carol.id, user_role="editor", on_conflict="update")
+    assert (result["created"], result["updated"], result["failed"]) == (1, 0, 0), result
+
+    # An editor's own risk is still a conflict
+    result = import_risk_rows(db_session, iter_csv_rows(str(path)), owner_id=bob.id, user_role="editor")
+    assert result["skipped"] == 1
+    owners = sorted(owner for (owner,) in db_session.query(Risk.owner_id).filter(Risk.risk_name == "Shared name"))
+    assert owners == [alice.id, bob.id, carol.id]
+
+
+def test_import_memory_does_not_grow_with_sheet_size(db_session, tmp_path):
+    owner = register_user(db_session, email="bigsheet@example.com", password="pass123", role="editor")
+
+    def peak_for(rows: int) -> int:
+        path = tmp_path / f"{rows}.csv"
+        write_csv(path, [["Risk Name", "Description"]] + [[f"Risk {rows}-{i}", "x" * 200] for i in range(rows)])
+        tracemalloc.start()
+        try:
+            result = import_risk_rows(db_session, iter_csv_rows(str(path)), owner.id, "editor", chunk_size=250)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert result["created"] == rows
+        return peak
+
+    small, large = peak_for(1000), peak_for(4000)
+    assert large < small * 1.5
@@ -0,0 +1,155 @@
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def request(app, method, url, headers, **kwargs):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.request(method, url, headers=headers, **kwargs)
+
+    return anyio.run(_run)
+
+
+def seed(app, headers, count: int = 3):
+    for i in range(count):
+        r = request(app, "POST", "/risks", headers, json={
+            "risk_name": f"Risk {i}",
+            "risk_description": "Long narrative " * 200,
+            "notes": "Meeting notes " * 200,
+            "probability": i + 1,
+            "impact": 3,
+            "risk_owner": "Sam",
+        })
+        assert r.status_code == 201, r.text
+
+
+def test_summary_fields_return_only_list_columns(app_overridden, db_session):
+    headers = make_auth_header(db_session, "fields-summary@example.com", "manager")
+    seed(app_overridden, headers)
+
+    r = request(app_overridden, "GET", "/risks", headers, params={"fields": "summary"})
+    assert r.status_code == 200, r.text
+    rows = r.json()
+    assert len(rows) == 3
+    assert set(rows[0]) == {"id", "risk_name", "score", "risk_level", "status", "risk_owner"}
+    assert rows[0]["risk_name"] == "Risk 2"
+    assert rows[0]["score"] == 9
+    assert "etag" in r.headers
+
+
+def test_large_text_columns_are_not_selected(app_overridden, db_session):
+    headers = make_auth_header(db_session, "fields-sql@example.com", "manager")
+    seed(app_overridden, headers)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        r = request(app_overridden, "GET", "/risks", headers, params={"fields": "risk_name,status"})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert r.status_code == 200, r.text
+    assert [set(row) for row in r.json()] == [{"id", "risk_name", "status"}] * 3
+
+    selects = [s for s in statements if "FROM risks" in s and "count(" not in s]
+    assert len(selects) == 1
+    for column in ("risk_description", "notes", "probability_basis", "impact_basis"):
+        assert column not in selects[0]
+
+
+def test_fields_with_cursor_and_sort(app_overridden, db_session):
+    headers = make_auth_header(db_session, "fields-cursor@example.com", "manager")
+    seed(app_overridden, headers)
+
+    params = {"fields": "risk_name", "sort_by": "probability", "order": "asc", "limit": 2}
+    first = request(app_overridden, "GET", "/risks", headers, params=params)
+    assert [row["risk_name"] for row in first.json()] == ["Risk 0", "Risk 1"]
+    cursor = first.headers["x-next-cursor"]
+
+    second = request(app_overridden, "GET", "/risks", headers, params={**params, "cursor": cursor})
+    assert second.json() == [{"id": second.json()[0]["id"], "risk_name": "Risk 2"}]
+
+
+def test_full_payload_without_fields_and_unknown_fields_rejected(app_overridden, db_session):
+    headers = make_auth_header(db_session, "fields-full@example.com", "manager")
+    seed(app_overridden, headers, count=1)
+
+    r = request(app_overridden, "GET", "/risks", headers)
+    assert r.json()[0]["risk_description"].startswith("Long narrative")
+    assert r.json()[0]["action_items_count"] == 0
+
+    r = request(app_overridden, "GET", "/risks", headers, params={"fields": "risk_name,password"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Unknown fields: password"
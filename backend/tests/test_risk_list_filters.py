@@ -156,3 +156,60 @@ def test_sort_filter_pagination(app_overridden, db_session):
     anyio.run(_run)
 
 
+
+
+def test_score_and_level_filters(app_overridden, db_session):
+    app = app_overridden
+    manager = make_auth_header(db_session, "levels@example.com", "manager")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            await seed_risks(client, manager)
+
+            # Persisted score: Beta outage (25) and Gamma fraud (8) and Epsilon leak (8)
+            r = await client.get("/risks", params={"min_score": 8}, headers=manager)
+            assert r.status_code == 200
+            assert sorted(names(r.json())) == ["Beta outage", "Epsilon leak", "Gamma fraud"]
+
+            r2 = await client.get("/risks", params={"risk_level": "Critical"}, headers=manager)
+            assert r2.status_code == 200
+            assert names(r2.json()) == ["Beta outage"]
+
+            r3 = await client.get("/risks", params={"risk_level": "Severe"}, headers=manager)
+            assert r3.status_code == 422
+
+    anyio.run(_run)
+
+
+def test_cursor_pagination(app_overridden, db_session):
+    app = app_overridden
+    manager = make_auth_header(db_session, "cursor@example.com", "manager")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            await seed_risks(client, manager)
+
+            # Walk score-desc pages of 2; Gamma fraud and Epsilon leak tie on score 8
+            params = {"sort_by": "score", "order": "desc", "limit": 2, "include_total": "true"}
+            seen, issued = [], []
+            r = await client.get("/risks", params=params, headers=manager)
+            assert r.headers["X-Total-Count"] == "5"
+            while True:
+                assert r.status_code == 200
+                seen.extend(r.json())
+                cursor = r.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                issued.append(cursor)
+                r = await client.get("/risks", params={**params, "cursor": cursor}, headers=manager)
+
+            assert len(ids(seen)) == len(set(ids(seen))) == 5
+            assert scores(seen) == sorted(scores(seen), reverse=True)
+
+            # A cursor only makes sense for the sort it was issued for
+            r2 = await client.get("/risks", params={"sort_by": "risk_name", "cursor": issued[0]}, headers=manager)
+            assert r2.status_code == 400
+            r3 = await client.get("/risks", params={"cursor": "not-a-cursor"}, headers=manager)
+            assert r3.status_code == 400
+
+    anyio.run(_run)
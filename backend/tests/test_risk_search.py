@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Risk, User
+from app.services.risk import list_risks
+from app.services.search import sqlite_match_query, search_tokens
+
+
+@pytest.fixture()
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    session.add(User(id=1, email="search@example.com", hashed_password="x", role="manager"))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def add_risk(session, name, description=None, notes=None):
+    risk = Risk(risk_name=name, risk_description=description, notes=notes, owner_id=1, probability=2, impact=2)
+    session.add(risk)
+    session.commit()
+    return risk
+
+
+def names(session, search, **kwargs):
+    return [r.risk_name for r in list_risks(session, owner_id=1, search=search, user_role="manager", **kwargs)]
+
+
+def test_match_query_strips_operators():
+    assert search_tokens('data" OR breach*') == ["data", "OR", "breach"]
+    assert sqlite_match_query(["data", "bre"]) == '"data"* "bre"*'
+
+
+def test_punctuation_only_search_matches_names_literally(db_session):
+    add_risk(db_session, "Budget overrun")
+    add_risk(db_session, "Cost 100% over plan")
+    add_risk(db_session, "Go-live slip")
+
+    assert names(db_session, "%%") == []
+    assert names(db_session, "%") == ["Cost 100% over plan"]
+    assert names(db_session, "-") == ["Go-live slip"]
+    assert names(db_session, "_") == []
+
+
+def test_search_covers_description_and_notes(db_session):
+    add_risk(db_session, "Vendor outage", description="Payment processor downtime")
+    add_risk(db_session, "Staff turnover", notes="Key payment engineers may leave")
+    add_risk(db_session, "Flooding")
+
+    assert sorted(names(db_session, "payment")) == ["Staff turnover", "Vendor outage"]
+    assert names(db_session, "paym") == names(db_session, "payment")  # prefix match
+    assert names(db_session, "processors") == ["Vendor outage"]  # porter stemming
+    assert names(db_session, "payment flooding") == []  # all terms required
+
+
+def test_search_ranks_by_relevance_without_sort(db_session):
+    add_risk(db_session, "Unrelated", description="A long description that mentions breach once among many other words here")
+    add_risk(db_session, "Data breach", description="Breach of customer data, breach notification required")
+
+    assert names(db_session, "breach")[0] == "Data breach"
+    assert names(db_session, "breach", sort_by="risk_name", order="asc") == ["Data breach", "Unrelated"]
+
+
+def test_index_follows_updates_and_deletes(db_session):
+    risk = add_risk(db_session, "Supply delay", description="Shipping congestion")
+    assert names(db_session, "congestion") == ["Supply delay"]
+
+    risk.risk_description = "Customs hold"
+    db_session.commit()
+    assert names(db_session, "congestion") == []
+    assert names(db_session, "customs") == ["Supply delay"]
+
+    db_session.delete(risk)
+    db_session.commit()
+    assert names(db_session, "customs") == []
@@ -0,0 +1,129 @@
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.services.auth import register_user, create_user_access_token
+from app.services.risk import bulk_write_risks
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def db_session(test_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def make_auth_header(db_session, email: str, role: str) -> dict[str, str]:
+    user = register_user(db_session, email=email, password="pass123", role=role)
+    token = create_user_access_token(user)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def get_stats(app, headers, **params):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get("/risks/stats", params=params, headers=headers)
+
+    r = anyio.run(_run)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def seed(db_session, owner_id: int, count: int, probability, impact, status="open", risk_owner="Ana"):
+    operations = [
+        {"op": "create", "data": {"risk_name": f"{owner_id}-{status}-{i}", "probability": probability, "impact": impact, "status": status, "risk_owner": risk_owner}}
+        for i in range(count)
+    ]
+    assert bulk_write_risks(db_session, owner_id, "editor", operations)["created"] == count
+
+
+def test_stats_cover_every_visible_risk_not_just_one_page(app_overridden, db_session):
+    app = app_overridden
+    editor = make_auth_header(db_session, "stats-editor@example.com", "editor")
+    manager = make_auth_header(db_session, "stats-manager@example.com", "manager")
+    editor_id, manager_id = 1, 2
+
+    seed(db_session, editor_id, 40, 5, 5)
+    seed(db_session, editor_id, 30, 1, 2, status="mitigated", risk_owner="Ben")
+    seed(db_session, editor_id, 5, None, None, status="draft", risk_owner="")
+    seed(db_session, manager_id, 10, 3, 3)
+
+    mine = get_stats(app, editor)
+    assert mine["total"] == 75
+    assert mine["by_status"] == {"open": 40, "mitigated": 30, "draft": 5}
+    assert mine["by_level"] == {"Critical": 40, "Low": 30, "Not Assessed": 5}
+    assert mine["by_owner"] == {"Ana": 40, "Ben": 30, "Unassigned": 5}
+    assert mine["heatmap"] == [
+        {"probability": 1, "impact": 2, "count": 30},
+        {"probability": 5, "impact": 5, "count": 40},
+    ]
+    assert mine["average_score"] == round((40 * 25 + 30 * 2) / 70, 2)
+
+    # Managers see everyone's risks, same as list_risks
+    everyone = get_stats(app, manager)
+    assert everyone["total"] == 85
+    assert {"probability": 3, "impact": 3, "count": 10} in everyone["heatmap"]
+
+    filtered = get_stats(app, manager, status="open", risk_owner="Ana")
+    assert filtered["total"] == 50
+    assert filtered["by_status"] == {"open": 50}
+
+
+def test_stats_for_empty_register(app_overridden, db_session):
+    viewer = make_auth_header(db_session, "stats-viewer@example.com", "viewer")
+    stats = get_stats(app_overridden, viewer)
+    assert stats["total"] == 0
+    assert stats["average_score"] is None
+    assert stats["heatmap"] == []
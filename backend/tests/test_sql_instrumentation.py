@@ -0,0 +1,150 @@
+import logging
+import os
+import tempfile
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.core.config import settings
+from app.core.instrumentation import query_report, statement_shape
+from app.models.user import User
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def db_session(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def test_statement_shape_collapses_in_lists():
+    a = statement_shape("SELECT * FROM risks WHERE id IN (?, ?, ?)")
+    b = statement_shape("SELECT *\n FROM risks  WHERE id IN (?)")
+    assert a == b
+
+
+def test_query_headers_report_and_repeat_warning(app_overridden, db_session, monkeypatch, caplog):
+    user = register_user(db_session, email="sql@example.com", password="pass123", role="manager")
+    headers = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+    query_report.reset()
+
+    @app_overridden.get("/_test/repeat")
+    def repeat_query():
+        # Same statement once per row: the N+1 shape the warning exists for
+        for n in range(3):
+            db_session.execute(select(User.id).where(User.id == n))
+        return {}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_overridden), base_url="http://testserver") as client:
+            for n in range(3):
+                r = await client.post("/risks", json={"risk_name": f"Risk {n}", "probability": 2, "impact": 2}, headers=headers)
+                assert r.status_code == 201
+
+            monkeypatch.setattr(settings, "sql_repeat_warning_threshold", 1)
+            with caplog.at_level(logging.WARNING, logger="app.core.instrumentation"):
+                resp = await client.get("/risks", headers=headers)
+                assert (await client.get("/_test/repeat")).status_code == 200
+            assert resp.status_code == 200
+            assert int(resp.headers["X-DB-Query-Count"]) >= 1
+            assert resp.headers["Server-Timing"].startswith("db;dur=")
+
+            report = await client.get("/system/queries", headers=headers)
+            assert report.status_code == 200
+            routes = {r["route"]: r for r in report.json()["routes"]}
+            assert routes["GET /risks"]["requests"] == 1
+            assert routes["POST /risks"]["requests"] == 3
+
+    anyio.run(_run)
+    warnings = [rec.getMessage() for rec in caplog.records if "possible N+1" in rec.getMessage()]
+    assert warnings
+    # GET /risks counts action items in its one SELECT, so only the test route repeats
+    assert all(message.startswith("GET /_test/repeat ") for message in warnings)
+
+
+def test_failed_statement_leaves_no_timing_state_on_the_connection(app_overridden, db_session):
+    connection_info = []
+
+    @app_overridden.get("/_test/failing")
+    def failing_query():
+        info_before = dict(db_session.connection().info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                db_session.execute(text("SELECT * FROM no_such_table"))
+            db_session.rollback()
+        db_session.execute(select(User.id))
+        connection_info.append((info_before, dict(db_session.connection().info)))
+        return {}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_overridden), base_url="http://testserver") as client:
+            resp = await client.get("/_test/failing")
+            assert resp.status_code == 200
+            # Only statements that completed are counted
+            assert int(resp.headers["X-DB-Query-Count"]) == 1
+
+    anyio.run(_run)
+    info_before, info_after = connection_info[0]
+    assert info_after == info_before
+
+
+def test_only_admins_can_reset_the_query_report(app_overridden, db_session):
+    manager = register_user(db_session, email="sql-manager@example.com", password="pass123", role="manager")
+    admin = register_user(db_session, email="sql-admin@example.com", password="pass123", role="admin")
+    manager_headers = {"Authorization": f"Bearer {create_user_access_token(manager)}"}
+    admin_headers = {"Authorization": f"Bearer {create_user_access_token(admin)}"}
+    query_report.reset()
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_overridden), base_url="http://testserver") as client:
+            assert (await client.get("/risks", headers=manager_headers)).status_code == 200
+
+            r = await client.get("/system/queries", params={"reset": "true"}, headers=manager_headers)
+            assert r.status_code == 403
+            assert "GET /risks" in query_report.snapshot()
+
+            r = await client.get("/system/queries", params={"reset": "true"}, headers=admin_headers)
+            assert r.status_code == 200
+            assert "GET /risks" in {route["route"] for route in r.json()["routes"]}
+            assert "GET /risks" not in query_report.snapshot()
+
+    anyio.run(_run)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+from typing import Generator
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SQLiteWriteQueue, apply_sqlite_pragmas
+from app.models import User
+
+
+@pytest.fixture()
+def profiled_engine() -> Generator:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(db_path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def test_pragmas_applied_on_connect(profiled_engine):
+    with profiled_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+
+
+def test_write_queue_releases_slot_on_commit_and_rollback(profiled_engine):
+    queue = SQLiteWriteQueue(timeout=1)
+    SessionLocal = queue.install(sessionmaker(autoflush=False, bind=profiled_engine))
+
+    with SessionLocal() as db:
+        db.add(User(email="a@example.com", hashed_password="x"))
+        db.flush()
+        assert db.info[SQLiteWriteQueue._info_key] is True
+        db.commit()
+        assert SQLiteWriteQueue._info_key not in db.info
+
+        db.add(User(email="b@example.com", hashed_password="x"))
+        db.flush()
+        db.rollback()
+        assert SQLiteWriteQueue._info_key not in db.info
+
+    # Slot is free again, so a fresh acquire does not block
+    assert queue._slot.acquire(timeout=0)
+    queue._slot.release()
+
+
+def test_concurrent_writers_queue_instead_of_failing(profiled_engine):
+    queue = SQLiteWriteQueue(timeout=5)
+    SessionLocal = queue.install(sessionmaker(autoflush=False, bind=profiled_engine))
+    errors = []
+
+    def worker(n: int):
+        try:
+            with SessionLocal() as db:
+                for i in range(20):
+                    db.add(User(email=f"user{n}-{i}@example.com", hashed_password="x"))
+                    db.commit()
+        except Exception as e:  # pragma: no cover - surfaced through the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with SessionLocal() as db:
+        assert db.query(User).count() == 120
@@ -0,0 +1,42 @@
+import time
+
+from jose import jwt
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import TokenCache, create_access_token, token_cache, verify_token
+
+
+def test_repeat_verification_is_served_from_cache(monkeypatch):
+    token = create_access_token(subject="5")
+    assert verify_token(token) == "5"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token was decoded again")
+
+    monkeypatch.setattr(security.jwt, "decode", fail)
+    assert verify_token(token) == "5"
+    stats = token_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_invalid_tokens_are_not_cached():
+    assert verify_token("not-a-jwt") is None
+    forged = jwt.encode({"sub": "1", "exp": time.time() + 60}, "wrong-secret", algorithm=settings.algorithm)
+    assert verify_token(forged) is None
+    assert token_cache.stats()["entries"] == 0
+
+
+def test_entries_expire_with_the_token_and_lru_is_bounded():
+    cache = TokenCache(max_entries=2)
+    cache.put("short", {"sub": "1", "exp": time.time() + 0.05})
+    cache.put("a", {"sub": "2", "exp": time.time() + 60})
+    assert cache.get("short")["sub"] == "1"
+    time.sleep(0.06)
+    assert cache.get("short") is None
+
+    cache.put("b", {"sub": "3", "exp": time.time() + 60})
+    cache.put("c", {"sub": "4", "exp": time.time() + 60})
+    assert cache.get("a") is None
+    assert cache.get("c")["sub"] == "4"
+    assert all(len(key) == 32 for key in cache._entries)  # only digests are stored
@@ -0,0 +1,163 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Generator
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.main import create_app
+from app.database import Base, get_db
+from app.core.revocation import BloomFilter, revocation_list
+from app.models import RevokedToken
+from app.services.auth import register_user, create_user_access_token
+
+
+@pytest.fixture(scope="session")
+def temp_db_url() -> Generator[str, None, None]:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+    url = f"sqlite:///{db_path}"
+    try:
+        yield url
+    finally:
+        try:
+            os.remove(db_path)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture()
+def test_engine(temp_db_url: str):
+    engine = create_engine(temp_db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        try:
+            Base.metadata.drop_all(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(test_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+
+@pytest.fixture()
+def db_session(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def app_overridden(db_session):
+    app = create_app()
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+@contextmanager
+def revocation_selects(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "revoked_tokens" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.05
+
+
+def test_logout_revokes_only_that_token(app_overridden, db_session, test_engine):
+    app = app_overridden
+    user = register_user(db_session, email="logout@example.com", password="pass123", role="viewer")
+    first = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+    second = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            # Tokens nobody revoked never touch the denylist table
+            with revocation_selects(test_engine) as statements:
+                r = await client.get("/auth/me", headers=first)
+                assert r.status_code == 200
+            assert statements == []
+
+            r = await client.post("/auth/logout", headers=first)
+            assert r.status_code == 204
+
+            r = await client.get("/auth/me", headers=first)
+            assert r.status_code == 401
+            assert r.json()["detail"] == "Token has been revoked"
+
+            r = await client.get("/auth/me", headers=second)
+            assert r.status_code == 200
+
+    anyio.run(_run)
+    assert db_session.query(RevokedToken).count() == 1
+
+
+def test_refresh_picks_up_other_workers_and_purges_expired(db_session, session_factory, test_engine):
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        RevokedToken(jti="elsewhere", expires_at=now + timedelta(hours=1)),
+        RevokedToken(jti="stale", expires_at=now - timedelta(minutes=1)),
+    ])
+    db_session.commit()
+
+    # Not known to this worker until the periodic refresh runs
+    assert not revocation_list.is_revoked("elsewhere", db_session)
+
+    revocation_list.refresh(session_factory)
+    with revocation_selects(test_engine) as statements:
+        assert revocation_list.is_revoked("elsewhere", db_session)
+        assert revocation_list.is_revoked("elsewhere", db_session)
+    assert len(statements) == 1  # confirmed once, then answered from memory
+
+    assert not revocation_list.is_revoked("stale", db_session)
+    assert [row.jti for row in db_session.query(RevokedToken).all()] == ["elsewhere"]
+
+
+def test_logout_during_refresh_is_not_lost(session_factory, test_engine):
+    def logout_after_select(conn, cursor, statement, parameters, context, executemany):
+        # Another request revokes a token after the refresh has read the table
+        if statement.lstrip().upper().startswith("SELECT") and "revoked_tokens" in statement:
+            revocation_list.add_local("late-logout")
+
+    event.listen(test_engine, "after_cursor_execute", logout_after_select)
+    try:
+        revocation_list.refresh(session_factory)
+    finally:
+        event.remove(test_engine, "after_cursor_execute", logout_after_select)
+
+    # Answered from memory (no session to confirm with), so it must be in the new filter
+    assert revocation_list.is_revoked("late-logout", None)
+    assert revocation_list.stats()["filter_negatives"] == 0
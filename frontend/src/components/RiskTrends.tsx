@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef } from "react";
 import { useQuery } from "@tanstack/react-query";
-import { listRisks } from "../services/risks";
+import { listRiskFields } from "../services/risks";
 import { auditService } from "../services/audit";
 import type { Risk } from "../types/risk";
 import type { RiskTrendDataPoint } from "../services/audit";
@@ -19,8 +19,9 @@ const RiskTrends: React.FC<RiskTrendsProps> = ({ onClose }) => {
 
   // Fetch risks for dropdown
   const { data: risks = [], isLoading: risksLoading } = useQuery({
-    queryKey: ["risks"],
-    queryFn: listRisks,
+    queryKey: ["risks", "fields", "trends"],
+    queryFn: () =>
+      listRiskFields(["risk_name", "score", "risk_level", "status"]),
   });
 
   // Fetch trend data when risk is selected
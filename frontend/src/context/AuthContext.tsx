@@ -1,5 +1,10 @@
 import { createContext, useContext, useEffect, useMemo, useState } from "react";
-import { loginRequest, meRequest, registerRequest } from "../services/api";
+import {
+  loginRequest,
+  logoutRequest,
+  meRequest,
+  registerRequest,
+} from "../services/api";
 import type { User } from "../types/user";
 
 type AuthContextValue = {
@@ -66,6 +71,11 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
         await this.login(email, password);
       },
       logout() {
+        // Revoke the token server-side; the local session ends either way
+        const current = localStorage.getItem("token");
+        if (current) {
+          logoutRequest(current).catch(() => undefined);
+        }
         localStorage.removeItem("token");
         setToken(null);
         setUser(null);
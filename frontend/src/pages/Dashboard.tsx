@@ -1,6 +1,6 @@
 import React, { useMemo, useState } from "react";
 import { useQuery } from "@tanstack/react-query";
-import { listRisks, getRiskOwners } from "../services/risks";
+import { getRiskStats, getRiskOwners } from "../services/risks";
 import { listRBSTree, type RBSNode } from "../services/rbs";
 import { usePermissions } from "../hooks/usePermissions";
 import {
@@ -18,9 +18,10 @@ import { Link } from "react-router-dom";
 export default function Dashboard() {
   const permissions = usePermissions();
 
-  const { data: risks = [] } = useQuery({
-    queryKey: ["risks"],
-    queryFn: () => listRisks({}),
+  const { data: stats } = useQuery({
+    queryKey: ["risk-stats"],
+    // Owner counts aren't shown here and are the one part that scans every risk
+    queryFn: () => getRiskStats({ include_owners: false }),
     enabled: permissions.canViewRisks(),
   });
   const { data: riskOwners = [] } = useQuery({
@@ -37,60 +38,46 @@ export default function Dashboard() {
   const [statusFilter, setStatusFilter] = useState<string>("");
   const [ownerFilter, setOwnerFilter] = useState<string>("");
 
+  // Filters apply to the matrix only; unfiltered this reuses the query above
+  const matrixFilters = {
+    status: statusFilter || undefined,
+    risk_owner: ownerFilter || undefined,
+    include_owners: false,
+  };
+  const hasMatrixFilters = Boolean(statusFilter || ownerFilter);
+  const { data: filteredStats } = useQuery({
+    queryKey: ["risk-stats", matrixFilters],
+    queryFn: () => getRiskStats(matrixFilters),
+    enabled: permissions.canViewRisks() && hasMatrixFilters,
+  });
+  const matrixStats = hasMatrixFilters ? filteredStats : stats;
+
   // Calculate metrics
-  const totalRisks = risks.length;
-  const openRisks = risks.filter((r) => r.status === "open").length;
-  const highSeverityRisks = risks.filter((r) => r.probability >= 4).length;
-  // const recentRisks = risks.filter((r) => {
-  //   const created = new Date(r.created_at);
-  //   const weekAgo = new Date();
-  //   weekAgo.setDate(weekAgo.getDate() - 7);
-  //   return created > weekAgo;
-  // }).length;
+  const totalRisks = stats?.total ?? 0;
+  const countByStatus = (status: string) => stats?.by_status[status] ?? 0;
+  const openRisks = countByStatus("open");
+  const highSeverityRisks = (stats?.heatmap ?? [])
+    .filter((cell) => cell.probability >= 4)
+    .reduce((sum, cell) => sum + cell.count, 0);
 
   const averageRiskScore =
-    totalRisks > 0
-      ? (
-          risks.reduce((sum, r) => sum + r.probability * r.impact, 0) /
-          totalRisks
-        ).toFixed(1)
-      : 0;
-
-  // Filters applied to matrix only
-  const filteredForMatrix = useMemo(() => {
-    return risks.filter((r) => {
-      if (statusFilter && r.status !== statusFilter) return false;
-      if (ownerFilter && (r.risk_owner || "") !== ownerFilter) return false;
-      return true;
-    });
-  }, [risks, statusFilter, ownerFilter]);
+    stats?.average_score != null ? stats.average_score.toFixed(1) : 0;
 
   // Build 5x5 matrix counts: rows=impact(5..1), cols=probability(1..5)
   const matrixCounts: number[][] = useMemo(() => {
     const counts = Array.from({ length: 5 }, () => Array(5).fill(0));
-    for (const r of filteredForMatrix) {
-      const p = Math.min(5, Math.max(1, Number(r.probability)));
-      const i = Math.min(5, Math.max(1, Number(r.impact)));
+    for (const cell of matrixStats?.heatmap ?? []) {
+      const p = Math.min(5, Math.max(1, cell.probability));
+      const i = Math.min(5, Math.max(1, cell.impact));
       const row = 5 - i; // impact 5 at top (row 0)
       const col = p - 1; // probability 1 at left (col 0)
-      counts[row][col] += 1;
+      counts[row][col] += cell.count;
     }
     return counts;
-  }, [filteredForMatrix]);
-
-  // Calculate risk counts for RBS nodes
-  const rbsRiskCounts = useMemo(() => {
-    const counts: { [key: number]: number } = {};
+  }, [matrixStats]);
 
-    // Count risks for each RBS node
-    risks.forEach((risk) => {
-      if (risk.rbs_node_id) {
-        counts[risk.rbs_node_id] = (counts[risk.rbs_node_id] || 0) + 1;
-      }
-    });
-
-    return counts;
-  }, [risks]);
+  // Risk counts for RBS nodes
+  const rbsRiskCounts = stats?.by_rbs_node ?? {};
 
   return (
     <div className="space-y-6">
@@ -168,13 +155,13 @@ export default function Dashboard() {
                 />
                 <StatusItem
                   label="Mitigated"
-                  count={risks.filter((r) => r.status === "mitigated").length}
+                  count={countByStatus("mitigated")}
                   color="primary"
                   icon={<Shield className="w-4 h-4" />}
                 />
                 <StatusItem
                   label="Closed"
-                  count={risks.filter((r) => r.status === "closed").length}
+                  count={countByStatus("closed")}
                   color="success"
                   icon={<CheckCircle className="w-4 h-4" />}
                 />
@@ -17,7 +17,7 @@ import {
   TrendingUp,
 } from "lucide-react";
 import RiskTrends from "../components/RiskTrends";
-import type { Risk } from "../types/risk";
+import type { Risk, RiskBulkOperation } from "../types/risk";
 import type { ActionItem } from "../types/actionItem";
 import type { Snapshot } from "../types/snapshot";
 import { auditService } from "../services/audit";
@@ -31,6 +31,7 @@ import {
   exportSnapshot,
   importSnapshot,
 } from "../services/api";
+import { bulkRisks } from "../services/risks";
 import pdfMake from "pdfmake/build/pdfmake";
 import pdfFonts from "pdfmake/build/vfs_fonts";
 import * as XLSX from "xlsx";
@@ -50,6 +51,9 @@ import {
 // Set up PDFMake fonts
 pdfMake.vfs = pdfFonts;
 
+// Rows sent per POST /risks/bulk request during Excel import
+const RISK_IMPORT_BATCH_SIZE = 2000;
+
 // Utility function to create diff highlighting
 const createDiffHighlight = (existingText: string, newText: string) => {
   if (!existingText && !newText) return null;
@@ -867,14 +871,43 @@ export default function Reports() {
         message: `Importing ${allRisksToImport.length} risks and ${actionItems.length} action items...`,
       });
 
-      // Import risks (remove id field to let database auto-generate)
-      const riskImportPromises = allRisksToImport.map((risk) => {
-        const { id, ...riskWithoutId } = risk;
-        return api.post("/risks", riskWithoutId).catch((error) => {
-          console.error("Error importing risk:", error);
-          return { error: error.message, risk };
-        });
-      });
+      // Import risks through the bulk endpoint (remove id field to let
+      // database auto-generate), a few thousand rows per request
+      const riskOperations: RiskBulkOperation[] = allRisksToImport.map(
+        (risk) => {
+          const { id, ...riskWithoutId } = risk;
+          return { op: "create", data: riskWithoutId };
+        }
+      );
+      const importRiskBatches = async () => {
+        let created = 0;
+        let failed = 0;
+        for (
+          let i = 0;
+          i < riskOperations.length;
+          i += RISK_IMPORT_BATCH_SIZE
+        ) {
+          const batch = riskOperations.slice(i, i + RISK_IMPORT_BATCH_SIZE);
+          try {
+            const result = await bulkRisks(batch);
+            created += result.created;
+            failed += result.failed;
+            result.results
+              .filter((item) => item.status === "error")
+              .forEach((item) =>
+                console.error(
+                  "Error importing risk:",
+                  item.error,
+                  batch[item.index]
+                )
+              );
+          } catch (error) {
+            console.error("Error importing risks:", error);
+            failed += batch.length;
+          }
+        }
+        return { created, failed };
+      };
 
       // Import action items (remove id field to let database auto-generate)
       const actionItemImportPromises = actionItems.map((actionItem) => {
@@ -888,14 +921,12 @@ export default function Reports() {
       });
 
       const [riskResults, actionItemResults] = await Promise.all([
-        Promise.all(riskImportPromises),
+        importRiskBatches(),
         Promise.all(actionItemImportPromises),
       ]);
 
-      const successfulRisks = riskResults.filter(
-        (result) => !result.error
-      ).length;
-      const failedRisks = riskResults.filter((result) => result.error).length;
+      const successfulRisks = riskResults.created;
+      const failedRisks = riskResults.failed;
       const successfulActionItems = actionItemResults.filter(
         (result) => !result.error
       ).length;
@@ -76,6 +76,13 @@ export async function meRequest(): Promise<{
   return data;
 }
 
+export async function logoutRequest(token: string): Promise<void> {
+  // Token passed explicitly: the caller clears localStorage straight away
+  await apiClient.post("/auth/logout", null, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+}
+
 // Action Items API
 import type {
   ActionItem,
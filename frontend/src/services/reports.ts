@@ -0,0 +1,45 @@
+import { apiClient } from "./api";
+import type { RiskListParams } from "./risks";
+
+export type ReportFormat = "pdf" | "docx" | "xlsx";
+
+// Rendered on the server as a background job; poll until it completes, then download
+export type ReportJob = {
+  id: string;
+  kind: string;
+  status: "queued" | "running" | "completed" | "failed";
+  progress: { rows?: number; total?: number };
+  result: {
+    rows: number;
+    total: number;
+    truncated: boolean;
+    format: ReportFormat;
+    filename: string;
+    size: number;
+  } | null;
+  error: string | null;
+  created_at: string;
+  finished_at: string | null;
+};
+
+export async function startReport(
+  format: ReportFormat,
+  params?: Omit<RiskListParams, "limit" | "offset"> & { title?: string }
+): Promise<ReportJob> {
+  const { data } = await apiClient.post<ReportJob>("/reports", null, {
+    params: { ...params, format },
+  });
+  return data;
+}
+
+export async function getReportJob(jobId: string): Promise<ReportJob> {
+  const { data } = await apiClient.get<ReportJob>(`/reports/${jobId}`);
+  return data;
+}
+
+export async function downloadReport(jobId: string): Promise<Blob> {
+  const response = await apiClient.get(`/reports/${jobId}/download`, {
+    responseType: "blob",
+  });
+  return response.data;
+}
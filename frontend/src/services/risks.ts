@@ -1,7 +1,15 @@
 import { apiClient } from "./api";
-import type { Risk, RiskCreate, RiskUpdate } from "../types/risk";
+import type {
+  Risk,
+  RiskBulkOperation,
+  RiskBulkResponse,
+  RiskCreate,
+  RiskImportJob,
+  RiskStats,
+  RiskUpdate,
+} from "../types/risk";
 
-export async function listRisks(params?: {
+export type RiskListParams = {
   status?: string;
   min_probability?: number;
   search?: string;
@@ -11,16 +19,88 @@ export async function listRisks(params?: {
   order?: "asc" | "desc";
   limit?: number;
   offset?: number;
-}): Promise<Risk[]> {
+};
+
+export async function listRisks(params?: RiskListParams): Promise<Risk[]> {
   const { data } = await apiClient.get<Risk[]>("/risks", { params });
   return data;
 }
 
+// Sparse list: only the named columns (plus id) are read and sent
+export async function listRiskFields<K extends keyof Risk>(
+  fields: K[],
+  params?: RiskListParams
+): Promise<Pick<Risk, "id" | K>[]> {
+  const { data } = await apiClient.get<Pick<Risk, "id" | K>[]>("/risks", {
+    params: { ...params, fields: fields.join(",") },
+  });
+  return data;
+}
+
+// Whole register (no page cap), streamed by the server; same filters as listRisks
+export async function exportRisks(
+  format: "ndjson" | "csv",
+  params?: Omit<RiskListParams, "limit" | "offset"> & {
+    include_action_items?: boolean;
+  }
+): Promise<Blob> {
+  const response = await apiClient.get("/risks/export", {
+    params: { ...params, format },
+    responseType: "blob",
+  });
+  return response.data;
+}
+
+// Aggregates over every visible risk (not just one page of /risks)
+export async function getRiskStats(params?: {
+  status?: string;
+  risk_owner?: string;
+  rbs_node_id?: number;
+  include_owners?: boolean;
+}): Promise<RiskStats> {
+  const { data } = await apiClient.get<RiskStats>("/risks/stats", { params });
+  return data;
+}
+
 export async function createRisk(payload: RiskCreate): Promise<Risk> {
   const { data } = await apiClient.post<Risk>("/risks", payload);
   return data;
 }
 
+// Many creates/updates/deletes in one transaction; results come back per operation
+export async function bulkRisks(
+  operations: RiskBulkOperation[],
+  atomic = false
+): Promise<RiskBulkResponse> {
+  const { data } = await apiClient.post<RiskBulkResponse>("/risks/bulk", {
+    operations,
+    atomic,
+  });
+  return data;
+}
+
+// Server-side spreadsheet import (.xlsx or .csv); poll the returned job for progress
+export async function startRiskImport(
+  file: File,
+  onConflict: "skip" | "update" | "create" = "skip"
+): Promise<RiskImportJob> {
+  const formData = new FormData();
+  formData.append("file", file);
+  const { data } = await apiClient.post<RiskImportJob>(
+    "/risks/import",
+    formData,
+    { params: { on_conflict: onConflict } }
+  );
+  return data;
+}
+
+export async function getRiskImportJob(jobId: string): Promise<RiskImportJob> {
+  const { data } = await apiClient.get<RiskImportJob>(
+    `/risks/import/${jobId}`
+  );
+  return data;
+}
+
 export async function getRisk(id: number): Promise<Risk> {
   const { data } = await apiClient.get<Risk>(`/risks/${id}`);
   return data;
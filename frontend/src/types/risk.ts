@@ -55,3 +55,58 @@ export type RiskStatus =
   | "mitigated"
   | "escalated";
 export type RiskScope = "project" | "site" | "enterprise";
+
+export type RiskBulkOperation =
+  | { op: "create"; data: RiskCreate }
+  | { op: "update"; id: number; data: RiskUpdate }
+  | { op: "delete"; id: number };
+
+export type RiskBulkResult = {
+  index: number;
+  op: string | null;
+  status: "created" | "updated" | "deleted" | "error";
+  id: number | null;
+  error: string | null;
+};
+
+export type RiskBulkResponse = {
+  created: number;
+  updated: number;
+  deleted: number;
+  failed: number;
+  results: RiskBulkResult[];
+};
+
+export type RiskImportJob = {
+  id: string;
+  kind: string;
+  status: "queued" | "running" | "completed" | "failed";
+  progress: {
+    rows?: number;
+    created?: number;
+    updated?: number;
+    skipped?: number;
+    failed?: number;
+  };
+  result: {
+    rows: number;
+    created: number;
+    updated: number;
+    skipped: number;
+    failed: number;
+    errors: { row: number; error: string }[];
+  } | null;
+  error: string | null;
+  created_at: string;
+  finished_at: string | null;
+};
+
+export type RiskStats = {
+  total: number;
+  average_score: number | null;
+  by_status: Record<string, number>;
+  by_level: Record<string, number>;
+  by_owner: Record<string, number> | null;
+  by_rbs_node: Record<number, number>;
+  heatmap: { probability: number; impact: number; count: number }[];
+};